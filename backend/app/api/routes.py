@@ -1,22 +1,162 @@
+import json
+import time
+from contextlib import nullcontext
+from typing import AsyncContextManager, AsyncIterator, Awaitable, Callable, Optional, Tuple
 from fastapi import APIRouter, HTTPException
-from llama_index.core.workflow import InputRequiredEvent, HumanResponseEvent, StopEvent, Context
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from workflows import Context
+from workflows.events import InputRequiredEvent, HumanResponseEvent, StopEvent
+from workflows.handler import WorkflowHandler
 
-from app.dependencies import RagWorkflowDep, WorkflowManagerDep
+from app.dependencies import AdmissionControllerDep, RagWorkflowDep, WarmupDep, WorkflowManagerDep
+from app.core import deadline, metrics
+from app.core.config import settings
 from app.core.logging_config import logger
 from app.models.chat_request import ChatRequest
 from app.models.chat_response import ChatResponse
 from app.models.constants import WorfklowStatus
+from app.services.admission_controller import AdmissionController, AdmissionRejected, Priority
+from app.services.rag_workflow import ProgressEvent, RagWorkflow, TokenEvent
+from app.services.workflow_manager import WorkflowManager
 
 router = APIRouter()
 
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    Runs on_close once the response is over, however it ended: the stream was read to the end, it failed,
+    the client disconnected or the body was never iterated. A generator's finally block only covers the
+    cases where the generator started.
+    """
+
+    def __init__(self, content: AsyncIterator[str], on_close: Callable[[], Awaitable[None]], **kwargs):
+        super().__init__(content, **kwargs)
+        self._on_close = on_close
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._on_close()
+
 @router.post('/workflow')
-async def run_worklow(workflow: RagWorkflowDep, workflow_manager: WorkflowManagerDep, request: ChatRequest):
+async def run_worklow(workflow: RagWorkflowDep, workflow_manager: WorkflowManagerDep, admission: AdmissionControllerDep, request: ChatRequest):
     try:
-        workflow_id = request.workflow_id
-        handler = None
+        async with admission_slot(admission, request):
+            with metrics.WORKFLOW_RUNS_IN_FLIGHT.track_inprogress(endpoint="workflow"):
+                handler, workflow_id = await start_workflow(workflow, workflow_manager, request)
+
+                async for event in handler.stream_events():
+                    if isinstance(event, InputRequiredEvent):
+                        return await clarification_response(handler, event, workflow_id, workflow_manager)
+
+                    elif isinstance(event, StopEvent):
+                        raise_if_failed(event)
+                        return await completed_response(event, workflow_id, workflow_manager)
+
+                return failed_response(workflow_id)
+    except AdmissionRejected as e:
+        raise rejected_error(e)
+    except deadline.DeadlineExceeded as e:
+        logger.error(f"Workflow timed out: {e}")
+        raise HTTPException(
+            status_code=504,
+            detail="The query could not be processed in time"
+        )
+    except Exception as e:
+        logger.error(f"Workflow failed: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="System error occurred while processing the query"
+        )
+
+@router.post('/workflow/stream')
+async def stream_workflow(workflow: RagWorkflowDep, workflow_manager: WorkflowManagerDep, admission: AdmissionControllerDep, request: ChatRequest):
+    # Admitted before the response starts so a rejection can still be sent as a status code;
+    # the slot is then held until the response is closed
+    try:
+        if admission:
+            await admission.acquire(request_priority(request))
+    except AdmissionRejected as e:
+        raise rejected_error(e)
+
+    start_time = time.perf_counter()
+    try:
+        handler, workflow_id = await start_workflow(workflow, workflow_manager, request)
+    except Exception as e:
+        if admission:
+            admission.release(time.perf_counter() - start_time)
+        logger.error(f"Workflow failed: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="System error occurred while processing the query"
+        )
+
+    async def event_stream() -> AsyncIterator[str]:
+        metrics.WORKFLOW_RUNS_IN_FLIGHT.inc(endpoint="workflow_stream")
+        try:
+            yield sse_message("started", {"workflow_id": workflow_id})
 
+            async for event in handler.stream_events():
+                if isinstance(event, ProgressEvent):
+                    yield sse_message("progress", {"stage": event.stage, "message": event.message, "data": event.data})
+
+                elif isinstance(event, TokenEvent):
+                    yield sse_message("token", {"delta": event.delta})
+
+                elif isinstance(event, InputRequiredEvent):
+                    response = await clarification_response(handler, event, workflow_id, workflow_manager)
+                    yield sse_message("clarification", response.model_dump(mode="json"))
+                    return
+
+                elif isinstance(event, StopEvent):
+                    raise_if_failed(event)
+                    response = await completed_response(event, workflow_id, workflow_manager)
+                    yield sse_message("completed", response.model_dump(mode="json"))
+                    return
+
+            yield sse_message("failed", failed_response(workflow_id).model_dump(mode="json"))
+        except deadline.DeadlineExceeded as e:
+            logger.error(f"Workflow timed out: {e}")
+            yield sse_message("error", {"detail": "The query could not be processed in time"})
+        except Exception as e:
+            logger.error(f"Workflow failed: {e}")
+            yield sse_message("error", {"detail": "System error occurred while processing the query"})
+        finally:
+            metrics.WORKFLOW_RUNS_IN_FLIGHT.dec(endpoint="workflow_stream")
+
+    async def close_stream() -> None:
+        if admission:
+            admission.release(time.perf_counter() - start_time)
+        # Client disconnected or the stream failed before the workflow finished
+        if not handler.done():
+            await handler.cancel_run()
+
+    return ClosingStreamingResponse(
+        event_stream(),
+        on_close=close_stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get('/metrics', include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get('/ready', include_in_schema=False)
+async def get_ready(warmup: WarmupDep):
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up", "warmup": warmup.status()})
+    return {"status": "ready", "warmup": warmup.status()}
+
+async def start_workflow(workflow: RagWorkflow, workflow_manager: WorkflowManager, request: ChatRequest) -> Tuple[WorkflowHandler, str]:
+    workflow_id = request.workflow_id
+    handler = None
+    # The run task copies the context when it is created, so steps started by it keep the deadline after the reset
+    token = deadline.start(settings.REQUEST_DEADLINE_SECONDS)
+
+    try:
         if workflow_id:
-            context_dict = workflow_manager.get_context(workflow_id)
+            context_dict = await workflow_manager.get_context(workflow_id)
             if context_dict:
                 resumed_context = Context.from_dict(workflow, context_dict)
                 handler = workflow.run(ctx=resumed_context)
@@ -24,45 +164,62 @@ async def run_worklow(workflow: RagWorkflowDep, workflow_manager: WorkflowManage
                     HumanResponseEvent(
                         response=request.query
                     )
-            ) 
+            )
 
         if handler is None:
             handler = workflow.run(query=request.query)
             workflow_id = str(handler.run_id)
+    finally:
+        deadline.reset(token)
 
-        async for event in handler.stream_events():
-            if isinstance(event, InputRequiredEvent):
-                ctx_dict = handler.ctx.to_dict()
-                await handler.cancel_run() 
-                workflow_manager.save_context(workflow_id=workflow_id, context_dict=ctx_dict)         
-                response = ChatResponse(
-                    workflow_id=workflow_id, 
-                    response=event.result,
-                    status=WorfklowStatus.CLARIFICATION_REQUIRED
-                )
-
-                return response
-                
-            elif isinstance(event, StopEvent):
-                workflow_manager.delete_context(workflow_id=workflow_id)
-                result = event.result or {}
-                response = ChatResponse(
-                    workflow_id=workflow_id, 
-                    response=result.get("answer"),
-                    status=WorfklowStatus.COMPLETED,
-                    context=result.get("retrieved_records")
-                )
-
-                return response
-
-        return ChatResponse(
-            workflow_id=workflow_id, 
-            response="An unexpected end to the workflow occurred.", 
-            status=WorfklowStatus.FAILED
-        )
-    except Exception as e:
-        logger.error(f"Workflow failed: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail="System error occurred while processing the query"
-        )
\ No newline at end of file
+    return handler, workflow_id
+
+async def clarification_response(handler: WorkflowHandler, event: InputRequiredEvent, workflow_id: str, workflow_manager: WorkflowManager) -> ChatResponse:
+    ctx_dict = handler.ctx.to_dict()
+    await handler.cancel_run()
+    await workflow_manager.save_context(workflow_id=workflow_id, context_dict=ctx_dict)
+    return ChatResponse(
+        workflow_id=workflow_id,
+        response=event.result,
+        status=WorfklowStatus.CLARIFICATION_REQUIRED
+    )
+
+async def completed_response(event: StopEvent, workflow_id: str, workflow_manager: WorkflowManager) -> ChatResponse:
+    await workflow_manager.delete_context(workflow_id=workflow_id)
+    result = event.result or {}
+    return ChatResponse(
+        workflow_id=workflow_id,
+        response=result.get("answer"),
+        status=WorfklowStatus.COMPLETED,
+        context=result.get("retrieved_records")
+    )
+
+def request_priority(request: ChatRequest) -> Priority:
+    # A follow-up to a clarification finishes a conversation that has already been paid for
+    return Priority.CONTINUATION if request.workflow_id else Priority.NEW
+
+def admission_slot(admission: Optional[AdmissionController], request: ChatRequest) -> AsyncContextManager:
+    return admission.slot(request_priority(request)) if admission else nullcontext()
+
+def rejected_error(rejection: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=rejection.status_code,
+        detail="The service is busy, please retry later",
+        headers={"Retry-After": str(rejection.retry_after)}
+    )
+
+def raise_if_failed(event: StopEvent) -> None:
+    # A step that raised is reported as a failure StopEvent carrying the exception instead of being raised by stream_events
+    exception = getattr(event, "exception", None)
+    if isinstance(exception, Exception):
+        raise exception
+
+def failed_response(workflow_id: str) -> ChatResponse:
+    return ChatResponse(
+        workflow_id=workflow_id,
+        response="An unexpected end to the workflow occurred.",
+        status=WorfklowStatus.FAILED
+    )
+
+def sse_message(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
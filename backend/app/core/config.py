@@ -1,7 +1,10 @@
+from typing import Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     WEAVIATE_HOST: str   
+    VECTOR_STORE_BACKEND: str = "weaviate"
+    LOCAL_INDEX_DIR: str = "data/index"
     OPENAI_API_KEY: str
     OPENAI_BASE_URL: str  
     OPENAI_EMBED_MODEL: str
@@ -28,13 +31,77 @@ class Settings(BaseSettings):
     OPENAI_MAX_RETRIES: int
     OPENAI_RETRY_INITIAL_BACKOFF_SECONDS: int
     OPENAI_RETRY_BACKOFF_MULTIPLIER: int 
+    OPENAI_RETRY_MAX_BACKOFF_SECONDS: float = 30.0
+    OPENAI_HTTP_MAX_CONNECTIONS: int = 100
+    OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OPENAI_HTTP_TIMEOUT_SECONDS: float = 60.0
+    OPENAI_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    LLM_RATE_LIMITER_ENABLED: bool = True
+    LLM_RATE_LIMITS: Dict[str, Dict[str, int]] = {}
+    LLM_DEFAULT_REQUESTS_PER_MINUTE: int = 0
+    LLM_DEFAULT_TOKENS_PER_MINUTE: int = 0
+    LLM_CONCURRENCY_INITIAL: int = 16
+    LLM_CONCURRENCY_MIN: int = 1
+    LLM_CONCURRENCY_MAX: int = 64
+    LLM_LATENCY_TOLERANCE: float = 3.0
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+    REQUEST_DEADLINE_SECONDS: float | None = 35.0
+    CONDENSE_TIMEOUT_SECONDS: float = 5.0
+    INTENT_TIMEOUT_SECONDS: float = 10.0
+    RETRIEVAL_TIMEOUT_SECONDS: float = 8.0
+    SUMMARY_TIMEOUT_SECONDS: float = 25.0
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_IN_FLIGHT: int = 32
+    ADMISSION_MAX_QUEUE_SIZE: int = 64
+    ADMISSION_MAX_WAIT_SECONDS: float = 10.0
+    WARMUP_ENABLED: bool = True
+    WARMUP_QUERIES: List[str] = []
+    WARMUP_TIMEOUT_SECONDS: float = 60.0
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_SIZE: int = 10000
+    EMBEDDING_CACHE_TTL_SECONDS: float | None = 86400.0
+    EMBEDDING_CACHE_DB_PATH: str | None = None
+    EMBEDDING_BATCH_ENABLED: bool = True
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    RESPONSE_CACHE_SIMILARITY_THRESHOLD: float = 0.97
+    NLP_CACHE_ENABLED: bool = True
+    NLP_CACHE_MAX_SIZE: int = 5000
+    NLP_CACHE_TTL_SECONDS: float | None = 86400.0
+    RECORD_CACHE_ENABLED: bool = True
+    RECORD_CACHE_MAX_SIZE: int = 5000
+    RECORD_CACHE_TTL_SECONDS: float | None = 600.0
+    INDEX_VERSION_PATH: str = "data/index_version"
+    INDEX_VERSION_POLL_SECONDS: float = 5.0
+    CONTEXT_STORE_BACKEND: str = "memory"
+    CONTEXT_STORE_MAX_ENTRIES: int = 10000
+    CONTEXT_STORE_TTL_SECONDS: float | None = 3600.0
+    CONTEXT_STORE_SQLITE_PATH: str = "cache/contexts.db"
+    INGESTION_BATCH_SIZE: int = 50
+    INGESTION_WORKERS: int = 4
+    INGESTION_MAX_WRITE_RETRIES: int = 3
     CLARIFICATION_MAX_ATTEMPTS: int = 2
+    INTENT_FAST_PATH_ENABLED: bool = False
+    INTENT_FAST_PATH_MARGIN: float = 0.05
+    GAZETTEER_PATH: str = "data/gazetteer.json"
     RETRIEVAL_TOP_K_CASE_STUDIES: int = 5
     RETRIEVAL_TOP_K_PROJECTS: int = 5
+    SPECULATIVE_RETRIEVAL_ENABLED: bool = False
+    PROJECT_RETRIEVAL_MODE: str = "multi_target"
+    RETRIEVAL_TWO_PHASE_ENABLED: bool = True
     PROJECT_TECH_WEIGHT: float = 0.8
     PROJECT_SERVICE_WEIGHT: float = 0.2
     PROJECT_SCORE_THRESHOLD: float = 0.6
     CASE_STUDY_SCORE_THRESHOLD: float | None = None
+    SUMMARY_PROMPT_MAX_TOKENS: int = 6000
+    SUMMARY_FIELD_MAX_TOKENS: int = 600
+    SUMMARY_QUERY_MAX_TOKENS: int = 200
+    PROJECT_SUMMARY_MODE: str = "parallel"
+    PROJECT_SUMMARY_CARDS_PER_CALL: int = 1
 
     model_config = SettingsConfigDict(
         env_file='.env', 
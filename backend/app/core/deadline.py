@@ -0,0 +1,52 @@
+"""
+Request-scoped time budget. The route sets an absolute deadline before starting the workflow; asyncio tasks
+copy the context when they are created, so every step, LLM call and repository query of that run sees it.
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar, Token
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when a stage runs out of its own timeout or of the request's remaining budget."""
+
+    def __init__(self, stage: str):
+        super().__init__(f"Time budget exceeded during {stage}")
+        self.stage = stage
+
+def start(budget_seconds: Optional[float]) -> Token:
+    return _deadline.set(time.monotonic() + budget_seconds if budget_seconds else None)
+
+def reset(token: Token) -> None:
+    _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds left of the current request's budget, or None when it has no deadline."""
+    deadline = _deadline.get()
+    return deadline - time.monotonic() if deadline is not None else None
+
+def stage_timeout(timeout: Optional[float]) -> Optional[float]:
+    """The stage's own timeout, shortened to what is left of the request's budget."""
+    budget = remaining()
+    if budget is None:
+        return timeout
+    return budget if timeout is None else min(timeout, budget)
+
+async def run_with_timeout(awaitable: Awaitable[T], timeout: Optional[float], stage: str) -> T:
+    effective_timeout = stage_timeout(timeout)
+    if effective_timeout is not None and effective_timeout <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded(stage)
+
+    try:
+        return await asyncio.wait_for(awaitable, effective_timeout)
+    except asyncio.TimeoutError as e:
+        if isinstance(e, DeadlineExceeded):
+            raise
+        raise DeadlineExceeded(stage) from e
@@ -0,0 +1,64 @@
+"""
+Version stamp of the indexed data. load-data writes a new stamp once a load has finished; a running API
+polls it and drops what it derived from the old data, such as cached records and answers.
+"""
+
+import asyncio
+import os
+import uuid
+from typing import Callable, List, Optional
+
+from app.core.logging_config import logger
+
+def bump(path: str) -> str:
+    version = uuid.uuid4().hex
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Swapped in whole, so a poller never reads a half-written stamp
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(temp_path, path)
+    return version
+
+def read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+class IndexVersionWatcher:
+    """Runs the registered callbacks whenever the stamp differs from the one seen at the previous check."""
+
+    def __init__(self, path: str, poll_seconds: float):
+        self._path = path
+        self._poll_seconds = poll_seconds
+        self._version = read(path)
+        self._callbacks: List[Callable[[], None]] = []
+
+    def on_change(self, callback: Callable[[], None]) -> None:
+        self._callbacks.append(callback)
+
+    def check(self) -> bool:
+        return self._apply(read(self._path))
+
+    async def watch(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_seconds)
+            # Read off the event loop; the callbacks run on it, since the caches they clear are not thread-safe
+            self._apply(await asyncio.to_thread(read, self._path))
+
+    def _apply(self, version: Optional[str]) -> bool:
+        if version == self._version:
+            return False
+
+        logger.info(f"Index version changed from {self._version} to {version}, dropping data derived from the old index")
+        self._version = version
+        for callback in self._callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Index change handler failed: {e}")
+        return True
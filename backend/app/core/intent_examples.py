@@ -0,0 +1,45 @@
+from typing import Dict, List
+
+from app.models.constants import Intent
+
+# Labeled queries the centroid intent classifier is built from: the golden evaluation dataset, the examples
+# in the parse prompt and the examples documented in the README. Add misclassified production queries here.
+INTENT_EXAMPLES: Dict[Intent, List[str]] = {
+    Intent.PROJECT_MATCHING: [
+        "I need information on platforms that use a Live Video Sdk and a Secure DB. The solution should have implemented Remote doctor visits, Prescription management, and Automated reminders through Telemedicine and Notification Automation services",
+        "Do we have an Energy grid remote control project that uses SCADA Software, IoT Gateways, and a Licensed Protocol? I am interested in Grid segment automation, Incident reporting systems, and Remote device management via Control Engineering services.",
+        "I'm searching for a Workforce scheduler that features a Scheduler Module and an HR API with Cloud Sync. It should offer Shift planning, Automated reminders, and Performance graphs as part of its HR Tools and Analytics services.",
+        "I am looking for a project which utilizes a Web Framework, SSL, and a Relational DB. We need to see evidence of solutions like Digital patient records, an Appointment handling system, and Health insights. This project should fall under our Web Development, Security Review, and Data Management services",
+        "Show all AI chatbot initiatives leveraging Deep Learning Models and NoSQL. The solution should cover Automated Customer Replies and Query Escalation Routing, and be part of Conversational Design, ML Training, and Customer Engagement services.",
+        "Can you show me examples of retail platforms using SQL and NoSQL databases for inventory monitoring and sales analytics?",
+        "Can you find a management platform built with a Javascript Framework and NoSQL data store? We specifically need a solution that offers Inventory monitoring dashboards, Customer pattern tracking, and Automated sales analytics, including Business Modeling services.",
+        "I am looking for frontend projects build with React",
+        "Can you give me a list of all AI projects?",
+        "Can you show me examples where we implemented cloud solutions in Healthcare?",
+        "What services do we offer for FPGA and hardware design?",
+        "Show me examples of asset security systems using encrypted data channels and cloud monitoring for real-time tamper detection and asset status reporting.",
+        "Find projects using device gateways and data stream processing for real-time smart meter systems.",
+        "I need a mobile payment integration solution that uses hybrid frameworks and push notifications for fraud detection and receipt generation."
+    ],
+    Intent.CASE_STUDY_RETRIEVAL: [
+        "Can you summarize case studies in the Healthcare sector, specifically regarding patient monitoring and data management?",
+        "How did we assist a client in the financial sector with predictive analytics? What were the challenges of implementing machine learning in this environment, and how did it improve decision-making?",
+        "Give me an overview of case studies that focus on how we've used data visualization and dashboards to improve business decision-making.",
+        "Can you explain how we optimized a manufacturing client’s alerting system to reduce downtime? What were the challenges related to syncing systems, and what was the measurable impact on operational efficiency?",
+        "Give me details on case studies that focus on our past experience in handling 'hybrid' environments where systems operate both locally (offline) and in the cloud.",
+        "Give me an overview of case stduies in the 'Utilities' and 'Logistics' industries, specifically regarding asset tracking and resource management.",
+        "What approach did we use to enhance customer engagement for a retail client? How did we address data inconsistencies and improve overall service delivery through automation and analytics?",
+        "How did we help a retail client improve their customer engagement?",
+        "Find evidence of our methodology for cloud migration in Banking.",
+        "Tell me about a project where we optimized supply chain operations for a logistics client. What obstacles did we encounter, and what was the result in terms of efficiency and cost reduction?",
+        "Can you explain how we improved customer Wi-Fi management for a retail client? What issues did we face, and how did the system improve customer access and service?"
+    ],
+    Intent.AMBIGUOUS: [
+        "Our experience with IoT solutions",
+        "Cloud solutions in Finance?",
+        "AI projects in the Finance sector.",
+        "Tell me about our experience with microservices.",
+        "Cloud solutions in healthcare.",
+        "AI initiatives in the Finance and Healthcare sectors."
+    ]
+}
@@ -2,23 +2,31 @@ import os
 import logging
 from logging.handlers import RotatingFileHandler
 
-log_dir = os.getenv("LOG_DIR", "logs")
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
-
 logger = logging.getLogger("my_fastapi_app")
 logger.setLevel(logging.INFO)
 
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+def configure_logging() -> None:
+    """
+    Attaches the file and console handlers. Called by the entry points (app lifespan, scripts) instead of on
+    import, so importing a module does not create the log directory. Calling it again is a no-op.
+    """
+    if logger.handlers:
+        return
+
+    log_dir = os.getenv("LOG_DIR", "logs")
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-log_file_path = os.path.join(log_dir, "app.log") 
-file_handler = RotatingFileHandler(log_file_path, maxBytes=10**6, backupCount=3) 
-file_handler.setLevel(logging.INFO) 
-file_handler.setFormatter(formatter)  
+    log_file_path = os.path.join(log_dir, "app.log")
+    file_handler = RotatingFileHandler(log_file_path, maxBytes=10**6, backupCount=3)
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
 
-console_handler = logging.StreamHandler() 
-console_handler.setLevel(logging.DEBUG) 
-console_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.DEBUG)
+    console_handler.setFormatter(formatter)
 
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+    logger.addHandler(file_handler)
+    logger.addHandler(console_handler)
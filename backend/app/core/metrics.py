@@ -0,0 +1,237 @@
+"""
+Minimal in-process metrics with Prometheus text exposition. Metrics are module-level singletons
+registered on creation; render() serializes all of them for the /metrics endpoint.
+"""
+
+import functools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.models.cache_stats import CacheStats
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+_registry: List["_Metric"] = []
+_collectors: List[Callable[[], List[str]]] = []
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type_name}"] + self._samples()
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in self._values.items()]
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._label_values(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels: str) -> Iterator[None]:
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in self._values.items()]
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self._buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self._buckets))
+            for index, bound in enumerate(self._buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start_time, **labels)
+
+    def _samples(self) -> List[str]:
+        lines: List[str] = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                cumulative = 0
+                for bound, count in zip(self._buckets, counts):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', _format_value(bound)))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(self._sums[key])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+def timed(histogram: Histogram, **labels: str):
+    """Decorates a coroutine function so every call is observed in the histogram, failed calls included."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def register_cache(name: str, stats: Callable[[], CacheStats]) -> None:
+    """Exposes a cache's CacheStats, read at scrape time, under the cache_* metrics with a cache label."""
+    def collect() -> List[str]:
+        current = stats()
+        labels = _format_labels(("cache",), (name,))
+        return [
+            f"cache_hits_total{labels} {current.hits}",
+            f"cache_misses_total{labels} {current.misses}",
+            f"cache_evictions_total{labels} {current.evictions}",
+            f"cache_expirations_total{labels} {current.expirations}",
+            f"cache_size{labels} {current.size}",
+            f"cache_hit_ratio{labels} {_format_value(current.hit_rate)}"
+        ]
+    _collectors.append(collect)
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+
+    cache_lines: List[str] = []
+    for collect in _collectors:
+        cache_lines.extend(collect())
+    if cache_lines:
+        for name, type_name, description in CACHE_METRICS:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {type_name}")
+            lines.extend(line for line in cache_lines if line.startswith(name + "{"))
+
+    return "\n".join(lines) + "\n"
+
+CACHE_METRICS = [
+    ("cache_hits_total", "counter", "Lookups served from the cache."),
+    ("cache_misses_total", "counter", "Lookups not found in the cache."),
+    ("cache_evictions_total", "counter", "Entries evicted to stay within the size bound."),
+    ("cache_expirations_total", "counter", "Entries dropped because their TTL elapsed."),
+    ("cache_size", "gauge", "Entries currently held."),
+    ("cache_hit_ratio", "gauge", "Hits divided by lookups since start.")
+]
+
+WORKFLOW_STEP_SECONDS = Histogram(
+    "rag_workflow_step_seconds", "Duration of each RagWorkflow step.", ["step"])
+WORKFLOW_RUNS_IN_FLIGHT = Gauge(
+    "rag_workflow_runs_in_flight", "Workflow runs currently being served.", ["endpoint"])
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds", "Time until the response starts, per route.", ["method", "path", "status"])
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled.")
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_seconds", "Duration of LLM API calls; streams are measured until the last token.", ["model", "kind"])
+LLM_TIME_TO_FIRST_TOKEN_SECONDS = Histogram(
+    "llm_time_to_first_token_seconds", "Time from opening a completion stream to its first token.", ["model"])
+LLM_REQUEST_ERRORS = Counter(
+    "llm_request_errors_total", "LLM API calls that raised.", ["model", "kind"])
+LLM_TOKENS = Histogram(
+    "llm_tokens", "Tokens per LLM call as reported by the API.", ["model", "kind", "direction"], buckets=TOKEN_BUCKETS)
+LLM_TOKENS_TOTAL = Counter(
+    "llm_tokens_total", "Tokens consumed as reported by the API.", ["model", "kind", "direction"])
+REPOSITORY_QUERY_SECONDS = Histogram(
+    "repository_query_seconds", "Duration of vector store queries.", ["backend", "collection", "operation"])
+LLM_RETRIES = Counter(
+    "llm_retries_total", "LLM API attempts that failed and were retried, by error type.", ["model", "reason"])
+LLM_THROTTLED = Counter(
+    "llm_throttled_total", "LLM API responses with status 429.", ["model"])
+LLM_LIMITER_QUEUE_DEPTH = Gauge(
+    "llm_limiter_queue_depth", "Calls waiting for the rate limiter.", ["model"])
+LLM_LIMITER_WAIT_SECONDS = Histogram(
+    "llm_limiter_wait_seconds", "Time calls waited for the rate limiter.", ["model"])
+LLM_LIMITER_IN_FLIGHT = Gauge(
+    "llm_limiter_in_flight", "Calls admitted by the rate limiter and not yet answered.", ["model"])
+LLM_LIMITER_CONCURRENCY_LIMIT = Gauge(
+    "llm_limiter_concurrency_limit", "Current adaptive concurrency limit.", ["model"])
+LLM_CIRCUIT_STATE = Gauge(
+    "llm_circuit_state", "Circuit breaker state: 0 closed, 1 half-open, 2 open.", ["model"])
+LLM_CIRCUIT_REJECTIONS = Counter(
+    "llm_circuit_rejections_total", "Calls rejected without reaching the API because the circuit was open.", ["model"])
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight", "Workflow requests admitted and not yet finished.")
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth", "Workflow requests waiting for admission.", ["priority"])
+ADMISSION_WAIT_SECONDS = Histogram(
+    "admission_wait_seconds", "Time admitted workflow requests waited in the queue.", ["priority"])
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total", "Workflow requests shed by admission control.", ["priority", "reason"])
+WARMUP_STEP_SECONDS = Gauge(
+    "warmup_step_seconds", "Duration of each startup warm-up step.", ["step"])
@@ -3,12 +3,13 @@ CASE_STUDY_SUMMARIZATION_SYSTEM_PROMPT =  """
 
     Rules:
     - Include **every record** from the JSON context in the summary, **without exception**.  All records must be represented in the summary.
-    - **Represent all attributes** for each record:
-        - Industry
-        - Technologies
-        - SolutionsProvided
-        - Services
-        - DetailedContent
+    - **Represent all attributes** for each record (JSON keys in parentheses):
+        - Title (title)
+        - Industry (industry)
+        - Technologies (tech)
+        - SolutionsProvided (solutions)
+        - Services (services)
+        - DetailedContent (content)
     - You may emphasize relevance based on the user query, but **never omit any record or attribute**.
     - **Format the response as a narrative**, with all records and their attributes included.
     - Maintain professional, enterprise-level language
@@ -55,15 +56,15 @@ PROJECT_SUMMARIZATION_SYSTEM_PROMPT = """
     OUTPUT STRUCTURE (MANDATORY)
 
     1. Start with ONE sentence summarizing the overall experience or theme across all projects.
-    2. Then output Project Cards in the same order as the input records.
+    2. Then output Project Cards in the same order as the input records (most relevant first).
 
     PROJECT CARD FORMAT (EXACT)
 
-    **Project Title**
-    - **Tech Stack**: [Technologies from 'TechStack']
-    - **Services Offered**: [Service lines from 'ServicesOffered']
-    - **Solutions Implemented**: [Solutions from 'SolutionsImplemented']
-    - **Summary**: [Summary from 'Summary']
+    **Project Title** [from 'title']
+    - **Tech Stack**: [Technologies from 'tech']
+    - **Services Offered**: [Service lines from 'services']
+    - **Solutions Implemented**: [Solutions from 'solutions']
+    - **Summary**: [Summary from 'summary']
 
     FIELD RULES
 
@@ -91,6 +92,61 @@ PROJECT_SUMMARIZATION_USER_MESSAGE = """
     {json_data}
     """
 
+PROJECT_OVERVIEW_SYSTEM_PROMPT = """
+    You are an AI assistant writing the opening line of a project summary.
+
+    RULES
+
+    1. Write exactly ONE sentence summarizing the overall experience or theme across all project records provided.
+    2. Use ONLY the information present in the records. Do not infer or fabricate details.
+    3. Do not list the projects individually and do not write Project Cards; they are written separately.
+    4. Output only the sentence, without a heading or any other text.
+    """
+
+PROJECT_OVERVIEW_USER_MESSAGE = """
+    User query:
+    "{query}"
+
+    Projects (title, tech, services):
+    {json_data}
+    """
+
+PROJECT_CARD_SYSTEM_PROMPT = """
+    You are an AI assistant writing Project Cards for project records. The cards you write are joined with cards
+    for other projects into one answer, so output ONLY the cards: no introduction, overview sentence or closing text.
+
+    RULES
+
+    1. One project record MUST produce exactly one Project Card, in the same order as the input records.
+    2. Use ONLY the information present in each project record. Do not infer or fabricate details.
+    3. You may emphasize aspects relevant to the user query, but **you must include all fields**.
+
+    PROJECT CARD FORMAT (EXACT)
+
+    **Project Title** [from 'title']
+    - **Tech Stack**: [Technologies from 'tech']
+    - **Services Offered**: [Service lines from 'services']
+    - **Solutions Implemented**: [Solutions from 'solutions']
+    - **Summary**: [Summary from 'summary']
+
+    FIELD RULES
+
+    - Use the exact field names shown above.
+    - Lists must be comma-separated.
+    - If a field is genuinely missing, write: Not specified.
+    - Do not rename, reorder, or add fields.
+    """
+
+PROJECT_CARD_USER_MESSAGE = """
+    User query:
+    "{query}"
+
+    Write EXACTLY one Project Card per project record below, following the required format strictly.
+
+    Projects:
+    {json_data}
+    """
+
 PARSE_SYSTEM_PROMPT = """
     You are a STRICT Intent Validator and Entity Extractor for a professional knowledge base.
 
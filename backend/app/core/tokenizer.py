@@ -0,0 +1,55 @@
+import math
+from functools import lru_cache
+
+from app.core.logging_config import logger
+
+# Used when tiktoken or its encoding files are unavailable; close enough for English prose and JSON
+CHARS_PER_TOKEN_ESTIMATE = 4
+FALLBACK_ENCODING = "o200k_base"
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken is not installed, token counts are estimated from text length")
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding for {model}, token counts are estimated: {e}")
+        return None
+
+    # Deployment aliases (e.g. prefixed model names) are not known to tiktoken
+    try:
+        return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding {FALLBACK_ENCODING}, token counts are estimated: {e}")
+        return None
+
+def count_tokens(text: str, model: str) -> int:
+    if not text:
+        return 0
+
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN_ESTIMATE)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def truncate_tokens(text: str, max_tokens: int, model: str) -> str:
+    """Cuts the text down to at most max_tokens tokens, leaving it unchanged when it already fits."""
+    if not text or max_tokens <= 0:
+        return ""
+
+    encoding = _get_encoding(model)
+    if encoding is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN_ESTIMATE
+        return text if len(text) <= max_chars else text[:max_chars]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
@@ -1,20 +1,172 @@
-from typing import Annotated
+import os
+from typing import Annotated, Optional
 from fastapi import Depends
 
+from app.core.config import settings
+from app.core.index_version import IndexVersionWatcher
+from app.core.intent_examples import INTENT_EXAMPLES
+from app.core.logging_config import logger
+from app.core.metrics import register_cache
 from app.repositories.interfaces.case_study_repo import CaseStudyRepository
 from app.repositories.interfaces.project_repo import ProjectRepository
 from app.repositories.weaviate_manager import WeaviateManager
+from app.services.admission_controller import AdmissionController
+from app.services.batching_llm_service import BatchingLLMService
+from app.services.context_packer import ContextPacker
+from app.services.cached_llm_service import CachedLLMService
+from app.services.cached_nlp_processor import CachedNLPProcessor
+from app.services.centroid_nlp_processor import CentroidNLPProcessor
+from app.services.embedding_cache import EmbeddingCache
+from app.services.gazetteer import Gazetteer
+from app.services.gazetteer_nlp_processor import GazetteerNLPProcessor
+from app.services.in_memory_context_store import InMemoryContextStore
+from app.services.interfaces.context_store import ContextStore
 from app.services.interfaces.llm_service import LLMService
 from app.services.interfaces.nlp_processor import NLPProcessor
 from app.services.query_preprocessor import QueryPreprocessor
-from app.services.rag_workflow import RagWorkflow
+from app.services.rag_workflow import RagWorkflow, speculative_retrieval_stats
+from app.services.sqlite_context_store import SQLiteContextStore
+from app.services.record_cache import RecordCache
+from app.services.response_cache import ResponseCache
 from app.services.llm_nlp_processor import LLMNLPProcessor
+from app.services.llm_rate_limiter import LLMRateLimiter
 from app.services.openai_llm_service import OpenAILLMService
+from app.services.warmup import Warmup
 from app.services.weighted_aggregator import WeightedAggregator
 from app.services.workflow_manager import WorkflowManager
 
+def create_llm_rate_limiter() -> Optional[LLMRateLimiter]:
+    if not settings.LLM_RATE_LIMITER_ENABLED:
+        return None
+    return LLMRateLimiter(
+        model_limits=settings.LLM_RATE_LIMITS,
+        default_requests_per_minute=settings.LLM_DEFAULT_REQUESTS_PER_MINUTE,
+        default_tokens_per_minute=settings.LLM_DEFAULT_TOKENS_PER_MINUTE,
+        initial_concurrency=settings.LLM_CONCURRENCY_INITIAL,
+        min_concurrency=settings.LLM_CONCURRENCY_MIN,
+        max_concurrency=settings.LLM_CONCURRENCY_MAX,
+        latency_tolerance=settings.LLM_LATENCY_TOLERANCE,
+        failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds=settings.LLM_CIRCUIT_RESET_SECONDS
+    )
+
+def create_admission_controller() -> Optional[AdmissionController]:
+    if not settings.ADMISSION_CONTROL_ENABLED:
+        return None
+    return AdmissionController(
+        max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+        max_queue_size=settings.ADMISSION_MAX_QUEUE_SIZE,
+        max_wait_seconds=settings.ADMISSION_MAX_WAIT_SECONDS
+    )
+
+def create_llm_service() -> LLMService:
+    service: LLMService = OpenAILLMService(rate_limiter=llm_rate_limiter)
+    if settings.EMBEDDING_BATCH_ENABLED:
+        service = BatchingLLMService(
+            llm_service=service,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS
+        )
+    if settings.EMBEDDING_CACHE_ENABLED:
+        embedding_cache = EmbeddingCache(
+            max_size=settings.EMBEDDING_CACHE_MAX_SIZE,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+            db_path=settings.EMBEDDING_CACHE_DB_PATH
+        )
+        service = CachedLLMService(llm_service=service, embedding_cache=embedding_cache)
+        register_cache("embedding", embedding_cache.stats)
+    return service
+
+def create_nlp_processor(llm_service: LLMService) -> NLPProcessor:
+    processor: NLPProcessor = LLMNLPProcessor(llm_service=llm_service)
+    if settings.NLP_CACHE_ENABLED:
+        nlp_cache = CachedNLPProcessor(
+            nlp_processor=processor,
+            max_size=settings.NLP_CACHE_MAX_SIZE,
+            ttl_seconds=settings.NLP_CACHE_TTL_SECONDS
+        )
+        register_cache("nlp_process_query", lambda: nlp_cache.stats()["process_query"])
+        register_cache("nlp_condense_query", lambda: nlp_cache.stats()["condense_query"])
+        processor = nlp_cache
+    # Queries the gazetteer finds entities in are parsed without the LLM, whether or not the fast path is enabled
+    gazetteer = load_gazetteer()
+    if gazetteer is not None:
+        processor = GazetteerNLPProcessor(nlp_processor=processor, gazetteer=gazetteer)
+        register_cache("gazetteer_parse", processor.stats)
+    if settings.INTENT_FAST_PATH_ENABLED:
+        processor = CentroidNLPProcessor(
+            llm_service=llm_service,
+            fallback=processor,
+            examples=INTENT_EXAMPLES,
+            margin_threshold=settings.INTENT_FAST_PATH_MARGIN,
+            gazetteer=gazetteer
+        )
+        register_cache("intent_fast_path", processor.stats)
+    return processor
+
+def load_gazetteer() -> Optional[Gazetteer]:
+    if not os.path.exists(settings.GAZETTEER_PATH):
+        logger.warning(f"Gazetteer {settings.GAZETTEER_PATH} not found, entities will come from the LLM parser only. Run load-data to build it.")
+        return None
+    gazetteer = Gazetteer.from_file(settings.GAZETTEER_PATH)
+    logger.info(f"Gazetteer loaded with {len(gazetteer)} terms")
+    return gazetteer
+
+def create_context_store() -> ContextStore:
+    if settings.CONTEXT_STORE_BACKEND == "sqlite":
+        return SQLiteContextStore(
+            db_path=settings.CONTEXT_STORE_SQLITE_PATH,
+            max_entries=settings.CONTEXT_STORE_MAX_ENTRIES,
+            ttl_seconds=settings.CONTEXT_STORE_TTL_SECONDS
+        )
+    if settings.CONTEXT_STORE_BACKEND == "memory":
+        return InMemoryContextStore(
+            max_entries=settings.CONTEXT_STORE_MAX_ENTRIES,
+            ttl_seconds=settings.CONTEXT_STORE_TTL_SECONDS
+        )
+    raise ValueError(f"Unknown context store backend: {settings.CONTEXT_STORE_BACKEND}")
+
 weaviate_manager = WeaviateManager()
-workflow_manager = WorkflowManager()
+admission_controller = create_admission_controller()
+llm_rate_limiter = create_llm_rate_limiter()
+workflow_manager = WorkflowManager(context_store=create_context_store())
+llm_service = create_llm_service()
+nlp_processor = create_nlp_processor(llm_service)
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    similarity_threshold=settings.RESPONSE_CACHE_SIMILARITY_THRESHOLD
+) if settings.RESPONSE_CACHE_ENABLED else None
+record_cache = RecordCache(
+    max_size=settings.RECORD_CACHE_MAX_SIZE,
+    ttl_seconds=settings.RECORD_CACHE_TTL_SECONDS
+) if settings.RECORD_CACHE_ENABLED else None
+index_version_watcher = IndexVersionWatcher(
+    path=settings.INDEX_VERSION_PATH,
+    poll_seconds=settings.INDEX_VERSION_POLL_SECONDS
+)
+# Built by get_rag_workflow, since the repositories need an open vector store connection
+rag_workflow: Optional[RagWorkflow] = None
+warmup = Warmup(
+    llm_service=llm_service,
+    nlp_processor=nlp_processor,
+    queries=settings.WARMUP_QUERIES,
+    timeout_seconds=settings.WARMUP_TIMEOUT_SECONDS
+)
+
+register_cache("workflow_context", workflow_manager.stats)
+register_cache("speculative_retrieval", lambda: speculative_retrieval_stats)
+if response_cache:
+    register_cache("response", response_cache.stats)
+if record_cache:
+    register_cache("record", record_cache.stats)
+
+# A re-index can change the records behind a cached answer, or the content of a cached record.
+# The local index is reloaded first, so nothing is re-cached from the old one
+index_version_watcher.on_change(weaviate_manager.reload_local_indexes)
+if response_cache:
+    index_version_watcher.on_change(response_cache.invalidate)
+if record_cache:
+    index_version_watcher.on_change(record_cache.invalidate)
 
 def get_weaviate_manager() -> WeaviateManager:
     return weaviate_manager
@@ -22,6 +174,12 @@ def get_weaviate_manager() -> WeaviateManager:
 def get_workflow_manager() -> WorkflowManager:
     return workflow_manager
 
+def get_admission_controller() -> Optional[AdmissionController]:
+    return admission_controller
+
+def get_warmup() -> Warmup:
+    return warmup
+
 def get_project_repo() -> ProjectRepository:
     return weaviate_manager.get_project_repo()
 
@@ -29,7 +187,13 @@ def get_case_study_repo() -> CaseStudyRepository:
     return weaviate_manager.get_case_study_repo()
 
 def get_llm_service() -> LLMService:
-    return OpenAILLMService()
+    return llm_service
+
+def get_response_cache() -> Optional[ResponseCache]:
+    return response_cache
+
+def get_record_cache() -> Optional[RecordCache]:
+    return record_cache
 
 def get_aggregator() -> WeightedAggregator:
     return WeightedAggregator()
@@ -37,27 +201,39 @@ def get_aggregator() -> WeightedAggregator:
 def get_query_preprocessor() -> QueryPreprocessor:
     return QueryPreprocessor()
 
-def get_nlp_processor(
-        llm_service: Annotated[LLMService, Depends(get_llm_service)],
-    ) -> NLPProcessor:
-        return LLMNLPProcessor(llm_service=llm_service)
-
-def get_rag_workflow(
-        project_repo: Annotated[ProjectRepository, Depends(get_project_repo)],
-        case_study_repo: Annotated[CaseStudyRepository, Depends(get_case_study_repo)],
-        nlp_processor: Annotated[NLPProcessor, Depends(get_nlp_processor)],
-        llm_service: Annotated[LLMService, Depends(get_llm_service)],
-        aggregator: Annotated[WeightedAggregator, Depends(get_aggregator)],
-        query_preprocessor: Annotated[QueryPreprocessor, Depends(get_query_preprocessor)]
-    ) -> RagWorkflow:
-        return RagWorkflow(
-            project_repo=project_repo, 
-            case_study_repo=case_study_repo, 
-            nlp_processor=nlp_processor, 
-            llm_service=llm_service,
-            aggregator=aggregator,
-            query_preprocessor=query_preprocessor
-        )
+def get_context_packer() -> ContextPacker:
+    return ContextPacker(
+        max_tokens=settings.SUMMARY_PROMPT_MAX_TOKENS,
+        max_field_tokens=settings.SUMMARY_FIELD_MAX_TOKENS,
+        max_query_tokens=settings.SUMMARY_QUERY_MAX_TOKENS,
+        model=settings.OPENAI_CHAT_MODEL
+    )
+
+def get_nlp_processor() -> NLPProcessor:
+    return nlp_processor
+
+def create_rag_workflow() -> RagWorkflow:
+    # Per-run state lives in the workflow Context, so one instance serves every concurrent run
+    return RagWorkflow(
+        project_repo=get_project_repo(),
+        case_study_repo=get_case_study_repo(),
+        nlp_processor=get_nlp_processor(),
+        llm_service=get_llm_service(),
+        aggregator=get_aggregator(),
+        query_preprocessor=get_query_preprocessor(),
+        context_packer=get_context_packer(),
+        response_cache=get_response_cache(),
+        record_cache=get_record_cache()
+    )
+
+def get_rag_workflow() -> RagWorkflow:
+    """Returns the shared workflow, building it on first use. The lifespan builds it once the connections are open."""
+    global rag_workflow
+    if rag_workflow is None:
+        rag_workflow = create_rag_workflow()
+    return rag_workflow
 
 RagWorkflowDep = Annotated[RagWorkflow, Depends(get_rag_workflow)]
 WorkflowManagerDep = Annotated[WorkflowManager, Depends(get_workflow_manager)]
+AdmissionControllerDep = Annotated[Optional[AdmissionController], Depends(get_admission_controller)]
+WarmupDep = Annotated[Warmup, Depends(get_warmup)]
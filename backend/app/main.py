@@ -1,19 +1,45 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from fastapi import FastAPI, Request
 from app.api.routes import router
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from app.dependencies import weaviate_manager
+from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.core.metrics import HTTP_REQUEST_SECONDS, HTTP_REQUESTS_IN_FLIGHT
+from app.dependencies import get_case_study_repo, get_project_repo, get_rag_workflow, index_version_watcher, weaviate_manager, llm_service, warmup, workflow_manager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    configure_logging()
     # Startup: Open the gRPC connection pool
     await weaviate_manager.connect() 
+    # Startup: Open the shared OpenAI HTTP connection pool
+    await llm_service.connect()
+    # Startup: Build the shared workflow and its collaborators once for all requests
+    get_rag_workflow()
+    # Startup: Warm up in the background; /ready answers 503 until it has finished
+    warmup_task = None
+    if settings.WARMUP_ENABLED:
+        warmup_task = asyncio.create_task(warmup.run(get_project_repo(), get_case_study_repo()))
+    else:
+        warmup.skip()
+    # Startup: Follow re-indexing by load-data, which invalidates what was cached from the old index
+    index_watch_task = asyncio.create_task(index_version_watcher.watch())
     yield
+    index_watch_task.cancel()
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
     # Shutdown: Gracefully close connections
+    await llm_service.close()
     await weaviate_manager.disconnect()
+    await workflow_manager.close()
 
 app = FastAPI(lifespan=lifespan)
 
+# Scrapes and probes would otherwise dominate the request metrics
+UNMEASURED_PATHS = ("/metrics", "/ready")
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -22,4 +48,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    if request.url.path in UNMEASURED_PATHS:
+        return await call_next(request)
+
+    # Streaming responses are timed until their headers are sent; the stream itself is covered by the step metrics
+    status = "500"
+    start_time = time.perf_counter()
+    HTTP_REQUESTS_IN_FLIGHT.inc()
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        # Labelled by route template once routing has run, so unknown paths cannot grow the label set
+        route = request.scope.get("route")
+        path = route.path if route else "unmatched"
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start_time, method=request.method, path=path, status=status)
+
 app.include_router(router)
\ No newline at end of file
@@ -0,0 +1,6 @@
+from typing import Dict
+from pydantic import BaseModel
+
+class BatchInsertResult(BaseModel):
+    inserted: int = 0
+    errors: Dict[int, str] = {}
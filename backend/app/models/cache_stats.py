@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+class CacheStats(BaseModel):
+    size: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
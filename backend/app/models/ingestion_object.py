@@ -0,0 +1,7 @@
+from typing import Any, Dict, List, Optional, Union
+from pydantic import BaseModel
+
+class IngestionObject(BaseModel):
+    uuid: Optional[str] = None
+    properties: Dict[str, Any]
+    vector: Union[List[float], Dict[str, List[float]]]
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+class IngestionStats(BaseModel):
+    name: str
+    records: int = 0
+    failed: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    batches: int = 0
+    embed_seconds: float = 0.0
+    write_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    def report(self) -> str:
+        return (
+            f"{self.name}: {self.records} records loaded, {self.unchanged} unchanged, {self.deleted} deleted, "
+            f"{self.failed} failed in {self.batches} batches "
+            f"over {self.elapsed_seconds:.2f}s ({self._rate(self.records + self.failed, self.elapsed_seconds)} records/s overall, "
+            f"embedding {self._rate(self.records + self.failed, self.embed_seconds)} records/s per worker, "
+            f"writing {self._rate(self.records, self.write_seconds)} records/s per worker)"
+        )
+
+    def _rate(self, count: int, seconds: float) -> str:
+        return f"{count / seconds:.1f}" if seconds > 0 else "n/a"
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+class PackedPrompt(BaseModel):
+    system_prompt: str
+    user_message: str
+    token_count: int
+    records_included: int
+    records_total: int
+    fields_truncated: int = 0
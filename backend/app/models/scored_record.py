@@ -1,8 +1,9 @@
 from pydantic import BaseModel
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TypeVar
 
 T = TypeVar("T")
 
 class ScoredRecord(BaseModel, Generic[T]):
+    id: Optional[str] = None
     record: T
     score: float
\ No newline at end of file
@@ -5,5 +5,5 @@ T = TypeVar("T")
 
 class VectorSearchResult(BaseModel, Generic[T]):
     id: str
-    obj: T
+    obj: Optional[T] = None
     certainty: Optional[float] = None
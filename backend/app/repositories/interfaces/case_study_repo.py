@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, List
 
 from app.models.case_study import CaseStudy
+from app.models.batch_insert_result import BatchInsertResult
+from app.models.ingestion_object import IngestionObject
 from app.models.vector_search_result import VectorSearchResult
 
 class CaseStudyRepository(ABC):
@@ -10,10 +12,30 @@ class CaseStudyRepository(ABC):
     async def create_schema(self) -> None:
         pass
 
+    @abstractmethod
+    async def ensure_schema(self) -> None:
+        pass
+
     @abstractmethod
     async def insert_case_study(self, properties: Dict[str, Any], vector: List[float]) -> None:
         pass
 
     @abstractmethod
-    async def retrieve_case_study_records(self, vector, top_k) -> List[VectorSearchResult[CaseStudy]]:
+    async def insert_case_studies(self, objects: List[IngestionObject]) -> BatchInsertResult:
+        pass
+
+    @abstractmethod
+    async def get_content_hashes(self) -> Dict[str, str]:
+        pass
+
+    @abstractmethod
+    async def delete_case_studies(self, ids: List[str]) -> int:
+        pass
+
+    @abstractmethod
+    async def retrieve_case_study_records(self, vector, top_k, include_properties=True) -> List[VectorSearchResult[CaseStudy]]:
+        pass
+
+    @abstractmethod
+    async def get_case_studies_by_ids(self, ids: List[str]) -> Dict[str, CaseStudy]:
         pass
\ No newline at end of file
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from typing import Dict, Any, List
 
 from app.models.project import Project
+from app.models.batch_insert_result import BatchInsertResult
+from app.models.ingestion_object import IngestionObject
 from app.models.vector_search_result import VectorSearchResult
 
 class ProjectRepository(ABC):
@@ -10,14 +12,38 @@ class ProjectRepository(ABC):
     async def create_schema(self) -> None:
         pass
 
+    @abstractmethod
+    async def ensure_schema(self) -> None:
+        pass
+
     @abstractmethod
     async def insert_project(self, properties: Dict[str, Any], vector_data: Dict[str, List[float]]) -> None:
         pass
 
     @abstractmethod
-    async def retrieve_project_records_by_technical_vector(self, vector, top_k) -> List[VectorSearchResult[Project]]:
+    async def insert_projects(self, objects: List[IngestionObject]) -> BatchInsertResult:
+        pass
+
+    @abstractmethod
+    async def get_content_hashes(self) -> Dict[str, str]:
+        pass
+
+    @abstractmethod
+    async def delete_projects(self, ids: List[str]) -> int:
+        pass
+
+    @abstractmethod
+    async def retrieve_project_records_by_technical_vector(self, vector, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
+        pass
+
+    @abstractmethod
+    async def retrieve_project_records_by_service_vector(self, vector, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
+        pass
+
+    @abstractmethod
+    async def retrieve_project_records_by_weighted_vectors(self, technical_vector, service_vector, technical_weight, service_weight, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
         pass
 
     @abstractmethod
-    async def retrieve_project_records_by_service_vector(self, vector, top_k) -> List[VectorSearchResult[Project]]:
+    async def get_projects_by_ids(self, ids: List[str]) -> Dict[str, Project]:
         pass
\ No newline at end of file
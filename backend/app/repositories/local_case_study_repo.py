@@ -0,0 +1,57 @@
+import uuid
+from typing import Dict, List
+
+from app.core.metrics import REPOSITORY_QUERY_SECONDS, timed
+from app.models.case_study import CaseStudy
+from app.models.batch_insert_result import BatchInsertResult
+from app.models.ingestion_object import IngestionObject
+from app.models.vector_search_result import VectorSearchResult
+from app.repositories.interfaces.case_study_repo import CaseStudyRepository
+from app.repositories.local_vector_index import LocalVectorIndex
+
+class LocalCaseStudyRepository(CaseStudyRepository):
+    COLLECTION_NAME = "CaseStudy"
+    VECTOR_NAMES = ["default"]
+
+    def __init__(self, index: LocalVectorIndex):
+        self._index = index
+
+    async def create_schema(self) -> None:
+        self._index.clear()
+
+    async def ensure_schema(self) -> None:
+        pass
+
+    async def insert_case_study(self, properties: Dict[str, any], vector: List[float]) -> None:
+        self._index.upsert([(str(uuid.uuid4()), properties, {"default": vector})])
+
+    async def insert_case_studies(self, objects: List[IngestionObject]) -> BatchInsertResult:
+        self._index.upsert([
+            (item.uuid or str(uuid.uuid4()), item.properties, {"default": item.vector})
+            for item in objects
+        ])
+        return BatchInsertResult(inserted = len(objects))
+
+    async def get_content_hashes(self) -> Dict[str, str]:
+        return {
+            record_id: properties.get("contentHash")
+            for record_id, properties in self._index.properties().items()
+        }
+
+    async def delete_case_studies(self, ids: List[str]) -> int:
+        return self._index.delete(ids)
+
+    @timed(REPOSITORY_QUERY_SECONDS, backend="local", collection=COLLECTION_NAME, operation="near_vector")
+    async def retrieve_case_study_records(self, vector, top_k, include_properties=True) -> List[VectorSearchResult[CaseStudy]]:
+        return [
+            VectorSearchResult[CaseStudy](
+                id = record_id,
+                obj = CaseStudy.model_validate(properties) if include_properties else None,
+                certainty = certainty
+            )
+            for record_id, properties, certainty in self._index.search("default", vector, top_k)
+        ]
+
+    @timed(REPOSITORY_QUERY_SECONDS, backend="local", collection=COLLECTION_NAME, operation="fetch_by_ids")
+    async def get_case_studies_by_ids(self, ids: List[str]) -> Dict[str, CaseStudy]:
+        return {record_id: CaseStudy.model_validate(properties) for record_id, properties in self._index.get(ids).items()}
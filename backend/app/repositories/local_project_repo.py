@@ -0,0 +1,77 @@
+import uuid
+from typing import Dict, List
+
+from app.core.metrics import REPOSITORY_QUERY_SECONDS, timed
+from app.models.project import Project
+from app.models.batch_insert_result import BatchInsertResult
+from app.models.ingestion_object import IngestionObject
+from app.models.vector_search_result import VectorSearchResult
+from app.repositories.interfaces.project_repo import ProjectRepository
+from app.repositories.local_vector_index import LocalVectorIndex
+
+class LocalProjectRepository(ProjectRepository):
+    COLLECTION_NAME = "Project"
+    VECTOR_NAMES = ["technicalVector", "serviceVector"]
+
+    def __init__(self, index: LocalVectorIndex):
+        self._index = index
+
+    async def create_schema(self) -> None:
+        self._index.clear()
+
+    async def ensure_schema(self) -> None:
+        pass
+
+    async def insert_project(self, properties: Dict[str, any], vector_data: Dict[str, List[float]]) -> None:
+        self._index.upsert([(str(uuid.uuid4()), properties, vector_data)])
+
+    async def insert_projects(self, objects: List[IngestionObject]) -> BatchInsertResult:
+        self._index.upsert([
+            (item.uuid or str(uuid.uuid4()), item.properties, item.vector)
+            for item in objects
+        ])
+        return BatchInsertResult(inserted = len(objects))
+
+    async def get_content_hashes(self) -> Dict[str, str]:
+        return {
+            record_id: properties.get("contentHash")
+            for record_id, properties in self._index.properties().items()
+        }
+
+    async def delete_projects(self, ids: List[str]) -> int:
+        return self._index.delete(ids)
+
+    async def retrieve_project_records_by_technical_vector(self, vector, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
+        return await self.retrieve_project_records(vector, "technicalVector", top_k, include_properties)
+
+    async def retrieve_project_records_by_service_vector(self, vector, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
+        return await self.retrieve_project_records(vector, "serviceVector", top_k, include_properties)
+
+    @timed(REPOSITORY_QUERY_SECONDS, backend="local", collection=COLLECTION_NAME, operation="near_vector_weighted")
+    async def retrieve_project_records_by_weighted_vectors(self, technical_vector, service_vector, technical_weight, service_weight, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
+        results = self._index.search_weighted(
+            {
+                "technicalVector": (technical_vector, technical_weight),
+                "serviceVector": (service_vector, service_weight)
+            },
+            top_k
+        )
+        return self._build_search_results(results, include_properties)
+
+    @timed(REPOSITORY_QUERY_SECONDS, backend="local", collection=COLLECTION_NAME, operation="near_vector")
+    async def retrieve_project_records(self, vector, vector_name, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
+        return self._build_search_results(self._index.search(vector_name, vector, top_k), include_properties)
+
+    @timed(REPOSITORY_QUERY_SECONDS, backend="local", collection=COLLECTION_NAME, operation="fetch_by_ids")
+    async def get_projects_by_ids(self, ids: List[str]) -> Dict[str, Project]:
+        return {record_id: Project.model_validate(properties) for record_id, properties in self._index.get(ids).items()}
+
+    def _build_search_results(self, results, include_properties) -> List[VectorSearchResult[Project]]:
+        return [
+            VectorSearchResult[Project](
+                id = record_id,
+                obj = Project.model_validate(properties) if include_properties else None,
+                certainty = certainty
+            )
+            for record_id, properties, certainty in results
+        ]
@@ -0,0 +1,176 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+Properties = Dict[str, Any]
+
+class LocalVectorIndex:
+    """
+    In-process exact vector index for one collection. Each named vector is a contiguous float32
+    matrix of L2-normalized rows, persisted as .npy files and memory-mapped on load, so cosine
+    top-k is a single matrix-vector product followed by argpartition.
+    """
+
+    def __init__(self, directory: str, name: str, vector_names: List[str]):
+        self._directory = directory
+        self._name = name
+        self._vector_names = vector_names
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._properties: List[Properties] = []
+        self._vectors: Dict[str, Optional[np.ndarray]] = {vector_name: None for vector_name in vector_names}
+        self._dirty = False
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def load(self) -> None:
+        properties_path = self._properties_path()
+        if not os.path.exists(properties_path):
+            return
+
+        with open(properties_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+
+        vectors: Dict[str, Optional[np.ndarray]] = {}
+        for vector_name in self._vector_names:
+            vector_path = self._vector_path(vector_name)
+            vectors[vector_name] = np.load(vector_path, mmap_mode="r") if os.path.exists(vector_path) else None
+
+        # Everything is read before any of it is swapped in, so a reload never leaves rows and ids out of step
+        self._ids = [entry["id"] for entry in entries]
+        self._properties = [entry["properties"] for entry in entries]
+        self._positions = {record_id: position for position, record_id in enumerate(self._ids)}
+        self._vectors = vectors
+
+        self._dirty = False
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        os.makedirs(self._directory, exist_ok=True)
+        for vector_name, matrix in self._vectors.items():
+            if matrix is not None:
+                self._replace_file(self._vector_path(vector_name), lambda f, m=matrix: np.save(f, m))
+
+        entries = [{"id": record_id, "properties": properties} for record_id, properties in zip(self._ids, self._properties)]
+        self._replace_file(self._properties_path(), lambda f: f.write(json.dumps(entries).encode("utf-8")))
+        self._dirty = False
+
+    def clear(self) -> None:
+        self._ids = []
+        self._positions = {}
+        self._properties = []
+        self._vectors = {vector_name: None for vector_name in self._vector_names}
+        self._dirty = True
+
+    def upsert(self, records: List[Tuple[str, Properties, Dict[str, List[float]]]]) -> None:
+        new_rows: Dict[str, List[np.ndarray]] = {vector_name: [] for vector_name in self._vector_names}
+
+        for record_id, properties, vectors in records:
+            position = self._positions.get(record_id)
+            if position is None:
+                self._positions[record_id] = len(self._ids)
+                self._ids.append(record_id)
+                self._properties.append(properties)
+                for vector_name in self._vector_names:
+                    new_rows[vector_name].append(self._normalize(vectors[vector_name]))
+            else:
+                self._properties[position] = properties
+                for vector_name in self._vector_names:
+                    matrix = self._writable(vector_name)
+                    matrix[position] = self._normalize(vectors[vector_name])
+
+        for vector_name, rows in new_rows.items():
+            if rows:
+                matrix = self._vectors[vector_name]
+                stacked = np.vstack(rows).astype(np.float32)
+                self._vectors[vector_name] = stacked if matrix is None else np.vstack([matrix, stacked])
+
+        self._dirty = True
+
+    def delete(self, ids: List[str]) -> int:
+        positions = {self._positions[record_id] for record_id in ids if record_id in self._positions}
+        if not positions:
+            return 0
+
+        keep = np.array([position not in positions for position in range(len(self._ids))], dtype=bool)
+        self._ids = [record_id for record_id, kept in zip(self._ids, keep) if kept]
+        self._properties = [properties for properties, kept in zip(self._properties, keep) if kept]
+        self._positions = {record_id: position for position, record_id in enumerate(self._ids)}
+        for vector_name, matrix in self._vectors.items():
+            if matrix is not None:
+                self._vectors[vector_name] = np.ascontiguousarray(matrix[keep])
+
+        self._dirty = True
+        return len(positions)
+
+    def search(self, vector_name: str, vector: List[float], top_k: int) -> List[Tuple[str, Properties, float]]:
+        return self.search_weighted({vector_name: (vector, 1.0)}, top_k)
+
+    def search_weighted(self, queries: Dict[str, Tuple[List[float], float]], top_k: int) -> List[Tuple[str, Properties, float]]:
+        """Ranks every row by the weighted sum of its per-vector cosine similarities; weights are expected to sum to 1."""
+        if not self._ids or top_k <= 0:
+            return []
+
+        similarities = np.zeros(len(self._ids), dtype=np.float32)
+        for vector_name, (vector, weight) in queries.items():
+            matrix = self._vectors[vector_name]
+            if matrix is None:
+                return []
+            similarities += weight * (matrix @ self._normalize(vector))
+
+        return self._top_k(similarities, top_k)
+
+    def properties(self) -> Dict[str, Properties]:
+        return dict(zip(self._ids, self._properties))
+
+    def get(self, ids: List[str]) -> Dict[str, Properties]:
+        return {record_id: self._properties[self._positions[record_id]] for record_id in ids if record_id in self._positions}
+
+    def _top_k(self, similarities: np.ndarray, top_k: int) -> List[Tuple[str, Properties, float]]:
+        k = min(top_k, similarities.shape[0])
+        candidates = np.argpartition(-similarities, k - 1)[:k]
+        ranked = candidates[np.argsort(-similarities[candidates])]
+
+        # Reported like Weaviate's certainty for cosine distance: (1 + cosine) / 2
+        return [
+            (self._ids[position], self._properties[position], float((1.0 + similarities[position]) / 2.0))
+            for position in ranked
+        ]
+
+    def _writable(self, vector_name: str) -> np.ndarray:
+        matrix = self._vectors[vector_name]
+        if not matrix.flags.writeable:
+            matrix = np.array(matrix)
+            self._vectors[vector_name] = matrix
+        return matrix
+
+    def _normalize(self, vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
+    def _replace_file(self, path: str, write) -> None:
+        # Written beside the target and swapped in, so a reader never maps a half-written file
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            write(f)
+        os.replace(temp_path, path)
+
+    def _properties_path(self) -> str:
+        return os.path.join(self._directory, f"{self._name}.json")
+
+    def _vector_path(self, vector_name: str) -> str:
+        return os.path.join(self._directory, f"{self._name}.{vector_name}.npy")
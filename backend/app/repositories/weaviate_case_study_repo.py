@@ -1,9 +1,13 @@
 from typing import Dict, List
 from weaviate import WeaviateAsyncClient
 from weaviate.classes.config import Property, DataType
-from weaviate.classes.query import MetadataQuery
+from weaviate.classes.data import DataObject
+from weaviate.classes.query import Filter, MetadataQuery
 
+from app.core.metrics import REPOSITORY_QUERY_SECONDS, timed
 from app.models.case_study import CaseStudy
+from app.models.batch_insert_result import BatchInsertResult
+from app.models.ingestion_object import IngestionObject
 from app.models.vector_search_result import VectorSearchResult
 from app.repositories.interfaces.case_study_repo import CaseStudyRepository
 
@@ -19,6 +23,21 @@ class WeaviateCaseStudyRepository(CaseStudyRepository):
         if exists:
             await self._client.collections.delete(self.COLLECTION_NAME)
                 
+        await self._create_collection()
+
+    async def ensure_schema(self) -> None:
+        exists = await self._client.collections.exists(self.COLLECTION_NAME)
+        if not exists:
+            await self._create_collection()
+            return
+
+        # Collections created before content hashing was introduced get the property added in place
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        config = await collection.config.get()
+        if not any(prop.name == "contentHash" for prop in config.properties):
+            await collection.config.add_property(Property(name="contentHash", data_type=DataType.TEXT))
+
+    async def _create_collection(self) -> None:
         await self._client.collections.create(
             self.COLLECTION_NAME,
             properties = [
@@ -28,7 +47,8 @@ class WeaviateCaseStudyRepository(CaseStudyRepository):
                 Property(name="solutionsProvided", data_type=DataType.TEXT_ARRAY),
                 Property(name="services", data_type=DataType.TEXT_ARRAY),
                 Property(name="detailedContent", data_type=DataType.TEXT),
-                Property(name="sourceUrl", data_type=DataType.TEXT)
+                Property(name="sourceUrl", data_type=DataType.TEXT),
+                Property(name="contentHash", data_type=DataType.TEXT)
             ],
             vector_config=None
         )
@@ -41,35 +61,73 @@ class WeaviateCaseStudyRepository(CaseStudyRepository):
             vector = vector
         )
 
-    async def retrieve_case_study_records(self, vector, top_k) -> List[VectorSearchResult[CaseStudy]]:
-        case_studies_search_results: list[VectorSearchResult[CaseStudy]] = []
+    async def insert_case_studies(self, objects: List[IngestionObject]) -> BatchInsertResult:
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        response = await collection.data.insert_many([
+            DataObject(properties = item.properties, vector = item.vector, uuid = item.uuid)
+            for item in objects
+        ])
+
+        return BatchInsertResult(
+            inserted = len(objects) - len(response.errors),
+            errors = {index: error.message for index, error in response.errors.items()}
+        )
+
+    async def get_content_hashes(self) -> Dict[str, str]:
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        return {
+            str(item.uuid): item.properties.get("contentHash")
+            async for item in collection.iterator(return_properties=["contentHash"])
+        }
+
+    async def delete_case_studies(self, ids: List[str]) -> int:
+        if not ids:
+            return 0
+
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        response = await collection.data.delete_many(where=Filter.by_id().contains_any(ids))
+        return response.successful
+
+    @timed(REPOSITORY_QUERY_SECONDS, backend="weaviate", collection=COLLECTION_NAME, operation="near_vector")
+    async def retrieve_case_study_records(self, vector, top_k, include_properties=True) -> List[VectorSearchResult[CaseStudy]]:
         collection = self._client.collections.get(self.COLLECTION_NAME)
         records = await collection.query.near_vector(
             near_vector = vector,
             limit = top_k,
             target_vector = "default",
-            return_metadata = MetadataQuery(certainty=True)
+            return_metadata = MetadataQuery(certainty=True),
+            return_properties = None if include_properties else []
         )
 
-        for item in records.objects:
-            props = item.properties
-
-            case_study = CaseStudy(
-                title = props["title"],
-                industry = props["industry"],
-                technologies = props["technologies"],
-                solutionsProvided = props["solutionsProvided"],
-                services = props["services"],
-                detailedContent = props["detailedContent"],
-                sourceUrl = props["sourceUrl"]
-            )
-
-            vector_search_result = VectorSearchResult[CaseStudy](
+        # Without properties the detailedContent of every hit stays in the database until it survives thresholding
+        return [
+            VectorSearchResult[CaseStudy](
                 id = str(item.uuid),
-                obj = case_study,
+                obj = self._build_case_study(item.properties) if include_properties else None,
                 certainty = item.metadata.certainty
             )
+            for item in records.objects
+        ]
 
-            case_studies_search_results.append(vector_search_result)
+    @timed(REPOSITORY_QUERY_SECONDS, backend="weaviate", collection=COLLECTION_NAME, operation="fetch_by_ids")
+    async def get_case_studies_by_ids(self, ids: List[str]) -> Dict[str, CaseStudy]:
+        if not ids:
+            return {}
 
-        return case_studies_search_results
\ No newline at end of file
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        records = await collection.query.fetch_objects(
+            filters = Filter.by_id().contains_any(ids),
+            limit = len(ids)
+        )
+        return {str(item.uuid): self._build_case_study(item.properties) for item in records.objects}
+
+    def _build_case_study(self, props) -> CaseStudy:
+        return CaseStudy(
+            title = props["title"],
+            industry = props["industry"],
+            technologies = props["technologies"],
+            solutionsProvided = props["solutionsProvided"],
+            services = props["services"],
+            detailedContent = props["detailedContent"],
+            sourceUrl = props["sourceUrl"]
+        )
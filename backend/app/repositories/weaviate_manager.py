@@ -1,21 +1,32 @@
-from typing import Optional
-import weaviate
-from weaviate import WeaviateAsyncClient
+from typing import TYPE_CHECKING, Optional
 
 from app.core.config import settings
+from app.core.logging_config import logger
 from app.repositories.interfaces.project_repo import ProjectRepository
 from app.repositories.interfaces.case_study_repo import CaseStudyRepository
-from app.repositories.weaviate_project_repo import WeaviateProjectRepository
-from app.repositories.weaviate_case_study_repo import WeaviateCaseStudyRepository
+from app.repositories.local_case_study_repo import LocalCaseStudyRepository
+from app.repositories.local_project_repo import LocalProjectRepository
+from app.repositories.local_vector_index import LocalVectorIndex
+
+# The weaviate client takes longer to import than the rest of the app; it is only imported for that backend
+if TYPE_CHECKING:
+    from weaviate import WeaviateAsyncClient
 
 class WeaviateManager:
 
     def __init__(self):
         self._host = settings.WEAVIATE_HOST
-        self._client: Optional[WeaviateAsyncClient] = None
+        self._backend = settings.VECTOR_STORE_BACKEND
+        self._client: Optional["WeaviateAsyncClient"] = None
+        self._project_index: Optional[LocalVectorIndex] = None
+        self._case_study_index: Optional[LocalVectorIndex] = None
 
     async def connect(self):
+        if self._backend == "local":
+            return self._load_local_indexes()
+
         if self._client is None:
+            import weaviate
             self._client = weaviate.use_async_with_local(host=self._host)
             await self._client.connect()
         return self._client
@@ -25,13 +36,61 @@ class WeaviateManager:
             await self._client.close()
             self._client = None
 
-    def get_client(self) -> WeaviateAsyncClient:
+        for index in (self._project_index, self._case_study_index):
+            if index is not None:
+                index.save()
+        self._project_index = None
+        self._case_study_index = None
+
+    def get_client(self) -> "WeaviateAsyncClient":
         if self._client is None:
             raise RuntimeError("Weaviate client is not connected")
         return self._client
 
     def get_project_repo(self) -> ProjectRepository:
+        if self._backend == "local":
+            return LocalProjectRepository(index=self._get_local_index(self._project_index))
+        from app.repositories.weaviate_project_repo import WeaviateProjectRepository
         return WeaviateProjectRepository(client=self.get_client())
     
     def get_case_study_repo(self) -> CaseStudyRepository:
-        return WeaviateCaseStudyRepository(client=self.get_client())
\ No newline at end of file
+        if self._backend == "local":
+            return LocalCaseStudyRepository(index=self._get_local_index(self._case_study_index))
+        from app.repositories.weaviate_case_study_repo import WeaviateCaseStudyRepository
+        return WeaviateCaseStudyRepository(client=self.get_client())
+
+    def reload_local_indexes(self) -> None:
+        """
+        Re-reads the local indexes after load-data rewrote them. The repositories keep their index objects,
+        so the new data is swapped into those. An index with unsaved changes of its own is left as it is.
+        """
+        for index in (self._project_index, self._case_study_index):
+            if index is None:
+                continue
+            if index.dirty:
+                logger.warning(f"Local index {index.name} has unsaved changes, not reloading it")
+                continue
+            index.load()
+            logger.info(f"Local index {index.name} reloaded with {len(index)} records")
+
+    def _load_local_indexes(self) -> None:
+        if self._project_index is None:
+            self._project_index = LocalVectorIndex(
+                directory=settings.LOCAL_INDEX_DIR,
+                name=LocalProjectRepository.COLLECTION_NAME,
+                vector_names=LocalProjectRepository.VECTOR_NAMES
+            )
+            self._project_index.load()
+
+        if self._case_study_index is None:
+            self._case_study_index = LocalVectorIndex(
+                directory=settings.LOCAL_INDEX_DIR,
+                name=LocalCaseStudyRepository.COLLECTION_NAME,
+                vector_names=LocalCaseStudyRepository.VECTOR_NAMES
+            )
+            self._case_study_index.load()
+
+    def _get_local_index(self, index: Optional[LocalVectorIndex]) -> LocalVectorIndex:
+        if index is None:
+            raise RuntimeError("Local vector index is not loaded")
+        return index
@@ -1,9 +1,13 @@
 from typing import Dict, List
 from weaviate import WeaviateAsyncClient
 from weaviate.classes.config import Configure, Property, DataType
-from weaviate.classes.query import MetadataQuery
+from weaviate.classes.data import DataObject
+from weaviate.classes.query import Filter, MetadataQuery, TargetVectors
 
+from app.core.metrics import REPOSITORY_QUERY_SECONDS, timed
 from app.models.project import Project
+from app.models.batch_insert_result import BatchInsertResult
+from app.models.ingestion_object import IngestionObject
 from app.models.vector_search_result import VectorSearchResult
 from app.repositories.interfaces.project_repo import ProjectRepository
 
@@ -18,6 +22,21 @@ class WeaviateProjectRepository(ProjectRepository):
         if exists:
             await self._client.collections.delete(self.COLLECTION_NAME)
         
+        await self._create_collection()
+
+    async def ensure_schema(self) -> None:
+        exists = await self._client.collections.exists(self.COLLECTION_NAME)
+        if not exists:
+            await self._create_collection()
+            return
+
+        # Collections created before content hashing was introduced get the property added in place
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        config = await collection.config.get()
+        if not any(prop.name == "contentHash" for prop in config.properties):
+            await collection.config.add_property(Property(name="contentHash", data_type=DataType.TEXT))
+
+    async def _create_collection(self) -> None:
         await self._client.collections.create(
             self.COLLECTION_NAME,
             properties = [
@@ -25,7 +44,8 @@ class WeaviateProjectRepository(ProjectRepository):
                 Property(name="techStack", data_type=DataType.TEXT_ARRAY),
                 Property(name="solutionsImplemented", data_type=DataType.TEXT_ARRAY),
                 Property(name="servicesOffered", data_type=DataType.TEXT_ARRAY),
-                Property(name="summary", data_type=DataType.TEXT)
+                Property(name="summary", data_type=DataType.TEXT),
+                Property(name="contentHash", data_type=DataType.TEXT)
             ],
             vector_config=[
                 Configure.Vectors.self_provided(
@@ -45,39 +65,106 @@ class WeaviateProjectRepository(ProjectRepository):
             vector = vector_data
         )
 
-    async def retrieve_project_records_by_technical_vector(self, vector, top_k) -> List[VectorSearchResult[Project]]:
-        return await self.retrieve_project_records(vector, "technicalVector", top_k)
+    async def insert_projects(self, objects: List[IngestionObject]) -> BatchInsertResult:
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        response = await collection.data.insert_many([
+            DataObject(properties = item.properties, vector = item.vector, uuid = item.uuid)
+            for item in objects
+        ])
+
+        return BatchInsertResult(
+            inserted = len(objects) - len(response.errors),
+            errors = {index: error.message for index, error in response.errors.items()}
+        )
+
+    async def get_content_hashes(self) -> Dict[str, str]:
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        return {
+            str(item.uuid): item.properties.get("contentHash")
+            async for item in collection.iterator(return_properties=["contentHash"])
+        }
 
-    async def retrieve_project_records_by_service_vector(self, vector, top_k) -> List[VectorSearchResult[Project]]:
-        return await self.retrieve_project_records(vector, "serviceVector", top_k)
+    async def delete_projects(self, ids: List[str]) -> int:
+        if not ids:
+            return 0
 
-    async def retrieve_project_records(self, vector, vector_name, top_k) -> List[VectorSearchResult[Project]]:
-        project_search_results: list[VectorSearchResult[Project]] = []
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        response = await collection.data.delete_many(where=Filter.by_id().contains_any(ids))
+        return response.successful
+
+    async def retrieve_project_records_by_technical_vector(self, vector, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
+        return await self.retrieve_project_records(vector, "technicalVector", top_k, include_properties)
+
+    async def retrieve_project_records_by_service_vector(self, vector, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
+        return await self.retrieve_project_records(vector, "serviceVector", top_k, include_properties)
+
+    @timed(REPOSITORY_QUERY_SECONDS, backend="weaviate", collection=COLLECTION_NAME, operation="near_vector_weighted")
+    async def retrieve_project_records_by_weighted_vectors(self, technical_vector, service_vector, technical_weight, service_weight, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
+        # One multi-target query: Weaviate computes the weighted sum of both distances for every candidate,
+        # including candidates that only made it into one of the two per-vector result lists
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        records = await collection.query.near_vector(
+            near_vector = {
+                "technicalVector": technical_vector,
+                "serviceVector": service_vector
+            },
+            limit = top_k,
+            target_vector = TargetVectors.manual_weights({
+                "technicalVector": technical_weight,
+                "serviceVector": service_weight
+            }),
+            return_metadata = MetadataQuery(distance=True),
+            return_properties = None if include_properties else []
+        )
+
+        # Cosine certainty is 1 - distance / 2, so with weights summing to 1 the combined distance maps
+        # to the same weighted certainty the aggregator produces
+        return [
+            self._build_search_result(item, 1 - item.metadata.distance / 2, include_properties)
+            for item in records.objects
+        ]
+
+    @timed(REPOSITORY_QUERY_SECONDS, backend="weaviate", collection=COLLECTION_NAME, operation="near_vector")
+    async def retrieve_project_records(self, vector, vector_name, top_k, include_properties=True) -> List[VectorSearchResult[Project]]:
         collection = self._client.collections.get(self.COLLECTION_NAME)
         records = await collection.query.near_vector(
             near_vector = vector,
             limit = top_k,
             target_vector = vector_name,
-            return_metadata = MetadataQuery(certainty=True)
+            return_metadata = MetadataQuery(certainty=True),
+            return_properties = None if include_properties else []
         )
 
-        for item in records.objects:
-            props = item.properties
+        return [
+            self._build_search_result(item, item.metadata.certainty, include_properties)
+            for item in records.objects
+        ]
 
-            project = Project(
-                title = props["title"],
-                techStack = props["techStack"],
-                solutionsImplemented = props["solutionsImplemented"],
-                servicesOffered = props["servicesOffered"],
-                summary = props["summary"]
-            )
+    @timed(REPOSITORY_QUERY_SECONDS, backend="weaviate", collection=COLLECTION_NAME, operation="fetch_by_ids")
+    async def get_projects_by_ids(self, ids: List[str]) -> Dict[str, Project]:
+        if not ids:
+            return {}
 
-            vector_search_result = VectorSearchResult[Project](
-                id = str(item.uuid),
-                obj = project,
-                certainty = item.metadata.certainty
-            )
+        collection = self._client.collections.get(self.COLLECTION_NAME)
+        records = await collection.query.fetch_objects(
+            filters = Filter.by_id().contains_any(ids),
+            limit = len(ids)
+        )
+        return {str(item.uuid): self._build_project(item.properties) for item in records.objects}
 
-            project_search_results.append(vector_search_result)
+    def _build_search_result(self, item, certainty, include_properties) -> VectorSearchResult[Project]:
+        # Without properties only the id and score travel over the wire; the project is loaded after thresholding
+        return VectorSearchResult[Project](
+            id = str(item.uuid),
+            obj = self._build_project(item.properties) if include_properties else None,
+            certainty = certainty
+        )
 
-        return project_search_results
\ No newline at end of file
+    def _build_project(self, props) -> Project:
+        return Project(
+            title = props["title"],
+            techStack = props["techStack"],
+            solutionsImplemented = props["solutionsImplemented"],
+            servicesOffered = props["servicesOffered"],
+            summary = props["summary"]
+        )
\ No newline at end of file
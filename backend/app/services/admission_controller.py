@@ -0,0 +1,113 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator, List, Optional, Tuple
+
+from app.core.logging_config import logger
+from app.core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTIONS, ADMISSION_WAIT_SECONDS
+
+class Priority(int, Enum):
+    # Lower values are admitted first
+    CONTINUATION = 0
+    NEW = 1
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted. Carries the HTTP status and the Retry-After hint."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(f"Request rejected by admission control: {reason}")
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """
+    Caps the number of workflow requests running at once. Requests over the cap wait in a bounded queue,
+    clarification continuations ahead of new conversations and FIFO within each, for at most max_wait_seconds.
+    A full queue rejects immediately with 429 and a wait that runs out with 503, both with a Retry-After hint
+    derived from the recent duration of admitted requests.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue_size: int, max_wait_seconds: float):
+        self._max_in_flight = max_in_flight
+        self._max_queue_size = max_queue_size
+        self._max_wait_seconds = max_wait_seconds
+        self._in_flight = 0
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._duration_average: Optional[float] = None
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start_time)
+
+    async def acquire(self, priority: Priority) -> None:
+        if self._in_flight < self._max_in_flight and not self._queue:
+            self._admit()
+            ADMISSION_WAIT_SECONDS.observe(0.0, priority=priority.name.lower())
+            return
+
+        if len(self._queue) >= self._max_queue_size:
+            raise self._reject(priority, 429, "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority.value, next(self._sequence), waiter))
+        ADMISSION_QUEUE_DEPTH.inc(priority=priority.name.lower())
+        start_time = time.perf_counter()
+        try:
+            # The waiter is resolved by release(), which hands the freed slot over directly
+            await asyncio.wait_for(asyncio.shield(waiter), self._max_wait_seconds)
+        except asyncio.TimeoutError:
+            if not self._withdraw(waiter):
+                # The slot was handed over in the same iteration the wait ran out
+                return
+            raise self._reject(priority, 503, "wait_timeout")
+        except BaseException:
+            if not self._withdraw(waiter):
+                self.release()
+            raise
+        finally:
+            ADMISSION_QUEUE_DEPTH.dec(priority=priority.name.lower())
+            ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - start_time, priority=priority.name.lower())
+
+    def release(self, duration: Optional[float] = None) -> None:
+        self._in_flight -= 1
+        ADMISSION_IN_FLIGHT.set(self._in_flight)
+        if duration is not None:
+            self._duration_average = duration if self._duration_average is None else 0.9 * self._duration_average + 0.1 * duration
+
+        while self._queue and self._in_flight < self._max_in_flight:
+            _, _, waiter = heapq.heappop(self._queue)
+            if not waiter.done():
+                self._admit()
+                waiter.set_result(None)
+
+    def _admit(self) -> None:
+        self._in_flight += 1
+        ADMISSION_IN_FLIGHT.set(self._in_flight)
+
+    def _withdraw(self, waiter: asyncio.Future) -> bool:
+        """Removes a waiter that gave up. Returns False when it had already been granted a slot."""
+        if waiter.done():
+            return False
+        waiter.cancel()
+        self._queue = [entry for entry in self._queue if entry[2] is not waiter]
+        heapq.heapify(self._queue)
+        return True
+
+    def _reject(self, priority: Priority, status_code: int, reason: str) -> AdmissionRejected:
+        ADMISSION_REJECTIONS.inc(priority=priority.name.lower(), reason=reason)
+        # Roughly the time until the requests ahead of a retry have drained
+        drain_seconds = (self._duration_average or 1.0) * (len(self._queue) + 1) / self._max_in_flight
+        retry_after = max(1, math.ceil(drain_seconds))
+        logger.warning(f"Shedding {priority.name.lower()} request ({reason}): {self._in_flight} in flight, {len(self._queue)} queued, retry after {retry_after}s")
+        return AdmissionRejected(status_code, reason, retry_after)
@@ -0,0 +1,153 @@
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from app.core import deadline
+from app.core.logging_config import logger
+from app.services.interfaces.llm_service import LLMService
+
+PendingEmbedding = Tuple[str, asyncio.Future]
+
+class BatchingLLMService(LLMService):
+    """
+    Decorates an LLMService with an embedding micro-batcher. Embedding requests issued by concurrent
+    workflows, single texts or lists, are collected for up to max_wait_ms (or until max_batch_size texts
+    are queued) and sent to the wrapped service as one generate_embeddings call.
+    """
+
+    def __init__(self, llm_service: LLMService, max_batch_size: int, max_wait_ms: float):
+        self._llm_service = llm_service
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_ms / 1000
+        self._pending: Dict[Optional[str], List[PendingEmbedding]] = {}
+        self._timers: Dict[Optional[str], asyncio.TimerHandle] = {}
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def connect(self):
+        return await self._llm_service.connect()
+
+    async def close(self):
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+        await self._llm_service.close()
+
+    async def generate_embedding(self, text, model: Optional[str] = None) -> List[float]:
+        future = self._enqueue(text, model)
+        # Only this caller's wait is bounded by its deadline; the shared batch request is not
+        return await deadline.run_with_timeout(future, None, "embedding")
+
+    async def generate_embeddings(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        if not texts:
+            return []
+
+        # The texts join the same pending batches as single requests, so concurrent callers still share one call
+        futures = [self._enqueue(text, model) for text in texts]
+        return list(await deadline.run_with_timeout(asyncio.gather(*futures), None, "embedding"))
+
+    async def generate_text(
+            self, 
+            system_prompt: str, 
+            user_message: str, 
+            model: Optional[str] = None, 
+            temperature: Optional[float] = None, 
+            max_tokens: Optional[int] = None, 
+            top_p: Optional[float] = None
+        ) -> str:
+        return await self._llm_service.generate_text(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p
+        )
+
+    async def generate_text_stream(
+            self, 
+            system_prompt: str, 
+            user_message: str, 
+            model: Optional[str] = None, 
+            temperature: Optional[float] = None, 
+            max_tokens: Optional[int] = None, 
+            top_p: Optional[float] = None
+        ) -> AsyncIterator[str]:
+        async for token in self._llm_service.generate_text_stream(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p
+        ):
+            yield token
+
+    async def generate_object(
+            self, 
+            system_prompt: str, 
+            user_message: str, 
+            response_format: type, 
+            model: Optional[str] = None, 
+            temperature: Optional[float] = None, 
+            max_tokens: Optional[int] = None, 
+            top_p: Optional[float] = None
+        ):
+        return await self._llm_service.generate_object(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            response_format=response_format,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p
+        )
+
+    def _enqueue(self, text: str, model: Optional[str]) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._pending.setdefault(model, [])
+        batch.append((text, future))
+
+        if len(batch) >= self._max_batch_size:
+            self._flush(model)
+        elif model not in self._timers:
+            self._timers[model] = loop.call_later(self._max_wait_seconds, self._flush, model)
+        return future
+
+    def _flush(self, model: Optional[str]) -> None:
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(model, [])
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._dispatch(model, batch))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, model: Optional[str], batch: List[PendingEmbedding]) -> None:
+        # The task inherits the context of whichever caller filled or timed the batch; its deadline must
+        # not cut short the embeddings of the other callers, so the request runs without one
+        deadline.start(None)
+        # Identical texts within a window share one slot in the request
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+
+        try:
+            embeddings = await self._llm_service.generate_embeddings(unique_texts, model=model)
+        except Exception as e:
+            logger.error(f"Batched embedding request of {len(unique_texts)} texts failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled, e.g. on shutdown; no waiter may be left hanging
+            for _, future in batch:
+                future.cancel()
+            raise
+
+        by_text = dict(zip(unique_texts, embeddings))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
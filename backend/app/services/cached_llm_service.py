@@ -0,0 +1,104 @@
+from typing import AsyncIterator, List, Optional
+
+from app.core.config import settings
+from app.services.embedding_cache import EmbeddingCache
+from app.services.interfaces.llm_service import LLMService
+
+class CachedLLMService(LLMService):
+    """Decorates an LLMService so repeated embedding requests are served from an EmbeddingCache."""
+
+    def __init__(self, llm_service: LLMService, embedding_cache: EmbeddingCache):
+        self._llm_service = llm_service
+        self._embedding_cache = embedding_cache
+        self._embed_model = settings.OPENAI_EMBED_MODEL
+
+    @property
+    def embedding_cache(self) -> EmbeddingCache:
+        return self._embedding_cache
+
+    async def connect(self):
+        return await self._llm_service.connect()
+
+    async def close(self):
+        self._embedding_cache.close()
+        await self._llm_service.close()
+
+    async def generate_embedding(self, text, model: Optional[str] = None) -> List[float]:
+        cache_model = model or self._embed_model
+        embedding = await self._embedding_cache.get(cache_model, text)
+        if embedding is not None:
+            return embedding
+
+        embedding = await self._llm_service.generate_embedding(text, model=model)
+        await self._embedding_cache.set(cache_model, text, embedding)
+        return embedding
+
+    async def generate_embeddings(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        cache_model = model or self._embed_model
+        embeddings: List[Optional[List[float]]] = [await self._embedding_cache.get(cache_model, text) for text in texts]
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            fetched = await self._llm_service.generate_embeddings([texts[i] for i in missing], model=model)
+            for i, embedding in zip(missing, fetched):
+                embeddings[i] = embedding
+                await self._embedding_cache.set(cache_model, texts[i], embedding)
+
+        return embeddings
+
+    async def generate_text(
+            self, 
+            system_prompt: str, 
+            user_message: str, 
+            model: Optional[str] = None, 
+            temperature: Optional[float] = None, 
+            max_tokens: Optional[int] = None, 
+            top_p: Optional[float] = None
+        ) -> str:
+        return await self._llm_service.generate_text(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p
+        )
+
+    async def generate_text_stream(
+            self, 
+            system_prompt: str, 
+            user_message: str, 
+            model: Optional[str] = None, 
+            temperature: Optional[float] = None, 
+            max_tokens: Optional[int] = None, 
+            top_p: Optional[float] = None
+        ) -> AsyncIterator[str]:
+        async for token in self._llm_service.generate_text_stream(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p
+        ):
+            yield token
+
+    async def generate_object(
+            self, 
+            system_prompt: str, 
+            user_message: str, 
+            response_format: type, 
+            model: Optional[str] = None, 
+            temperature: Optional[float] = None, 
+            max_tokens: Optional[int] = None, 
+            top_p: Optional[float] = None
+        ):
+        return await self._llm_service.generate_object(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            response_format=response_format,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p
+        )
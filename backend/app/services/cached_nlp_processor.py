@@ -0,0 +1,87 @@
+import hashlib
+import json
+import unicodedata
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.prompts import PARSE_SYSTEM_PROMPT, PARSE_USER_MESSAGE, CONDENSE_SYSTEM_PROMPT, CONDENSE_USER_MESSAGE
+from app.core.logging_config import logger
+from app.core.ttl_cache import TTLCache
+from app.models.cache_stats import CacheStats
+from app.models.intent_context import IntentContext
+from app.services.interfaces.nlp_processor import NLPProcessor
+
+def fingerprint(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()[:16]
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text or "").split()).casefold()
+
+# Editing a prompt or the response schema changes these versions, so entries produced by the old ones are never served
+PARSE_PROMPT_VERSION = fingerprint(PARSE_SYSTEM_PROMPT, PARSE_USER_MESSAGE)
+CONDENSE_PROMPT_VERSION = fingerprint(CONDENSE_SYSTEM_PROMPT, CONDENSE_USER_MESSAGE)
+INTENT_SCHEMA_VERSION = fingerprint(json.dumps(IntentContext.model_json_schema(), sort_keys=True))
+
+class CachedNLPProcessor(NLPProcessor):
+    """
+    Decorates an NLPProcessor so parse and condense results are memoized. Keys combine the model and
+    temperature, the prompt version, the normalized input and, for parsing, the response schema version.
+    Intent contexts are stored as serialized JSON so callers never share a mutable instance.
+    """
+
+    def __init__(self, nlp_processor: NLPProcessor, max_size: int, ttl_seconds: Optional[float]):
+        self._nlp_processor = nlp_processor
+        self._intent_cache: TTLCache[str, str] = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._condense_cache: TTLCache[str, str] = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    async def process_query(self, query: str) -> IntentContext:
+        key = fingerprint(
+            settings.OPENAI_PARSE_MODEL,
+            str(settings.OPENAI_PARSE_TEMPERATURE),
+            PARSE_PROMPT_VERSION,
+            INTENT_SCHEMA_VERSION,
+            normalize_text(query)
+        )
+
+        cached = self._intent_cache.get(key)
+        if cached is not None:
+            logger.info(f"Serving cached intent for query: '{query}'")
+            return IntentContext.model_validate_json(cached)
+
+        intent_context = await self._nlp_processor.process_query(query)
+        self._intent_cache.set(key, intent_context.model_dump_json())
+        return intent_context
+
+    async def condense_query(self, history: List[str]) -> str:
+        if not history:
+            return ""
+
+        key = fingerprint(
+            settings.OPENAI_CONDENSE_MODEL,
+            str(settings.OPENAI_CONDENSE_TEMPERATURE),
+            CONDENSE_PROMPT_VERSION,
+            *[normalize_text(message) for message in history]
+        )
+
+        cached = self._condense_cache.get(key)
+        if cached is not None:
+            return cached
+
+        condensed_query = await self._nlp_processor.condense_query(history)
+        if condensed_query:
+            self._condense_cache.set(key, condensed_query)
+        return condensed_query
+
+    def invalidate(self) -> None:
+        self._intent_cache.clear()
+        self._condense_cache.clear()
+
+    def stats(self) -> Dict[str, CacheStats]:
+        return {
+            "process_query": self._intent_cache.stats(),
+            "condense_query": self._condense_cache.stats()
+        }
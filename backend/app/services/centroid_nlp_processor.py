@@ -0,0 +1,123 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.logging_config import logger
+from app.models.cache_stats import CacheStats
+from app.models.constants import Intent
+from app.models.intent_context import IntentContext
+from app.services.interfaces.llm_service import LLMService
+from app.services.gazetteer import Gazetteer
+from app.services.interfaces.nlp_processor import NLPProcessor
+
+# Project retrieval is driven by the extracted entities, so its fast path also needs gazetteer matches
+ENTITY_INTENTS = {Intent.PROJECT_MATCHING}
+
+def build_centroids(vectors_by_intent: Dict[Intent, List[List[float]]]) -> Tuple[List[Intent], np.ndarray]:
+    """One L2-normalized mean embedding per intent, stacked into a matrix in the order of the returned intents."""
+    intents: List[Intent] = []
+    rows: List[np.ndarray] = []
+    for intent, vectors in vectors_by_intent.items():
+        if not vectors:
+            continue
+        matrix = np.asarray(vectors, dtype=np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        centroid = matrix.mean(axis=0)
+        intents.append(intent)
+        rows.append(centroid / max(float(np.linalg.norm(centroid)), 1e-12))
+    return intents, np.vstack(rows)
+
+def rank_intents(vector: List[float], intents: List[Intent], centroids: np.ndarray) -> List[Tuple[Intent, float]]:
+    query = np.asarray(vector, dtype=np.float32)
+    query /= max(float(np.linalg.norm(query)), 1e-12)
+    similarities = centroids @ query
+    return sorted(zip(intents, similarities.tolist()), key=lambda item: item[1], reverse=True)
+
+def has_search_entities(entities: Dict[str, List[str]]) -> bool:
+    return bool(entities["technologies"] or entities["solutions"] or entities["services"])
+
+class CentroidNLPProcessor(NLPProcessor):
+    """
+    Fast-path intent classifier. The query embedding is compared with per-intent centroids of labeled
+    examples and entities are matched against the corpus gazetteer. When the best intent wins by at least
+    margin_threshold, and for project matching the gazetteer found something to search for, the result is
+    returned without an LLM call. Everything else goes to the wrapped processor.
+    """
+
+    def __init__(
+            self,
+            llm_service: LLMService,
+            fallback: NLPProcessor,
+            examples: Dict[Intent, List[str]],
+            margin_threshold: float,
+            gazetteer: Optional[Gazetteer] = None):
+        self._llm_service = llm_service
+        self._fallback = fallback
+        self._examples = examples
+        self._margin_threshold = margin_threshold
+        self._gazetteer = gazetteer
+        self._intents: List[Intent] = []
+        self._centroids: Optional[np.ndarray] = None
+        self._lock = asyncio.Lock()
+        self._stats = CacheStats()
+
+    async def load_centroids(self) -> None:
+        if self._centroids is not None:
+            return
+
+        async with self._lock:
+            if self._centroids is not None:
+                return
+
+            # All examples go out in a single embeddings request
+            labeled = [(intent, text) for intent, texts in self._examples.items() for text in texts]
+            vectors = await self._llm_service.generate_embeddings([text for _, text in labeled])
+
+            vectors_by_intent: Dict[Intent, List[List[float]]] = {}
+            for (intent, _), vector in zip(labeled, vectors):
+                vectors_by_intent.setdefault(intent, []).append(vector)
+
+            self._intents, self._centroids = build_centroids(vectors_by_intent)
+            logger.info(f"Intent centroids built from {len(labeled)} examples")
+
+    async def classify(self, query: str) -> Tuple[Intent, float]:
+        """Returns the closest intent and its margin over the runner-up."""
+        await self.load_centroids()
+        vector = await self._llm_service.generate_embedding(query)
+        ranked = rank_intents(vector, self._intents, self._centroids)
+        margin = ranked[0][1] - ranked[1][1] if len(ranked) > 1 else ranked[0][1]
+        return ranked[0][0], margin
+
+    async def process_query(self, query: str) -> IntentContext:
+        try:
+            intent, margin = await self.classify(query)
+        except Exception as e:
+            logger.warning(f"Centroid intent classification failed, using the LLM parser: {e}")
+            intent, margin = None, 0.0
+
+        if intent is not None and margin >= self._margin_threshold:
+            entities = self.extract_entities(query)
+            if intent not in ENTITY_INTENTS or has_search_entities(entities):
+                self._stats.hits += 1
+                logger.info(f"Intent {intent.value} resolved locally with margin {margin:.3f}")
+                return IntentContext(
+                    intent=intent,
+                    justification=f"Closest to the {intent.value} examples by a margin of {margin:.3f}.",
+                    **entities
+                )
+
+        self._stats.misses += 1
+        return await self._fallback.process_query(query)
+
+    def extract_entities(self, query: str) -> Dict[str, List[str]]:
+        if self._gazetteer is None:
+            return {"technologies": [], "solutions": [], "services": [], "industry": []}
+        return self._gazetteer.extract(query)
+
+    async def condense_query(self, history: List[str]) -> str:
+        return await self._fallback.condense_query(history)
+
+    def stats(self) -> CacheStats:
+        """Hits are queries answered on the fast path, misses the ones handed to the LLM parser."""
+        return self._stats.model_copy()
@@ -0,0 +1,107 @@
+import json
+from typing import Any, Dict, List
+
+from app.core.logging_config import logger
+from app.core.tokenizer import count_tokens, truncate_tokens
+from app.models.packed_prompt import PackedPrompt
+from app.models.scored_record import ScoredRecord
+
+# Short keys the records are serialized with; the summarization prompts refer to fields by these names
+PROJECT_FIELD_KEYS = {
+    "title": "title",
+    "techStack": "tech",
+    "solutionsImplemented": "solutions",
+    "servicesOffered": "services",
+    "summary": "summary"
+}
+
+# The overview sentence only needs to know what the projects are about
+PROJECT_OVERVIEW_FIELD_KEYS = {
+    "title": "title",
+    "techStack": "tech",
+    "servicesOffered": "services"
+}
+
+CASE_STUDY_FIELD_KEYS = {
+    "title": "title",
+    "industry": "industry",
+    "technologies": "tech",
+    "solutionsProvided": "solutions",
+    "services": "services",
+    "detailedContent": "content",
+    "sourceUrl": "url"
+}
+
+TRUNCATION_MARKER = "..."
+
+class ContextPacker:
+    """
+    Builds summarization prompts within a token budget. Records are serialized as compact JSON with
+    short keys, long text fields are cut to a per-field limit and records are added in score order
+    until the budget, which also covers the prompt templates and the user query, is used up.
+    """
+
+    def __init__(self, max_tokens: int, max_field_tokens: int, max_query_tokens: int, model: str):
+        self._max_tokens = max_tokens
+        self._max_field_tokens = max_field_tokens
+        self._max_query_tokens = max_query_tokens
+        self._model = model
+
+    def pack(
+            self,
+            system_prompt: str,
+            user_prompt: str,
+            query: str,
+            scored_records: List[ScoredRecord],
+            field_keys: Dict[str, str]) -> PackedPrompt:
+        query = truncate_tokens(query, self._max_query_tokens, self._model)
+        system_prompt = system_prompt.format(query=query)
+        base_tokens = count_tokens(system_prompt, self._model) + count_tokens(user_prompt.format(query=query, json_data="[]"), self._model)
+
+        remaining_tokens = self._max_tokens - base_tokens
+        parts: List[str] = []
+        fields_truncated = 0
+
+        for item in sorted(scored_records, key=lambda record: record.score, reverse=True):
+            compact_record, truncated = self._compact(item.record.model_dump(), field_keys)
+            part = json.dumps(compact_record, ensure_ascii=False, separators=(",", ":"))
+            # One extra token for the separating comma
+            part_tokens = count_tokens(part, self._model) + 1
+
+            # The best match is always sent, even when the budget is too small for it
+            if parts and part_tokens > remaining_tokens:
+                break
+
+            parts.append(part)
+            remaining_tokens -= part_tokens
+            fields_truncated += truncated
+
+        if remaining_tokens < 0:
+            logger.warning(f"Summary prompt exceeds the token budget of {self._max_tokens} with a single record")
+
+        user_message = user_prompt.format(query=query, json_data="[" + ",".join(parts) + "]")
+        token_count = count_tokens(system_prompt, self._model) + count_tokens(user_message, self._model)
+
+        return PackedPrompt(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            token_count=token_count,
+            records_included=len(parts),
+            records_total=len(scored_records),
+            fields_truncated=fields_truncated
+        )
+
+    def _compact(self, record: Dict[str, Any], field_keys: Dict[str, str]) -> tuple[Dict[str, Any], int]:
+        compact_record: Dict[str, Any] = {}
+        truncated = 0
+
+        for field, key in field_keys.items():
+            value = record.get(field)
+            if isinstance(value, str):
+                shortened = truncate_tokens(value, self._max_field_tokens, self._model)
+                if shortened != value:
+                    value = shortened.rstrip() + TRUNCATION_MARKER
+                    truncated += 1
+            compact_record[key] = value
+
+        return compact_record, truncated
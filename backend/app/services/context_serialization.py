@@ -0,0 +1,11 @@
+import json
+import zlib
+
+from app.services.interfaces.context_store import ContextDict
+
+def serialize_context(context_dict: ContextDict) -> bytes:
+    """Compact form of a serialized workflow Context: minified JSON, zlib-compressed."""
+    return zlib.compress(json.dumps(context_dict, separators=(",", ":")).encode("utf-8"))
+
+def deserialize_context(payload: bytes) -> ContextDict:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from typing import List, Optional
+
+from app.core.logging_config import logger
+from app.core.ttl_cache import TTLCache
+from app.models.cache_stats import CacheStats
+
+# Writes between two prunes of the SQLite tier, so the table may exceed max_size by at most this many rows
+DISK_PRUNE_INTERVAL = 100
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: an in-memory LRU/TTL tier backed by an optional SQLite file. The file honours
+    the same TTL and size: expired rows are not served, and expired or oldest rows are pruned as it grows.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None, db_path: Optional[str] = None):
+        self._memory: TTLCache[str, List[float]] = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._disk_hits = 0
+        self._writes_since_prune = 0
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        normalized = " ".join(unicodedata.normalize("NFKC", text or "").split()).casefold()
+        return f"{model}\x1f{normalized}"
+
+    async def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = self.make_key(model, text)
+        embedding = self._memory.get(key)
+        if embedding is not None or not self._db_path:
+            return embedding
+
+        embedding = await asyncio.to_thread(self._read_disk, key)
+        if embedding is not None:
+            self._disk_hits += 1
+            self._memory.set(key, embedding)
+        return embedding
+
+    async def set(self, model: str, text: str, embedding: List[float]) -> None:
+        key = self.make_key(model, text)
+        self._memory.set(key, embedding)
+        if self._db_path:
+            await asyncio.to_thread(self._write_disk, key, model, embedding)
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    def stats(self) -> CacheStats:
+        # A memory miss served from disk still saves the network round-trip
+        stats = self._memory.stats()
+        return stats.model_copy(update={
+            "hits": stats.hits + self._disk_hits,
+            "misses": stats.misses - self._disk_hits
+        })
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            db_dir = os.path.dirname(self._db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self._db = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_created_at ON embeddings (created_at)")
+        return self._db
+
+    def _read_disk(self, key: str) -> Optional[List[float]]:
+        try:
+            with self._db_lock:
+                row = self._connection().execute("SELECT vector, created_at FROM embeddings WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            return None
+
+        # Expired rows are left for the next prune rather than deleted on the read path
+        if row is None or self._expired(row[1]):
+            return None
+        return array("f", row[0]).tolist()
+
+    def _write_disk(self, key: str, model: str, embedding: List[float]) -> None:
+        try:
+            with self._db_lock:
+                db = self._connection()
+                db.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, model, vector, created_at) VALUES (?, ?, ?, ?)",
+                    (key, model, array("f", embedding).tobytes(), time.time())
+                )
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= DISK_PRUNE_INTERVAL:
+                    self._prune(db)
+                db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def _prune(self, db: sqlite3.Connection) -> None:
+        self._writes_since_prune = 0
+        if self._ttl_seconds is not None:
+            db.execute("DELETE FROM embeddings WHERE created_at < ?", (time.time() - self._ttl_seconds,))
+        # Oldest first, like the memory tier evicts its least recently used entries
+        db.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self._max_size,)
+        )
+
+    def _expired(self, created_at: float) -> bool:
+        return self._ttl_seconds is not None and time.time() - created_at > self._ttl_seconds
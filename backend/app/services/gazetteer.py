@@ -0,0 +1,157 @@
+import json
+import os
+import re
+import unicodedata
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.services.ingestion_pipeline import iter_json_records
+
+# Vocabulary categories, named after the IntentContext fields they fill
+CATEGORIES = ["technologies", "solutions", "services", "industry"]
+
+PROJECT_FIELDS = {
+    "TechStack": "technologies",
+    "SolutionsImplemented": "solutions",
+    "ServicesOffered": "services"
+}
+
+CASE_STUDY_FIELDS = {
+    "Technologies": "technologies",
+    "SolutionsProvided": "solutions",
+    "Services": "services",
+    "Industry": "industry"
+}
+
+_TOKEN_SEPARATOR = re.compile(r"[^\w+#]+")
+_JOINING_PUNCTUATION = re.compile(r"[-/.]")
+
+def tokenize(text: str) -> List[str]:
+    """Case- and punctuation-insensitive tokens; a trailing plural 's' is dropped so 'dashboards' matches 'dashboard'."""
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    tokens = [token for token in _TOKEN_SEPARATOR.split(normalized) if token]
+    return [token[:-1] if len(token) > 2 and token.endswith("s") and not token.endswith("ss") else token for token in tokens]
+
+def term_variants(term: str) -> List[Tuple[str, ...]]:
+    tokens = tuple(tokenize(term))
+    if not tokens:
+        return []
+
+    variants = [tokens]
+    # "e-commerce" and "UI/UX" are also written as one word
+    if len(tokens) > 1 and _JOINING_PUNCTUATION.search(term):
+        variants.append(("".join(tokens),))
+    return variants
+
+def build_vocabulary(projects_path: str, case_studies_path: str) -> Dict[str, List[str]]:
+    terms: Dict[str, Dict[Tuple[str, ...], str]] = {category: {} for category in CATEGORIES}
+
+    def collect(records: Iterable[Dict], fields: Dict[str, str]) -> None:
+        for record in records:
+            for field, category in fields.items():
+                values = record.get(field) or []
+                for value in [values] if isinstance(values, str) else values:
+                    key = tuple(tokenize(value))
+                    if key and len(" ".join(key)) > 1:
+                        terms[category].setdefault(key, value.strip())
+
+    collect(iter_json_records(projects_path), PROJECT_FIELDS)
+    collect(iter_json_records(case_studies_path), CASE_STUDY_FIELDS)
+    return {category: sorted(values.values(), key=str.casefold) for category, values in terms.items()}
+
+def save_vocabulary(vocabulary: Dict[str, List[str]], path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(vocabulary, f, ensure_ascii=False, indent=2)
+
+class _Node:
+    __slots__ = ("children", "fail", "outputs")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.fail: Optional["_Node"] = None
+        self.outputs: List[Tuple[str, str, int]] = []
+
+class Gazetteer:
+    """
+    Dictionary entity extractor over the indexed vocabulary. Terms are compiled into a token-level
+    Aho-Corasick automaton, so a query is scanned once regardless of vocabulary size and terms only
+    match on whole words.
+    """
+
+    def __init__(self, vocabulary: Dict[str, List[str]]):
+        self._root = _Node()
+        self._size = 0
+        for category, terms in vocabulary.items():
+            for term in terms:
+                for variant in term_variants(term):
+                    self._insert(variant, category, term)
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path: str) -> "Gazetteer":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        tokens = tokenize(text)
+        matches: List[Tuple[int, int, str, str]] = []
+
+        node = self._root
+        for position, token in enumerate(tokens):
+            while node is not self._root and token not in node.children:
+                node = node.fail
+            node = node.children.get(token, self._root)
+            for category, term, length in node.outputs:
+                matches.append((position - length + 1, position + 1, category, term))
+
+        entities: Dict[str, List[str]] = {category: [] for category in CATEGORIES}
+        for _, _, category, term in self._longest_matches(matches):
+            if term not in entities.setdefault(category, []):
+                entities[category].append(term)
+        return entities
+
+    def _longest_matches(self, matches: List[Tuple[int, int, str, str]]) -> List[Tuple[int, int, str, str]]:
+        # Leftmost-longest spans win; a span listed under several categories is kept for each of them
+        selected: List[Tuple[int, int, str, str]] = []
+        covered_until = 0
+        current_span: Optional[Tuple[int, int]] = None
+        for match in sorted(matches, key=lambda item: (item[0], -(item[1] - item[0]))):
+            start, end = match[0], match[1]
+            if (start, end) == current_span:
+                selected.append(match)
+            elif start >= covered_until:
+                selected.append(match)
+                current_span = (start, end)
+                covered_until = end
+        return selected
+
+    def _insert(self, tokens: Tuple[str, ...], category: str, term: str) -> None:
+        node = self._root
+        for token in tokens:
+            node = node.children.setdefault(token, _Node())
+        if not any(output[0] == category for output in node.outputs):
+            node.outputs.append((category, term, len(tokens)))
+            self._size += 1
+
+    def _build_failure_links(self) -> None:
+        self._root.fail = self._root
+        queue = deque()
+        for child in self._root.children.values():
+            child.fail = self._root
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for token, child in node.children.items():
+                fail = node.fail
+                while fail is not self._root and token not in fail.children:
+                    fail = fail.fail
+                child.fail = fail.children.get(token, self._root) if fail.children.get(token) is not child else self._root
+                child.outputs = child.outputs + child.fail.outputs
+                queue.append(child)
@@ -0,0 +1,79 @@
+import re
+from typing import List, Optional
+
+from app.core.logging_config import logger
+from app.models.cache_stats import CacheStats
+from app.models.constants import Intent
+from app.models.intent_context import IntentContext
+from app.services.centroid_nlp_processor import has_search_entities
+from app.services.gazetteer import Gazetteer
+from app.services.interfaces.nlp_processor import NLPProcessor
+
+# The intent signals of the parse prompt, checked in order: what the user asks for first, then how they ask.
+# Within a level the side with more matches wins, and a tie is ambiguous
+_SIGNALS = [
+    (
+        re.compile(r"\b(case stud(y|ies)|success stor(y|ies))\b"),
+        re.compile(r"\bprojects?\b")
+    ),
+    (
+        re.compile(r"\b(how|why|helped|solved|improved|optimi[sz]ed|achieved|approach|methodology|evidence|outcomes?|impact|challenges?)\b"),
+        re.compile(r"\b(list|show|find|need|searching for|looking for|built with|uses?|using|features?|what tools|what services)\b")
+    )
+]
+
+def signal_intent(query: str) -> Intent:
+    """
+    Intent from the explicit wording of the query. A query that mentions entities without asking for a
+    list or a narrative is ambiguous, as the parse prompt defines it, and goes to clarification.
+    """
+    text = " ".join(query.casefold().split())
+    for case_study_signal, project_signal in _SIGNALS:
+        case_study = len(case_study_signal.findall(text))
+        project = len(project_signal.findall(text))
+        if case_study != project:
+            return Intent.CASE_STUDY_RETRIEVAL if case_study > project else Intent.PROJECT_MATCHING
+        if case_study:
+            break
+    return Intent.AMBIGUOUS
+
+class GazetteerNLPProcessor(NLPProcessor):
+    """
+    Decorates an NLPProcessor so queries naming indexed technologies, solutions or services are parsed
+    without an LLM call: the entities come from the corpus gazetteer and the intent from the query's
+    wording. The wrapped processor is used only when the gazetteer finds nothing to search for.
+    """
+
+    def __init__(self, nlp_processor: NLPProcessor, gazetteer: Gazetteer):
+        self._nlp_processor = nlp_processor
+        self._gazetteer = gazetteer
+        self._stats = CacheStats()
+
+    async def process_query(self, query: str) -> IntentContext:
+        intent_context = self.parse_locally(query)
+        if intent_context is not None:
+            self._stats.hits += 1
+            logger.info(f"Intent {intent_context.intent.value} and entities resolved by the gazetteer")
+            return intent_context
+
+        self._stats.misses += 1
+        return await self._nlp_processor.process_query(query)
+
+    def parse_locally(self, query: str) -> Optional[IntentContext]:
+        entities = self._gazetteer.extract(query)
+        if not has_search_entities(entities):
+            return None
+
+        intent = signal_intent(query)
+        return IntentContext(
+            intent=intent,
+            justification=f"Entities matched in the indexed records; the wording of the query reads as {intent.value}.",
+            **entities
+        )
+
+    async def condense_query(self, history: List[str]) -> str:
+        return await self._nlp_processor.condense_query(history)
+
+    def stats(self) -> CacheStats:
+        """Hits are queries parsed from the gazetteer, misses the ones handed to the wrapped processor."""
+        return self._stats.model_copy()
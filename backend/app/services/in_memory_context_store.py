@@ -0,0 +1,29 @@
+from typing import Optional
+
+from app.core.ttl_cache import TTLCache
+from app.models.cache_stats import CacheStats
+from app.services.context_serialization import deserialize_context, serialize_context
+from app.services.interfaces.context_store import ContextDict, ContextStore
+
+class InMemoryContextStore(ContextStore):
+    """Process-local store bounded by entry count and TTL. Contexts are kept compressed."""
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float]):
+        self._contexts: TTLCache[str, bytes] = TTLCache(max_size=max_entries, ttl_seconds=ttl_seconds)
+
+    async def save(self, workflow_id: str, context_dict: ContextDict) -> None:
+        self._contexts.set(workflow_id, serialize_context(context_dict))
+
+    async def pop(self, workflow_id: str) -> Optional[ContextDict]:
+        payload = self._contexts.get(workflow_id)
+        if payload is None:
+            return None
+
+        self._contexts.delete(workflow_id)
+        return deserialize_context(payload)
+
+    async def delete(self, workflow_id: str) -> None:
+        self._contexts.delete(workflow_id)
+
+    def stats(self) -> CacheStats:
+        return self._contexts.stats()
@@ -0,0 +1,333 @@
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Set
+
+from app.core.config import settings
+
+from app.core.logging_config import logger
+from app.models.batch_insert_result import BatchInsertResult
+from app.models.ingestion_object import IngestionObject
+from app.models.ingestion_stats import IngestionStats
+from app.repositories.interfaces.case_study_repo import CaseStudyRepository
+from app.repositories.interfaces.project_repo import ProjectRepository
+from app.services.interfaces.llm_service import LLMService
+
+RawRecord = Dict[str, Any]
+BatchWriter = Callable[[List[IngestionObject]], Awaitable[BatchInsertResult]]
+BatchDeleter = Callable[[List[str]], Awaitable[int]]
+
+PROJECT_NAMESPACE = "Project"
+CASE_STUDY_NAMESPACE = "CaseStudy"
+
+def iter_json_records(path: str, chunk_size: int = 64 * 1024) -> Iterator[RawRecord]:
+    """Yields the objects of a top-level JSON array one at a time without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            buffer += chunk
+            position = 0
+
+            while True:
+                while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ","):
+                    position += 1
+
+                if not started and position < len(buffer):
+                    if buffer[position] != "[":
+                        raise ValueError(f"Expected a JSON array in {path}")
+                    started = True
+                    position += 1
+                    continue
+
+                if position >= len(buffer) or buffer[position] == "]":
+                    break
+
+                try:
+                    record, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if not chunk:
+                        raise
+                    break
+
+                yield record
+
+            buffer = buffer[position:]
+            if not chunk:
+                return
+
+def iter_batches(records: Iterable[RawRecord], batch_size: int) -> Iterator[List[RawRecord]]:
+    batch: List[RawRecord] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def record_uuid(namespace: str, source_key: str) -> str:
+    """Deterministic object id, so re-loading a record overwrites it instead of duplicating it."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{namespace}/{source_key}"))
+
+def content_hash(record: RawRecord) -> str:
+    # The embedding model is part of the hash so switching models re-embeds everything
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False) + settings.OPENAI_EMBED_MODEL
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def project_uuid(project: RawRecord) -> str:
+    return record_uuid(PROJECT_NAMESPACE, project["Title"])
+
+def case_study_uuid(case_study: RawRecord) -> str:
+    return record_uuid(CASE_STUDY_NAMESPACE, case_study["Title"])
+
+def project_embedding_texts(project: RawRecord) -> List[str]:
+    technical_values = " ".join(project["TechStack"]) + " " + " ".join(project["SolutionsImplemented"])
+    service_values = " ".join(project["ServicesOffered"])
+    return [technical_values, service_values]
+
+def build_project_object(project: RawRecord, vectors: List[List[float]]) -> IngestionObject:
+    technical_vector, service_vector = vectors
+    return IngestionObject(
+        uuid = project_uuid(project),
+        properties = {
+            "title": project["Title"],
+            "techStack": project["TechStack"],
+            "solutionsImplemented": project["SolutionsImplemented"],
+            "servicesOffered": project["ServicesOffered"],
+            "summary": project["Summary"],
+            "contentHash": content_hash(project)
+        },
+        vector = {
+            "technicalVector": technical_vector,
+            "serviceVector": service_vector
+        }
+    )
+
+def case_study_embedding_texts(case_study: RawRecord) -> List[str]:
+    return [case_study["DetailedContent"]]
+
+def build_case_study_object(case_study: RawRecord, vectors: List[List[float]]) -> IngestionObject:
+    return IngestionObject(
+        uuid = case_study_uuid(case_study),
+        properties = {
+            "title": case_study["Title"],
+            "industry": case_study["Industry"],
+            "technologies": case_study["Technologies"],
+            "solutionsProvided": case_study["SolutionsProvided"],
+            "services": case_study["Services"],
+            "detailedContent": case_study["DetailedContent"],
+            "sourceUrl": case_study["SourceURL"],
+            "contentHash": content_hash(case_study)
+        },
+        vector = vectors[0]
+    )
+
+class IngestionPipeline:
+    """
+    Streams raw records from disk, embeds them in batches and writes them through the repositories'
+    batch insert API. Batches are processed by a bounded pool of workers; objects rejected by the
+    database are retried on their own without re-sending the rest of the batch.
+
+    The sync_* variants compare deterministic ids and content hashes with what is already stored, so
+    only new or changed records are embedded and upserted and records missing from the source are deleted.
+    """
+
+    def __init__(
+            self,
+            llm_service: LLMService,
+            batch_size: int,
+            workers: int,
+            max_write_retries: int,
+            retry_backoff_seconds: float = 1.0,
+            progress: Callable[[str], None] = print):
+        self._llm_service = llm_service
+        self._batch_size = batch_size
+        self._workers = workers
+        self._max_write_retries = max_write_retries
+        self._retry_backoff_seconds = retry_backoff_seconds
+        self._progress = progress
+
+    async def ingest_projects(self, path: str, project_repo: ProjectRepository) -> IngestionStats:
+        return await self._run(
+            name="projects",
+            records=iter_json_records(path),
+            embedding_texts=project_embedding_texts,
+            build_object=build_project_object,
+            write=project_repo.insert_projects
+        )
+
+    async def ingest_case_studies(self, path: str, case_study_repo: CaseStudyRepository) -> IngestionStats:
+        return await self._run(
+            name="case studies",
+            records=iter_json_records(path),
+            embedding_texts=case_study_embedding_texts,
+            build_object=build_case_study_object,
+            write=case_study_repo.insert_case_studies
+        )
+
+    async def sync_projects(self, path: str, project_repo: ProjectRepository) -> IngestionStats:
+        return await self._sync(
+            name="projects",
+            path=path,
+            existing_hashes=await project_repo.get_content_hashes(),
+            object_uuid=project_uuid,
+            embedding_texts=project_embedding_texts,
+            build_object=build_project_object,
+            write=project_repo.insert_projects,
+            delete=project_repo.delete_projects
+        )
+
+    async def sync_case_studies(self, path: str, case_study_repo: CaseStudyRepository) -> IngestionStats:
+        return await self._sync(
+            name="case studies",
+            path=path,
+            existing_hashes=await case_study_repo.get_content_hashes(),
+            object_uuid=case_study_uuid,
+            embedding_texts=case_study_embedding_texts,
+            build_object=build_case_study_object,
+            write=case_study_repo.insert_case_studies,
+            delete=case_study_repo.delete_case_studies
+        )
+
+    async def _sync(
+            self,
+            name: str,
+            path: str,
+            existing_hashes: Dict[str, str],
+            object_uuid: Callable[[RawRecord], str],
+            embedding_texts: Callable[[RawRecord], List[str]],
+            build_object: Callable[[RawRecord, List[List[float]]], IngestionObject],
+            write: BatchWriter,
+            delete: BatchDeleter) -> IngestionStats:
+        seen: Set[str] = set()
+        unchanged = 0
+
+        def changed_records() -> Iterator[RawRecord]:
+            nonlocal unchanged
+            for record in iter_json_records(path):
+                record_id = object_uuid(record)
+                seen.add(record_id)
+                if existing_hashes.get(record_id) == content_hash(record):
+                    unchanged += 1
+                    continue
+                yield record
+
+        stats = await self._run(name, changed_records(), embedding_texts, build_object, write)
+        stats.unchanged = unchanged
+
+        stale_ids = [record_id for record_id in existing_hashes if record_id not in seen]
+        if stale_ids:
+            stats.deleted = await delete(stale_ids)
+            self._progress(f"[{name}] deleted {stats.deleted} records no longer in the source")
+
+        return stats
+
+    async def _run(
+            self,
+            name: str,
+            records: Iterable[RawRecord],
+            embedding_texts: Callable[[RawRecord], List[str]],
+            build_object: Callable[[RawRecord, List[List[float]]], IngestionObject],
+            write: BatchWriter) -> IngestionStats:
+        stats = IngestionStats(name=name)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._workers * 2)
+        start_time = time.perf_counter()
+
+        async def worker():
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    queue.task_done()
+                    return
+                try:
+                    await self._process_batch(batch, embedding_texts, build_object, write, stats)
+                except Exception as e:
+                    logger.error(f"Ingestion batch of {len(batch)} {name} failed: {e}")
+                    stats.failed += len(batch)
+                else:
+                    self._progress(f"[{name}] {stats.records} loaded, {stats.failed} failed")
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self._workers)]
+        try:
+            for batch in iter_batches(records, self._batch_size):
+                await queue.put(batch)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+        stats.elapsed_seconds = time.perf_counter() - start_time
+        return stats
+
+    async def _process_batch(
+            self,
+            batch: List[RawRecord],
+            embedding_texts: Callable[[RawRecord], List[str]],
+            build_object: Callable[[RawRecord, List[List[float]]], IngestionObject],
+            write: BatchWriter,
+            stats: IngestionStats) -> None:
+        stats.batches += 1
+
+        # Every text of the batch goes out in one embeddings request
+        texts_per_record = [embedding_texts(record) for record in batch]
+        flat_texts = [text for texts in texts_per_record for text in texts]
+
+        embed_start = time.perf_counter()
+        try:
+            flat_vectors = await self._llm_service.generate_embeddings(flat_texts)
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(batch)} records failed: {e}")
+            stats.failed += len(batch)
+            return
+        finally:
+            stats.embed_seconds += time.perf_counter() - embed_start
+
+        objects: List[IngestionObject] = []
+        offset = 0
+        for record, texts in zip(batch, texts_per_record):
+            objects.append(build_object(record, flat_vectors[offset:offset + len(texts)]))
+            offset += len(texts)
+
+        write_start = time.perf_counter()
+        try:
+            inserted, failed = await self._write_with_retry(objects, write)
+        finally:
+            stats.write_seconds += time.perf_counter() - write_start
+
+        stats.records += inserted
+        stats.failed += failed
+
+    async def _write_with_retry(self, objects: List[IngestionObject], write: BatchWriter) -> tuple[int, int]:
+        inserted = 0
+        pending = objects
+        backoff_time = self._retry_backoff_seconds
+
+        for attempt in range(self._max_write_retries + 1):
+            try:
+                result = await write(pending)
+            except Exception as e:
+                logger.error(f"Batch write of {len(pending)} objects failed: {e}")
+                result = BatchInsertResult(errors={index: str(e) for index in range(len(pending))})
+
+            inserted += result.inserted
+            if not result.errors:
+                return inserted, 0
+
+            # Only the rejected objects are sent again
+            pending = [pending[index] for index in sorted(result.errors)]
+            if attempt < self._max_write_retries:
+                logger.warning(f"Retrying {len(pending)} failed objects: {next(iter(result.errors.values()))}")
+                await asyncio.sleep(backoff_time)
+                backoff_time *= 2
+
+        return inserted, len(pending)
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from app.models.cache_stats import CacheStats
+
+ContextDict = Dict[str, Any]
+
+class ContextStore(ABC):
+
+    @abstractmethod
+    async def save(self, workflow_id: str, context_dict: ContextDict) -> None:
+        pass
+
+    @abstractmethod
+    async def pop(self, workflow_id: str) -> Optional[ContextDict]:
+        pass
+
+    @abstractmethod
+    async def delete(self, workflow_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        pass
+
+    async def close(self) -> None:
+        pass
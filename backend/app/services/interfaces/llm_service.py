@@ -1,12 +1,22 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from app.models.record import Record
 
 class LLMService(ABC):
 
+    async def connect(self):
+        pass
+
+    async def close(self):
+        pass
+
     @abstractmethod
-    async def generate_embedding(self, text) -> List[float]:
+    async def generate_embedding(self, text, model: Optional[str] = None) -> List[float]:
+        pass
+
+    @abstractmethod
+    async def generate_embeddings(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
         pass
 
     @abstractmethod
@@ -20,6 +30,17 @@ class LLMService(ABC):
     ) -> str:
         pass
 
+    @abstractmethod
+    def generate_text_stream(self, 
+        system_prompt: str, 
+        user_message: str, 
+        model: Optional[str] = None, 
+        temperature: Optional[float] = None, 
+        max_tokens: Optional[int] = None, 
+        top_p: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        pass
+
     @abstractmethod
     async def generate_object(
         self, 
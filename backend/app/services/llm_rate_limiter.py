@@ -0,0 +1,275 @@
+import asyncio
+import time
+from enum import Enum
+from typing import Dict, Optional
+
+from app.core.logging_config import logger
+from app.core.metrics import (
+    LLM_CIRCUIT_REJECTIONS,
+    LLM_CIRCUIT_STATE,
+    LLM_LIMITER_CONCURRENCY_LIMIT,
+    LLM_LIMITER_IN_FLIGHT,
+    LLM_LIMITER_QUEUE_DEPTH,
+    LLM_LIMITER_WAIT_SECONDS,
+    LLM_THROTTLED
+)
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the API while the circuit breaker of a model is open."""
+
+class Outcome(str, Enum):
+    SUCCESS = "success"
+    THROTTLED = "throttled"
+    FAILED = "failed"
+    # The request itself was invalid; says nothing about the capacity of the API
+    ERROR = "error"
+
+class CircuitState(int, Enum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+class TokenBucket:
+    """Per-minute budget refilled continuously. A request larger than the bucket waits for a full bucket and then drains it."""
+
+    def __init__(self, per_minute: int):
+        self._capacity = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        needed = min(amount, self._capacity)
+        return 0.0 if self._tokens >= needed else (needed - self._tokens) / self._rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self._tokens -= min(amount, self._capacity)
+
+    def adjust(self, amount: float) -> None:
+        # Returns the difference when the actual usage reported by the API differs from the estimate
+        self._refill()
+        self._tokens = min(self._capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+class Permit:
+    def __init__(self, limiter: "ModelRateLimiter", estimated_tokens: int, probe: bool):
+        self._limiter = limiter
+        self._estimated_tokens = estimated_tokens
+        self._probe = probe
+        self._started = time.perf_counter()
+        self._released = False
+
+    def release(self, outcome: Outcome, actual_tokens: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._limiter.release(
+            outcome=outcome,
+            latency=time.perf_counter() - self._started,
+            token_delta=self._estimated_tokens - actual_tokens if actual_tokens is not None else 0,
+            retry_after=retry_after,
+            probe=self._probe
+        )
+
+class ModelRateLimiter:
+    """
+    Admission control for one model. Requests wait in FIFO order for the request and token buckets and for a
+    free concurrency slot. The slot limit grows additively on success and shrinks multiplicatively on 429s and
+    on latency far above its moving average. Consecutive timeouts, connection errors and 5xx responses open
+    a circuit breaker that rejects calls until a single probe succeeds.
+    """
+
+    def __init__(
+            self,
+            model: str,
+            requests_per_minute: int,
+            tokens_per_minute: int,
+            initial_concurrency: int,
+            min_concurrency: int,
+            max_concurrency: int,
+            latency_tolerance: float,
+            failure_threshold: int,
+            reset_seconds: float
+        ):
+        self._model = model
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._limit = float(initial_concurrency)
+        self._min_concurrency = min_concurrency
+        self._max_concurrency = max_concurrency
+        self._latency_tolerance = latency_tolerance
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._latency_average: Optional[float] = None
+        self._circuit = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self._queue_lock = asyncio.Lock()
+        self._slot_freed = asyncio.Event()
+        LLM_LIMITER_CONCURRENCY_LIMIT.set(self._limit, model=model)
+        LLM_CIRCUIT_STATE.set(self._circuit.value, model=model)
+
+    async def acquire(self, estimated_tokens: int) -> Permit:
+        probe = self._admit_through_circuit()
+        start_time = time.perf_counter()
+        LLM_LIMITER_QUEUE_DEPTH.inc(model=self._model)
+        try:
+            # Only the head of the queue waits on the buckets, so later arrivals cannot overtake it
+            async with self._queue_lock:
+                while True:
+                    wait = max(
+                        self._paused_until - time.monotonic(),
+                        self._requests.wait_time(1) if self._requests else 0.0,
+                        self._tokens.wait_time(estimated_tokens) if self._tokens else 0.0
+                    )
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    elif self._in_flight >= int(self._limit):
+                        self._slot_freed.clear()
+                        await self._slot_freed.wait()
+                    else:
+                        break
+
+                if self._requests:
+                    self._requests.take(1)
+                if self._tokens:
+                    self._tokens.take(estimated_tokens)
+                self._in_flight += 1
+        except BaseException:
+            if probe:
+                self._probe_in_flight = False
+            raise
+        finally:
+            LLM_LIMITER_QUEUE_DEPTH.dec(model=self._model)
+            LLM_LIMITER_WAIT_SECONDS.observe(time.perf_counter() - start_time, model=self._model)
+
+        LLM_LIMITER_IN_FLIGHT.set(self._in_flight, model=self._model)
+        return Permit(self, estimated_tokens, probe)
+
+    def release(self, outcome: Outcome, latency: float, token_delta: int, retry_after: Optional[float], probe: bool) -> None:
+        self._in_flight -= 1
+        if probe:
+            self._probe_in_flight = False
+        if self._tokens and token_delta:
+            self._tokens.adjust(token_delta)
+
+        if outcome == Outcome.SUCCESS:
+            self._on_success(latency)
+        elif outcome == Outcome.THROTTLED:
+            self._on_throttled(retry_after)
+        elif outcome == Outcome.FAILED:
+            self._on_failure()
+
+        LLM_LIMITER_IN_FLIGHT.set(self._in_flight, model=self._model)
+        LLM_LIMITER_CONCURRENCY_LIMIT.set(self._limit, model=self._model)
+        self._slot_freed.set()
+
+    def _admit_through_circuit(self) -> bool:
+        if self._circuit == CircuitState.OPEN and time.monotonic() - self._opened_at >= self._reset_seconds:
+            self._set_circuit(CircuitState.HALF_OPEN)
+
+        if self._circuit == CircuitState.CLOSED:
+            return False
+        if self._circuit == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        LLM_CIRCUIT_REJECTIONS.inc(model=self._model)
+        raise CircuitOpenError(f"Circuit breaker for {self._model} is open after {self._consecutive_failures} consecutive failures")
+
+    def _on_success(self, latency: float) -> None:
+        self._consecutive_failures = 0
+        if self._circuit != CircuitState.CLOSED:
+            self._set_circuit(CircuitState.CLOSED)
+
+        if self._latency_average is not None and latency > self._latency_tolerance * self._latency_average:
+            self._decrease(0.9)
+        else:
+            self._limit = min(self._max_concurrency, self._limit + 1 / self._limit)
+        self._latency_average = latency if self._latency_average is None else 0.9 * self._latency_average + 0.1 * latency
+
+    def _on_throttled(self, retry_after: Optional[float]) -> None:
+        LLM_THROTTLED.inc(model=self._model)
+        self._decrease(0.5)
+        if retry_after:
+            # Every queued request for the model waits out the server's hint, not only the one that got the 429
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def _on_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self._circuit == CircuitState.HALF_OPEN or self._consecutive_failures >= self._failure_threshold:
+            if self._circuit != CircuitState.OPEN:
+                logger.error(f"Circuit breaker for {self._model} opened after {self._consecutive_failures} consecutive failures")
+            self._opened_at = time.monotonic()
+            self._set_circuit(CircuitState.OPEN)
+
+    def _decrease(self, factor: float) -> None:
+        # Responses to requests sent before the last decrease describe the old limit, so they do not shrink it again
+        now = time.monotonic()
+        if now - self._last_decrease < (self._latency_average or 0.0):
+            return
+        self._last_decrease = now
+        self._limit = max(self._min_concurrency, self._limit * factor)
+
+    def _set_circuit(self, state: CircuitState) -> None:
+        self._circuit = state
+        LLM_CIRCUIT_STATE.set(state.value, model=self._model)
+
+class LLMRateLimiter:
+    """Process-wide registry of per-model limiters, shared by every LLM service instance."""
+
+    def __init__(
+            self,
+            model_limits: Dict[str, Dict[str, int]],
+            default_requests_per_minute: int,
+            default_tokens_per_minute: int,
+            initial_concurrency: int,
+            min_concurrency: int,
+            max_concurrency: int,
+            latency_tolerance: float,
+            failure_threshold: int,
+            reset_seconds: float
+        ):
+        self._model_limits = model_limits
+        self._default_requests_per_minute = default_requests_per_minute
+        self._default_tokens_per_minute = default_tokens_per_minute
+        self._initial_concurrency = initial_concurrency
+        self._min_concurrency = min_concurrency
+        self._max_concurrency = max_concurrency
+        self._latency_tolerance = latency_tolerance
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+
+    async def acquire(self, model: str, estimated_tokens: int) -> Permit:
+        return await self._get_limiter(model).acquire(estimated_tokens)
+
+    def _get_limiter(self, model: str) -> ModelRateLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limits = self._model_limits.get(model, {})
+            limiter = ModelRateLimiter(
+                model=model,
+                requests_per_minute=limits.get("rpm", self._default_requests_per_minute),
+                tokens_per_minute=limits.get("tpm", self._default_tokens_per_minute),
+                initial_concurrency=self._initial_concurrency,
+                min_concurrency=self._min_concurrency,
+                max_concurrency=self._max_concurrency,
+                latency_tolerance=self._latency_tolerance,
+                failure_threshold=self._failure_threshold,
+                reset_seconds=self._reset_seconds
+            )
+            self._limiters[model] = limiter
+        return limiter
@@ -1,14 +1,26 @@
 import asyncio
+import random
+import time
+import httpx
 import openai
-from typing import Any, Callable, List, Optional
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
+from app.core import deadline
 from app.core.config import settings
 from app.core.logging_config import logger
+from app.core.metrics import LLM_REQUEST_ERRORS, LLM_REQUEST_SECONDS, LLM_RETRIES, LLM_TIME_TO_FIRST_TOKEN_SECONDS, LLM_TOKENS, LLM_TOKENS_TOTAL
+from app.core.tokenizer import count_tokens
 from app.services.interfaces.llm_service import LLMService
+from app.services.llm_rate_limiter import LLMRateLimiter, Outcome, Permit
+
+# Failures worth another attempt: the same request can succeed once the API recovers
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)
 
 class OpenAILLMService(LLMService):
-    def __init__(self):
-        self._client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+    def __init__(self, rate_limiter: Optional[LLMRateLimiter] = None):
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._rate_limiter = rate_limiter
 
         self._embed_model = settings.OPENAI_EMBED_MODEL
         self._chat_model = settings.OPENAI_CHAT_MODEL
@@ -26,18 +38,69 @@ class OpenAILLMService(LLMService):
         self._max_retries = settings.OPENAI_MAX_RETRIES
         self._retry_initial_backoff_seconds = settings.OPENAI_RETRY_INITIAL_BACKOFF_SECONDS
         self._retry_backoff_multiplier = settings.OPENAI_RETRY_BACKOFF_MULTIPLIER
+        self._retry_max_backoff_seconds = settings.OPENAI_RETRY_MAX_BACKOFF_SECONDS
+
+    async def connect(self):
+        if self._client is None:
+            # One keep-alive pool shared by every request served by this process
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.OPENAI_HTTP_KEEPALIVE_EXPIRY_SECONDS
+                ),
+                timeout=httpx.Timeout(
+                    settings.OPENAI_HTTP_TIMEOUT_SECONDS,
+                    connect=settings.OPENAI_HTTP_CONNECT_TIMEOUT_SECONDS
+                )
+            )
+            self._client = openai.AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY, 
+                base_url=settings.OPENAI_BASE_URL,
+                http_client=http_client,
+                # Retries go through _with_retry, which backs off in step with the shared rate limiter
+                max_retries=0
+            )
+        return self._client
+
+    async def close(self):
+        if self._client:
+            await self._client.close()
+            self._client = None
+
+    def get_client(self) -> openai.AsyncOpenAI:
+        if self._client is None:
+            raise RuntimeError("OpenAI client is not connected")
+        return self._client
 
     async def generate_embedding(
             self, 
             text, 
             model: Optional[str] = None
         ) -> List[float]:    
-        response = await self._with_retry(
-            self._client.embeddings.create, 
+        response = await self._request(
+            "embedding",
+            self.get_client().embeddings.create, 
             input=text, 
             model=self._param_or_default(model, self._embed_model))
 
         return response.data[0].embedding
+
+    async def generate_embeddings(
+            self, 
+            texts: List[str], 
+            model: Optional[str] = None
+        ) -> List[List[float]]:
+        if not texts:
+            return []
+
+        response = await self._request(
+            "embedding",
+            self.get_client().embeddings.create, 
+            input=texts, 
+            model=self._param_or_default(model, self._embed_model))
+
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
     
     async def generate_text(
             self, 
@@ -48,8 +111,9 @@ class OpenAILLMService(LLMService):
             max_tokens: Optional[int] = None, 
             top_p: Optional[float] = None
         ) -> str:
-        response = await self._with_retry(
-            self._client.chat.completions.create,
+        response = await self._request(
+            "text",
+            self.get_client().chat.completions.create,
             model=self._param_or_default(model, self._chat_model),
             temperature=self._param_or_default(temperature, self._chat_temperature),
             max_tokens=self._param_or_default(max_tokens, self._chat_max_tokens),
@@ -60,6 +124,65 @@ class OpenAILLMService(LLMService):
             ]
         )
         return response.choices[0].message.content
+
+    async def generate_text_stream(
+            self, 
+            system_prompt: str, 
+            user_message: str, 
+            model: Optional[str] = None, 
+            temperature: Optional[float] = None, 
+            max_tokens: Optional[int] = None, 
+            top_p: Optional[float] = None
+        ) -> AsyncIterator[str]:
+        # Only opening the stream is retried; a stream that fails midway is surfaced to the caller
+        model = self._param_or_default(model, self._chat_model)
+        start_time = time.perf_counter()
+        first_token_observed = False
+        usage = None
+        permit = None
+        outcome = Outcome.ERROR
+        try:
+            # The permit is held while tokens are generated, and released once the stream is read or closed
+            stream, permit = await self._with_retry_permit(
+                self.get_client().chat.completions.create,
+                model=model,
+                temperature=self._param_or_default(temperature, self._chat_temperature),
+                max_tokens=self._param_or_default(max_tokens, self._chat_max_tokens),
+                top_p=self._param_or_default(top_p, self._chat_top_p),
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                stream=True,
+                # The final chunk then carries the usage of the whole completion
+                stream_options={"include_usage": True}
+            )
+
+            async with stream:
+                async for chunk in stream:
+                    if chunk.usage:
+                        usage = chunk.usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if not first_token_observed:
+                            LLM_TIME_TO_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - start_time, model=model)
+                            first_token_observed = True
+                        yield chunk.choices[0].delta.content
+            outcome = Outcome.SUCCESS
+        except RETRYABLE_ERRORS as e:
+            LLM_REQUEST_ERRORS.inc(model=model, kind="text_stream")
+            remaining = deadline.remaining()
+            budget_exhausted = isinstance(e, openai.APITimeoutError) and remaining is not None and remaining <= 0
+            outcome = Outcome.ERROR if budget_exhausted else Outcome.FAILED
+            raise
+        except Exception:
+            LLM_REQUEST_ERRORS.inc(model=model, kind="text_stream")
+            raise
+        finally:
+            # A stream closed early by the caller keeps the ERROR outcome, which leaves the limiter's view of the API unchanged
+            if permit:
+                permit.release(outcome, actual_tokens=usage.total_tokens if usage else None)
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start_time, model=model, kind="text_stream")
+            self._record_usage(model, "text_stream", usage)
     
     async def generate_object(
             self, 
@@ -71,8 +194,9 @@ class OpenAILLMService(LLMService):
             max_tokens: Optional[int] = None, 
             top_p: Optional[float] = None
         ):
-        response = await self._with_retry(
-            self._client.chat.completions.parse,
+        response = await self._request(
+            "object",
+            self.get_client().chat.completions.parse,
             model=self._param_or_default(model, self._parse_model),
             temperature=self._param_or_default(temperature, self._parse_temperature),
             max_tokens=self._param_or_default(max_tokens, self._parse_max_tokens),
@@ -85,21 +209,128 @@ class OpenAILLMService(LLMService):
         )
         return response.choices[0].message.parsed
     
+    async def _request(self, kind: str, func: Callable[..., Any], **kwargs) -> Any:
+        model = kwargs["model"]
+        try:
+            with LLM_REQUEST_SECONDS.time(model=model, kind=kind):
+                response = await self._with_retry(func, **kwargs)
+        except Exception:
+            LLM_REQUEST_ERRORS.inc(model=model, kind=kind)
+            raise
+
+        self._record_usage(model, kind, response.usage)
+        return response
+
+    def _record_usage(self, model: str, kind: str, usage) -> None:
+        if usage is None:
+            return
+
+        # Embedding responses report prompt tokens only
+        counts = {"input": usage.prompt_tokens, "output": getattr(usage, "completion_tokens", None)}
+        for direction, count in counts.items():
+            if count is not None:
+                LLM_TOKENS.observe(count, model=model, kind=kind, direction=direction)
+                LLM_TOKENS_TOTAL.inc(count, model=model, kind=kind, direction=direction)
+
     async def _with_retry(self, func: Callable[..., Any], *args, **kwargs) -> Any:
-        backoff_time = self._retry_initial_backoff_seconds
-        for retry in range(self._max_retries):
+        response, permit = await self._with_retry_permit(func, *args, **kwargs)
+        if permit:
+            usage = getattr(response, "usage", None)
+            permit.release(Outcome.SUCCESS, actual_tokens=usage.total_tokens if usage else None)
+        return response
+
+    async def _with_retry_permit(self, func: Callable[..., Any], *args, **kwargs) -> Tuple[Any, Optional[Permit]]:
+        """Like _with_retry, but the permit of the successful attempt is returned unreleased with the response."""
+        model = kwargs["model"]
+        estimated_tokens = self._estimate_tokens(kwargs)
+        for attempt in range(self._max_retries):
+            permit = None
+            if self._rate_limiter:
+                permit = await deadline.run_with_timeout(self._rate_limiter.acquire(model, estimated_tokens), None, "llm rate limiting")
+            budget = deadline.remaining()
+            if budget is not None:
+                if budget <= 0:
+                    if permit:
+                        permit.release(Outcome.ERROR)
+                    raise deadline.DeadlineExceeded("llm call")
+                # The SDK timeout ends the HTTP request itself, which wait_for alone would leave to the connection pool
+                kwargs["timeout"] = budget
             try:
-                return await asyncio.to_thread(func, *args, **kwargs)
-            except openai.RateLimitError:
-                if retry == self._max_retries - 1:
-                    logger.error(f"OpenAI Rate Limit failed after {self._max_retries} attempts")
-                    raise Exception("Exceeded max retries due to rate limiting.")
-                
-                await asyncio.sleep(backoff_time)
-                backoff_time *= self._retry_backoff_multiplier
+                response = await func(*args, **kwargs)
+            except RETRYABLE_ERRORS as e:
+                retry_after = self._retry_after(e)
+                budget_exhausted = isinstance(e, openai.APITimeoutError) and budget is not None and deadline.remaining() <= 0
+                if permit:
+                    # A timeout cut short by the request's own budget says nothing about the health of the API
+                    outcome = Outcome.THROTTLED if isinstance(e, openai.RateLimitError) else Outcome.FAILED
+                    permit.release(Outcome.ERROR if budget_exhausted else outcome, retry_after=retry_after)
+                if budget_exhausted:
+                    raise deadline.DeadlineExceeded("llm call") from e
+
+                if attempt == self._max_retries - 1:
+                    logger.error(f"OpenAI call to {model} failed after {self._max_retries} attempts: {str(e)}")
+                    raise
+
+                delay = self._backoff(attempt, retry_after)
+                remaining = deadline.remaining()
+                if remaining is not None and delay >= remaining:
+                    logger.warning(f"OpenAI call to {model} failed with {type(e).__name__}, no time left for a retry in {delay:.2f}s")
+                    raise deadline.DeadlineExceeded("llm call") from e
+
+                LLM_RETRIES.inc(model=model, reason=type(e).__name__)
+                logger.warning(f"OpenAI call to {model} failed with {type(e).__name__}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
             except Exception as e:
+                if permit:
+                    permit.release(Outcome.ERROR)
                 logger.error(f"Critical OpenAI failure: {str(e)}")
                 raise e
+            except BaseException:
+                # Cancelled by a stage timeout while waiting for the response
+                if permit:
+                    permit.release(Outcome.ERROR)
+                raise
+            else:
+                return response, permit
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        # Full jitter spreads retries of requests that failed together; a server hint is a floor, not an exact time
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self._retry_initial_backoff_seconds)
+        ceiling = min(self._retry_max_backoff_seconds, self._retry_initial_backoff_seconds * self._retry_backoff_multiplier ** attempt)
+        return random.uniform(0, ceiling)
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+
+        retry_after_ms = response.headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return float(retry_after_ms) / 1000
+            except ValueError:
+                pass
+
+        retry_after = response.headers.get("retry-after")
+        if not retry_after:
+            return None
+        try:
+            return float(retry_after)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+
+    def _estimate_tokens(self, kwargs: Dict[str, Any]) -> int:
+        # The API charges the prompt plus max_tokens against the token limit when the request is admitted
+        model = kwargs["model"]
+        if "input" in kwargs:
+            texts = kwargs["input"] if isinstance(kwargs["input"], list) else [kwargs["input"]]
+            return sum(count_tokens(text, model) for text in texts)
+        prompt_tokens = sum(count_tokens(message["content"], model) for message in kwargs.get("messages", []))
+        return prompt_tokens + (kwargs.get("max_tokens") or 0)
             
     def _param_or_default(self, value, default):
         return value if value is not None else default
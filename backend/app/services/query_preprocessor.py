@@ -23,5 +23,6 @@ class QueryPreprocessor:
 
         processed = self._clean_symbols(raw_query)
         processed = self._normalize_whitespace(processed)
+        processed = self._truncate_query(processed)
         
         return processed
\ No newline at end of file
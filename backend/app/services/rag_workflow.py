@@ -1,16 +1,23 @@
 import asyncio
-import json
-from typing import List
-from llama_index.core.workflow import StartEvent, StopEvent, Workflow, step, Context, Event, InputRequiredEvent, HumanResponseEvent
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+# Imported from the workflows package that llama_index.core.workflow re-exports; the shim imports all of llama_index.core
+from workflows import Context, Workflow, step
+from workflows.events import StartEvent, StopEvent, Event, InputRequiredEvent, HumanResponseEvent
 
+from app.core import deadline
 from app.core.config import settings
 from app.core.logging_config import logger
-from app.core.prompts import PROJECT_SUMMARIZATION_SYSTEM_PROMPT, PROJECT_SUMMARIZATION_USER_MESSAGE, CASE_STUDY_SUMMARIZATION_SYSTEM_PROMPT, CASE_STUDY_SUMMARIZATION_USER_MESSAGE
+from app.core.metrics import WORKFLOW_STEP_SECONDS, timed
+from app.core.prompts import (
+    PROJECT_SUMMARIZATION_SYSTEM_PROMPT, PROJECT_SUMMARIZATION_USER_MESSAGE, CASE_STUDY_SUMMARIZATION_SYSTEM_PROMPT, CASE_STUDY_SUMMARIZATION_USER_MESSAGE,
+    PROJECT_OVERVIEW_SYSTEM_PROMPT, PROJECT_OVERVIEW_USER_MESSAGE, PROJECT_CARD_SYSTEM_PROMPT, PROJECT_CARD_USER_MESSAGE
+)
+from app.models.cache_stats import CacheStats
 from app.models.constants import Intent, FailureReason
 from app.models.intent_context import IntentContext
+from app.models.packed_prompt import PackedPrompt
 from app.models.project import Project
 from app.models.case_study import CaseStudy
-from app.models.record import Record
 from app.models.scored_record import ScoredRecord
 from app.models.vector_search_result import VectorSearchResult
 from app.models.weighted_search_result import WeightedSearchResult
@@ -18,25 +25,42 @@ from app.repositories.interfaces.case_study_repo import CaseStudyRepository
 from app.repositories.interfaces.project_repo import ProjectRepository
 from app.services.interfaces.llm_service import LLMService
 from app.services.interfaces.nlp_processor import NLPProcessor
+from app.services.context_packer import CASE_STUDY_FIELD_KEYS, PROJECT_FIELD_KEYS, PROJECT_OVERVIEW_FIELD_KEYS, ContextPacker
 from app.services.query_preprocessor import QueryPreprocessor
+from app.services.record_cache import RecordCache
+from app.services.response_cache import CachedResponse, ResponseCache
 from app.services.weighted_aggregator import WeightedAggregator
 
+T = TypeVar("T")
+
+SUMMARY_PART_SEPARATOR = "\n\n"
+
+SUMMARY_TIMEOUT_NOTICE = "The summary could not be completed in time. These are the matching records:"
+
+# Process-wide record of how often speculative case study retrieval is kept
+speculative_retrieval_stats = CacheStats()
+
 class QueryEvent(Event):
     query: str
 
 class IntentEvent(Event):
     query: str
     intent_context: IntentContext
+    prefetched_case_studies: Optional[List[ScoredRecord[CaseStudy]]] = None
+    query_vector: Optional[List[float]] = None
+    cached_response: Optional[CachedResponse] = None
 
 class ProjectRetrievalResultEvent(Event):
     query: str
     intent_context: IntentContext
     result: List[ScoredRecord[Project]]
+    query_vector: Optional[List[float]] = None
 
 class CaseStudyRetrievalResultEvent(Event):
     query: str
     intent_context: IntentContext
     result: List[ScoredRecord[CaseStudy]]
+    query_vector: Optional[List[float]] = None
 
 class FailureEvent(Event):
     intext_context: IntentContext
@@ -45,6 +69,16 @@ class FailureEvent(Event):
 class FeedbackEvent(Event):
     feedback: str
 
+class ProgressEvent(Event):
+    """Workflow progress written to the event stream for streaming clients."""
+    stage: str
+    message: str
+    data: Dict[str, Any] = {}
+
+class TokenEvent(Event):
+    """A chunk of the summary text as it is generated by the LLM."""
+    delta: str
+
 class RagWorkflow(Workflow):
 
     def __init__(
@@ -54,7 +88,10 @@ class RagWorkflow(Workflow):
             nlp_processor: NLPProcessor, 
             llm_service: LLMService, 
             aggregator: WeightedAggregator, 
-            query_preprocessor: QueryPreprocessor):
+            query_preprocessor: QueryPreprocessor,
+            context_packer: ContextPacker,
+            response_cache: Optional[ResponseCache] = None,
+            record_cache: Optional[RecordCache] = None):
         super().__init__()
         self._project_repo = project_repo
         self._case_study_repo = case_study_repo
@@ -62,11 +99,23 @@ class RagWorkflow(Workflow):
         self._llm_service = llm_service
         self._aggregator = aggregator
         self._query_preprocessor = query_preprocessor
+        self._context_packer = context_packer
+        self._response_cache = response_cache
+        self._record_cache = record_cache
         self._clarification_max_attempts = settings.CLARIFICATION_MAX_ATTEMPTS
         self._retrieval_top_k_case_studies = settings.RETRIEVAL_TOP_K_CASE_STUDIES
         self._retrieval_top_k_projects = settings.RETRIEVAL_TOP_K_PROJECTS
+        self._speculative_retrieval_enabled = settings.SPECULATIVE_RETRIEVAL_ENABLED
+        self._two_phase_retrieval = settings.RETRIEVAL_TWO_PHASE_ENABLED
+        self._project_summary_mode = settings.PROJECT_SUMMARY_MODE
+        self._project_cards_per_call = settings.PROJECT_SUMMARY_CARDS_PER_CALL
+        self._condense_timeout = settings.CONDENSE_TIMEOUT_SECONDS
+        self._intent_timeout = settings.INTENT_TIMEOUT_SECONDS
+        self._retrieval_timeout = settings.RETRIEVAL_TIMEOUT_SECONDS
+        self._summary_timeout = settings.SUMMARY_TIMEOUT_SECONDS
 
     @step
+    @timed(WORKFLOW_STEP_SECONDS, step="start")
     async def start(self, ctx: Context, ev: StartEvent) -> QueryEvent:
         logger.info(f"Workflow started with query: '{ev.query}'")
         preprocessed_query = self._query_preprocessor.preprocess(ev.query)
@@ -75,69 +124,138 @@ class RagWorkflow(Workflow):
         return QueryEvent(query=ev.query)
     
     @step
+    @timed(WORKFLOW_STEP_SECONDS, step="intent_detection")
     async def intent_detection(self, ctx: Context, ev: QueryEvent | FeedbackEvent) -> IntentEvent | FailureEvent:
         if isinstance(ev, FeedbackEvent):
             state = await ctx.store.get('state')
-            query = await self._nlp_processor.condense_query(state["chat_history"])
+            query = await self._condense_query(state["chat_history"])
         else:        
             query = ev.query
 
+        query_vector = None
+        if self._response_cache is not None:
+            # A near-identical past query supplies its parsed intent; retrieval then decides whether its answer still applies
+            query_vector = await self._llm_service.generate_embedding(query)
+            cached_response = self._response_cache.lookup(query_vector)
+            if cached_response is not None:
+                logger.info(f"Reusing the intent of a cached answer for query: '{query}'")
+                intent_context = cached_response.intent_context
+                ctx.write_event_to_stream(ProgressEvent(
+                    stage="intent_detected",
+                    message=f"Detected intent: {intent_context.intent.value}",
+                    data={"intent": intent_context.intent.value}
+                ))
+                return IntentEvent(query=query, intent_context=intent_context, query_vector=query_vector, cached_response=cached_response)
+
         logger.info(f"Detecting intent for query: '{query}'")
-        intent_context = await self._nlp_processor.process_query(query=query)
+        speculative_task = None
+        if self._speculative_retrieval_enabled:
+            # Case study retrieval only needs the query, so it can run while the intent is being parsed
+            speculative_task = asyncio.create_task(self._retrieve_relevant_case_studies(query))
+
+        try:
+            intent_context = await deadline.run_with_timeout(
+                self._nlp_processor.process_query(query=query), self._intent_timeout, "intent_detection")
+        except BaseException:
+            if speculative_task is not None:
+                speculative_task.cancel()
+            raise
+
+        prefetched_case_studies = None
+        if speculative_task is not None:
+            prefetched_case_studies = await self._resolve_speculative_retrieval(speculative_task, intent_context.intent)
+
         logger.info(f"Intent detection and entity extraction completed: {intent_context.model_dump()}")
+        ctx.write_event_to_stream(ProgressEvent(
+            stage="intent_detected",
+            message=f"Detected intent: {intent_context.intent.value}",
+            data={"intent": intent_context.intent.value}
+        ))
         
         if (intent_context.intent == Intent.PROJECT_MATCHING or intent_context.intent == Intent.CASE_STUDY_RETRIEVAL):
-            return IntentEvent(query=query, intent_context=intent_context)
+            return IntentEvent(query=query, intent_context=intent_context, prefetched_case_studies=prefetched_case_studies, query_vector=query_vector)
         else:
             return FailureEvent(
                 intext_context=intent_context,
                 reason=FailureReason.AMBIGUOUS_INTENT)
         
     @step
-    async def retrieval(self, ctx: Context, ev: IntentEvent) -> ProjectRetrievalResultEvent | CaseStudyRetrievalResultEvent | FailureEvent:
+    @timed(WORKFLOW_STEP_SECONDS, step="retrieval")
+    async def retrieval(self, ctx: Context, ev: IntentEvent) -> ProjectRetrievalResultEvent | CaseStudyRetrievalResultEvent | FailureEvent | StopEvent:
         if ev.intent_context.intent == Intent.CASE_STUDY_RETRIEVAL:
-            logger.info(f"Retrieval of case studies started")
-            records = await self._retrieve_relevant_case_studies(ev.query)
+            if ev.prefetched_case_studies is not None:
+                records = ev.prefetched_case_studies
+            else:
+                logger.info(f"Retrieval of case studies started")
+                records = await deadline.run_with_timeout(
+                    self._retrieve_relevant_case_studies(ev.query), self._retrieval_timeout, "retrieval")
             logger.info(f"Retrieved {len(records)} case studies.")
+            ctx.write_event_to_stream(ProgressEvent(
+                stage="records_retrieved",
+                message=f"Retrieved {len(records)} case studies",
+                data={"count": len(records)}
+            ))
 
             if not records:
                 return FailureEvent(
                     intext_context=ev.intent_context,
                     reason=FailureReason.NO_MATCHING_RECORDS)  
 
+            if (cached := self._serve_cached_response(ctx, ev, records)) is not None:
+                return cached
+
             return CaseStudyRetrievalResultEvent(
                 query=ev.query, 
                 intent_context=ev.intent_context,
-                result=records)
+                result=records,
+                query_vector=ev.query_vector)
             
         elif ev.intent_context.intent == Intent.PROJECT_MATCHING:
             logger.info(f"Retrieval of projects started")
-            records = await self._retrieve_relevant_projects(
-                ev.intent_context.technologies,
-                ev.intent_context.solutions,
-                ev.intent_context.services
-            )
+            records = await deadline.run_with_timeout(
+                self._retrieve_relevant_projects(
+                    ev.intent_context.technologies,
+                    ev.intent_context.solutions,
+                    ev.intent_context.services
+                ),
+                self._retrieval_timeout,
+                "retrieval")
             logger.info(f"Retrieved {len(records)} projects.")
+            ctx.write_event_to_stream(ProgressEvent(
+                stage="records_retrieved",
+                message=f"Retrieved {len(records)} projects",
+                data={"count": len(records)}
+            ))
 
             if not records:
                 return FailureEvent(
                     intext_context=ev.intent_context,
                     reason=FailureReason.NO_MATCHING_RECORDS)  
 
+            if (cached := self._serve_cached_response(ctx, ev, records)) is not None:
+                return cached
+
             return ProjectRetrievalResultEvent(
                 query=ev.query, 
                 intent_context=ev.intent_context,
-                result=records)
+                result=records,
+                query_vector=ev.query_vector)
         
     @step
+    @timed(WORKFLOW_STEP_SECONDS, step="summarize_projects")
     async def summarize_projects(self, ctx: Context, ev: ProjectRetrievalResultEvent) -> StopEvent:
         logger.info(f"Summarizing projects started")
-        raw_projects = [item.record for item in ev.result]
-        summary = await self._generate_summary(
-            ev.query, 
-            PROJECT_SUMMARIZATION_SYSTEM_PROMPT, 
-            PROJECT_SUMMARIZATION_USER_MESSAGE, 
-            raw_projects)
+        if self._project_summary_mode == "parallel":
+            build_prompts = lambda: self._project_card_prompts(ev.query, ev.result)
+        else:
+            build_prompts = lambda: [self._context_packer.pack(
+                PROJECT_SUMMARIZATION_SYSTEM_PROMPT, 
+                PROJECT_SUMMARIZATION_USER_MESSAGE, 
+                ev.query, 
+                ev.result, 
+                PROJECT_FIELD_KEYS)]
+
+        summary = await self._generate_summary(ctx, ev.query, ev.query_vector, ev.intent_context, ev.result, build_prompts)
 
         return StopEvent(
             result={
@@ -148,14 +266,17 @@ class RagWorkflow(Workflow):
         )
 
     @step
+    @timed(WORKFLOW_STEP_SECONDS, step="summarize_case_studies")
     async def summarize_case_studies(self, ctx: Context, ev: CaseStudyRetrievalResultEvent) -> StopEvent:
         logger.info(f"Summarizing case studies started")
-        raw_case_studies = [item.record for item in ev.result]
-        summary = await self._generate_summary(
-            ev.query, 
+        build_prompts = lambda: [self._context_packer.pack(
             CASE_STUDY_SUMMARIZATION_SYSTEM_PROMPT, 
             CASE_STUDY_SUMMARIZATION_USER_MESSAGE, 
-            raw_case_studies)
+            ev.query, 
+            ev.result, 
+            CASE_STUDY_FIELD_KEYS)]
+
+        summary = await self._generate_summary(ctx, ev.query, ev.query_vector, ev.intent_context, ev.result, build_prompts)
         
         return StopEvent(
             result={
@@ -166,6 +287,7 @@ class RagWorkflow(Workflow):
         )
             
     @step
+    @timed(WORKFLOW_STEP_SECONDS, step="clarification")
     async def clarification(self, ctx: Context, ev: FailureEvent) -> InputRequiredEvent | StopEvent:
         logger.warning(f"Workflow entering clarification mode. Reason: {ev.reason}")
         state = await ctx.store.get("state")
@@ -203,6 +325,7 @@ class RagWorkflow(Workflow):
         )
     
     @step
+    @timed(WORKFLOW_STEP_SECONDS, step="get_feedback")
     async def get_feedback(self, ctx: Context, ev: HumanResponseEvent) -> FeedbackEvent:
         preprocessed_query = self._query_preprocessor.preprocess(ev.response)
         state = await ctx.store.get("state")
@@ -212,92 +335,278 @@ class RagWorkflow(Workflow):
 
         return FeedbackEvent(feedback=preprocessed_query)
     
-    async def _retrieve_relevant_case_studies(self, query: str) -> List[VectorSearchResult[CaseStudy]]:
+    async def _resolve_speculative_retrieval(self, task: asyncio.Task, intent: Intent) -> Optional[List[ScoredRecord[CaseStudy]]]:
+        records = None
+        if intent == Intent.CASE_STUDY_RETRIEVAL:
+            try:
+                records = await deadline.run_with_timeout(task, self._retrieval_timeout, "retrieval")
+            except deadline.DeadlineExceeded:
+                # An expired budget raises before waiting, which leaves the task running
+                task.cancel()
+                logger.warning("Speculative case study retrieval ran out of time, retrieving again")
+            except Exception as e:
+                logger.warning(f"Speculative case study retrieval failed, retrieving again: {e}")
+        else:
+            task.cancel()
+
+        if records is not None:
+            speculative_retrieval_stats.hits += 1
+        else:
+            speculative_retrieval_stats.misses += 1
+
+        logger.info(
+            f"Speculative case study retrieval {'used' if records is not None else 'discarded'} "
+            f"(hit rate {speculative_retrieval_stats.hit_rate:.0%} over "
+            f"{speculative_retrieval_stats.hits + speculative_retrieval_stats.misses} runs)"
+        )
+        return records
+
+    async def _retrieve_relevant_case_studies(self, query: str) -> List[ScoredRecord[CaseStudy]]:
         if not query:
             return []
         
         vector = await self._llm_service.generate_embedding(query)
-        case_study_search_results = await self._case_study_repo.retrieve_case_study_records(vector, self._retrieval_top_k_case_studies)
-
-        scored_case_studies = [
-            ScoredRecord(record=item.obj, score=item.certainty) 
-            for item in case_study_search_results
-        ]
+        case_study_search_results = await self._case_study_repo.retrieve_case_study_records(
+            vector, 
+            self._retrieval_top_k_case_studies, 
+            include_properties=not self._two_phase_retrieval)
 
-        if len(scored_case_studies) == 0:
+        if len(case_study_search_results) == 0:
             logger.warning(f"Retrieval yeilded total 0 case studies from database for tech query: {query}")
             return []
         
         relevant_case_studies = []
 
         if settings.CASE_STUDY_SCORE_THRESHOLD:
-            relevant_case_studies = [item for item in scored_case_studies if item.score > settings.CASE_STUDY_SCORE_THRESHOLD]
+            relevant_case_studies = [item for item in case_study_search_results if item.certainty > settings.CASE_STUDY_SCORE_THRESHOLD]
             if len(relevant_case_studies) == 0:
                 logger.warning(f"No case studies where found with score above threshold {settings.CASE_STUDY_SCORE_THRESHOLD} for query: {query}")
         else:
-            relevant_case_studies = scored_case_studies
+            relevant_case_studies = case_study_search_results
 
-        return relevant_case_studies
+        relevant_case_studies = await self._load_records(relevant_case_studies, "CaseStudy", self._case_study_repo.get_case_studies_by_ids)
+
+        return [
+            ScoredRecord(id=item.id, record=item.obj, score=item.certainty) 
+            for item in relevant_case_studies
+        ]
 
     async def _retrieve_relevant_projects(self, technologies: List[str], solutions: List[str], services: List[str]) -> List[ScoredRecord[Project]]:
         tech_query = " ".join((technologies or []) + (solutions or []))
-        tech_task = self._retrieve_projects_by_tech_stack(query=tech_query)
-
         service_query = " ".join(services or [])
-        service_task = self._retrieve_projects_by_services(query=service_query)
 
-        tech_records, service_records = await asyncio.gather(tech_task, service_task)
-        
-        aggregated_results = self._aggregator.aggregate(
-            [
-                WeightedSearchResult(results=tech_records, weight=settings.PROJECT_TECH_WEIGHT), 
-                WeightedSearchResult(results=service_records, weight=settings.PROJECT_SERVICE_WEIGHT)
-            ]
-        )
+        # Both criteria are embedded in a single request
+        queries = list(dict.fromkeys(query for query in (tech_query, service_query) if query))
+        vectors = dict(zip(queries, await self._llm_service.generate_embeddings(queries))) if queries else {}
 
-        scored_projects = [
-            ScoredRecord(record=project, score=score) 
-            for project, score in aggregated_results 
-        ]
+        tech_vector = vectors.get(tech_query)
+        service_vector = vectors.get(service_query)
+
+        if settings.PROJECT_RETRIEVAL_MODE == "multi_target" and tech_vector and service_vector:
+            aggregated_results = await self._retrieve_projects_by_weighted_vectors(tech_vector, service_vector)
+        else:
+            # With only one criterion present the other side contributes nothing, which the aggregator already handles
+            tech_task = self._retrieve_projects_by_tech_stack(vector=tech_vector)
+            service_task = self._retrieve_projects_by_services(vector=service_vector)
+
+            tech_records, service_records = await asyncio.gather(tech_task, service_task)
+            
+            aggregated_results = self._aggregator.aggregate(
+                [
+                    WeightedSearchResult(results=tech_records, weight=settings.PROJECT_TECH_WEIGHT), 
+                    WeightedSearchResult(results=service_records, weight=settings.PROJECT_SERVICE_WEIGHT)
+                ]
+            )
 
-        if len(scored_projects) == 0:
+        if len(aggregated_results) == 0:
             logger.warning(f"Retrieval yeilded total 0 projects from database for tech criteria: '{tech_query}' and service criteria: '{service_query}'")
             return []
         
         relevant_projects = []
 
         if settings.PROJECT_SCORE_THRESHOLD:
-            relevant_projects = [item for item in scored_projects if item.score > settings.PROJECT_SCORE_THRESHOLD]
+            relevant_projects = [item for item in aggregated_results if item.certainty > settings.PROJECT_SCORE_THRESHOLD]
             if len(relevant_projects) == 0:
                 logger.warning(f"No projects where found with score above threshold {settings.PROJECT_SCORE_THRESHOLD} for tech criteria: {tech_query} and service criteria: '{service_query}'")
         else:
-            relevant_projects = scored_projects
+            relevant_projects = aggregated_results
 
-        return relevant_projects
+        relevant_projects = await self._load_records(relevant_projects, "Project", self._project_repo.get_projects_by_ids)
 
-    async def _retrieve_projects_by_tech_stack(self, query: str) -> List[VectorSearchResult[Project]]:
-        if not query:
+        return [
+            ScoredRecord(id=item.id, record=item.obj, score=item.certainty) 
+            for item in relevant_projects
+        ]
+
+    async def _load_records(
+            self, 
+            results: List[VectorSearchResult[T]], 
+            collection: str, 
+            fetch: Callable[[List[str]], Awaitable[Dict[str, T]]]) -> List[VectorSearchResult[T]]:
+        # Second phase of retrieval: properties are loaded only for the results that survived thresholding
+        missing_ids = [item.id for item in results if item.obj is None]
+        if not missing_ids:
+            return results
+
+        if self._record_cache is not None:
+            records = await self._record_cache.get_many(collection, missing_ids, fetch)
+        else:
+            records = await fetch(missing_ids)
+
+        loaded_results = []
+        for item in results:
+            obj = item.obj if item.obj is not None else records.get(item.id)
+            if obj is None:
+                logger.warning(f"{collection} {item.id} was deleted between search and fetch, skipping it")
+                continue
+            loaded_results.append(item.model_copy(update={"obj": obj}))
+
+        return loaded_results
+
+    async def _retrieve_projects_by_weighted_vectors(self, tech_vector: List[float], service_vector: List[float]) -> List[VectorSearchResult[Project]]:
+        if settings.PROJECT_TECH_WEIGHT + settings.PROJECT_SERVICE_WEIGHT != 1.0:
+            raise ValueError("The sum of all weights must be 1.")
+
+        return await self._project_repo.retrieve_project_records_by_weighted_vectors(
+            technical_vector=tech_vector,
+            service_vector=service_vector,
+            technical_weight=settings.PROJECT_TECH_WEIGHT,
+            service_weight=settings.PROJECT_SERVICE_WEIGHT,
+            top_k=self._retrieval_top_k_projects,
+            include_properties=not self._two_phase_retrieval
+        )
+
+    async def _retrieve_projects_by_tech_stack(self, vector: Optional[List[float]]) -> List[VectorSearchResult[Project]]:
+        if not vector:
             return []
         
-        vector = await self._llm_service.generate_embedding(query)
-        return await self._project_repo.retrieve_project_records_by_technical_vector(vector, self._retrieval_top_k_projects)
+        return await self._project_repo.retrieve_project_records_by_technical_vector(vector, self._retrieval_top_k_projects, include_properties=not self._two_phase_retrieval)
 
-    async def _retrieve_projects_by_services(self, query: str) -> List[VectorSearchResult[Project]]:
-        if not query:
+    async def _retrieve_projects_by_services(self, vector: Optional[List[float]]) -> List[VectorSearchResult[Project]]:
+        if not vector:
             return []
         
-        vector = await self._llm_service.generate_embedding(query)
-        return await self._project_repo.retrieve_project_records_by_service_vector(vector, self._retrieval_top_k_projects)
+        return await self._project_repo.retrieve_project_records_by_service_vector(vector, self._retrieval_top_k_projects, include_properties=not self._two_phase_retrieval)
     
-    async def _generate_summary(self, query: str, system_prompt: str, user_prompt: str, records: List[Record]) -> str:
-        items = [record.model_dump() for record in records]
-        json_data = json.dumps(items, indent=2)
-        system_prompt = system_prompt.format(query=query)
-        user_message = user_prompt.format(query=query, json_data=json_data)
-
-        return await self._llm_service.generate_text(
-            system_prompt=system_prompt,
-            user_message=user_message
+    async def _generate_summary(
+            self, 
+            ctx: Context, 
+            query: str, 
+            query_vector: Optional[List[float]], 
+            intent_context: IntentContext, 
+            scored_records: List[ScoredRecord], 
+            build_prompts: Callable[[], List[PackedPrompt]]) -> str:
+        prompts = build_prompts()
+        logger.info(
+            f"Summary prompts use {sum(prompt.token_count for prompt in prompts)} tokens in {len(prompts)} calls "
+            f"for {len(scored_records)} records ({sum(prompt.fields_truncated for prompt in prompts)} fields truncated)")
+
+        parts: List[str] = []
+        try:
+            await deadline.run_with_timeout(self._stream_summary_parts(ctx, prompts, parts), self._summary_timeout, "summarization")
+        except deadline.DeadlineExceeded:
+            logger.warning(f"Summarization ran out of time after {len(parts)} of {len(prompts)} parts, returning the records without the remaining narrative")
+            return self._timed_out_summary(ctx, parts, scored_records)
+
+        summary = SUMMARY_PART_SEPARATOR.join(parts)
+        if self._response_cache is not None and query_vector is not None and summary:
+            self._response_cache.store(query_vector, intent_context, [item.id for item in scored_records], summary)
+
+        return summary
+
+    def _serve_cached_response(self, ctx: Context, ev: IntentEvent, records: List[ScoredRecord]) -> Optional[StopEvent]:
+        """The cached answer when the records it summarized are exactly the ones just retrieved."""
+        if ev.cached_response is None or not self._response_cache.validate(ev.cached_response, [item.id for item in records]):
+            return None
+
+        logger.info(f"Serving cached answer for query: '{ev.query}'")
+        ctx.write_event_to_stream(TokenEvent(delta=ev.cached_response.answer))
+        return StopEvent(
+            result={
+                "answer": ev.cached_response.answer,
+                "intent_context": ev.intent_context,
+                "retrieved_records": records
+            }
         )
-    
-        
\ No newline at end of file
+
+    def _timed_out_summary(self, ctx: Context, parts: List[str], scored_records: List[ScoredRecord]) -> str:
+        # Completed and partially streamed parts are kept; the records themselves are returned to the client either way
+        record_list = "\n".join(f"- {item.record.title}" for item in sorted(scored_records, key=lambda item: item.score, reverse=True))
+        fallback = f"{SUMMARY_TIMEOUT_NOTICE}\n{record_list}"
+        ctx.write_event_to_stream(TokenEvent(delta=SUMMARY_PART_SEPARATOR + fallback))
+        return SUMMARY_PART_SEPARATOR.join(parts + [fallback])
+
+    async def _condense_query(self, history: List[str]) -> str:
+        try:
+            return await deadline.run_with_timeout(self._nlp_processor.condense_query(history), self._condense_timeout, "condensation")
+        except deadline.DeadlineExceeded:
+            # Without condensation every user turn is searched together, which keeps the entities of the original question
+            logger.warning("Query condensation ran out of time, searching with the joined user turns instead")
+            return " ".join(line[len("User: "):] for line in history if line.startswith("User: "))
+
+    def _project_card_prompts(self, query: str, scored_records: List[ScoredRecord[Project]]) -> List[PackedPrompt]:
+        # Map: every group of cards is an independent call. Reduce: the overview sentence is a small call of its own
+        ranked_records = sorted(scored_records, key=lambda item: item.score, reverse=True)
+        overview_prompt = self._context_packer.pack(
+            PROJECT_OVERVIEW_SYSTEM_PROMPT, 
+            PROJECT_OVERVIEW_USER_MESSAGE, 
+            query, 
+            ranked_records, 
+            PROJECT_OVERVIEW_FIELD_KEYS)
+
+        group_size = max(1, self._project_cards_per_call)
+        card_prompts = [
+            self._context_packer.pack(
+                PROJECT_CARD_SYSTEM_PROMPT, 
+                PROJECT_CARD_USER_MESSAGE, 
+                query, 
+                ranked_records[index:index + group_size], 
+                PROJECT_FIELD_KEYS)
+            for index in range(0, len(ranked_records), group_size)
+        ]
+
+        return [overview_prompt] + card_prompts
+
+    async def _stream_summary_parts(self, ctx: Context, prompts: List[PackedPrompt], parts: List[str]) -> List[str]:
+        """
+        Generates all parts concurrently and writes their tokens to the event stream in prompt order:
+        the current part streams live while later parts are buffered until it completes. Completed parts
+        are appended to parts as they finish, and so is the streamed beginning of a part cut off by a timeout,
+        so parts always holds what the client has already received.
+        """
+        queues: List[asyncio.Queue] = [asyncio.Queue() for _ in prompts]
+
+        async def generate_part(prompt: PackedPrompt, queue: asyncio.Queue) -> None:
+            try:
+                async for token in self._llm_service.generate_text_stream(
+                    system_prompt=prompt.system_prompt,
+                    user_message=prompt.user_message
+                ):
+                    queue.put_nowait(token)
+            finally:
+                queue.put_nowait(None)
+
+        tasks = [asyncio.create_task(generate_part(prompt, queue)) for prompt, queue in zip(prompts, queues)]
+        try:
+            for index, queue in enumerate(queues):
+                if index > 0:
+                    ctx.write_event_to_stream(TokenEvent(delta=SUMMARY_PART_SEPARATOR))
+
+                chunks: List[str] = []
+                try:
+                    while (token := await queue.get()) is not None:
+                        chunks.append(token)
+                        ctx.write_event_to_stream(TokenEvent(delta=token))
+                except asyncio.CancelledError:
+                    if chunks:
+                        parts.append("".join(chunks).strip())
+                    raise
+
+                # Re-raises the error of a part that failed
+                await tasks[index]
+                parts.append("".join(chunks).strip())
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return parts
@@ -0,0 +1,47 @@
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from app.core.ttl_cache import TTLCache
+from app.models.cache_stats import CacheStats
+
+T = TypeVar("T")
+
+class RecordCache:
+    """
+    In-process cache of retrieved records keyed on collection and object UUID. Misses are loaded
+    with one batched fetch, so hydrating a result list costs at most a single round-trip.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float]):
+        self._cache: TTLCache[str, object] = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    async def get_many(
+            self,
+            collection: str,
+            ids: List[str],
+            fetch: Callable[[List[str]], Awaitable[Dict[str, T]]]) -> Dict[str, T]:
+        records: Dict[str, T] = {}
+        missing: List[str] = []
+
+        for record_id in ids:
+            record = self._cache.get(self._key(collection, record_id))
+            if record is None:
+                missing.append(record_id)
+            else:
+                records[record_id] = record
+
+        if missing:
+            fetched = await fetch(missing)
+            for record_id, record in fetched.items():
+                self._cache.set(self._key(collection, record_id), record)
+            records.update(fetched)
+
+        return records
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+    def _key(self, collection: str, record_id: str) -> str:
+        return f"{collection}/{record_id}"
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.models.cache_stats import CacheStats
+from app.models.intent_context import IntentContext
+
+class CachedResponse(BaseModel):
+    """An answer served at workflow entry, together with what it was derived from."""
+    slot: int
+    intent_context: IntentContext
+    record_ids: List[str]
+    answer: str
+
+class ResponseCache:
+    """
+    Semantic cache of final workflow answers, looked up when a run starts. Past query embeddings are kept
+    in a fixed-size matrix; the most similar past query above the threshold supplies its parsed intent,
+    and its answer is served only when retrieval for the new query returns exactly the same records.
+    Answers derived from an older index are dropped by invalidate(), which runs when the index changes.
+    """
+
+    def __init__(self, max_entries: int, similarity_threshold: float):
+        self._max_entries = max_entries
+        self._similarity_threshold = similarity_threshold
+        self._vectors: Optional[np.ndarray] = None
+        self._entries: List[Optional[CachedResponse]] = [None] * max_entries
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+        self._stats = CacheStats()
+
+    def lookup(self, query_vector: List[float]) -> Optional[CachedResponse]:
+        """The candidate answer for a query; it counts as a hit once validate() confirms the records."""
+        vector = self._normalize(query_vector)
+        if not self._lru or vector is None or vector.shape[0] != self._vectors.shape[1]:
+            self._stats.misses += 1
+            return None
+
+        slots = np.fromiter(self._lru.keys(), dtype=np.intp, count=len(self._lru))
+        similarities = self._vectors[slots] @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self._similarity_threshold:
+            self._stats.misses += 1
+            return None
+
+        return self._entries[int(slots[best])].model_copy(deep=True)
+
+    def validate(self, candidate: CachedResponse, record_ids: List[str]) -> bool:
+        entry = self._entries[candidate.slot]
+        # The slot may have been evicted, reused or invalidated since the lookup
+        if candidate.slot not in self._lru or entry is None or entry.answer != candidate.answer or entry.record_ids != record_ids:
+            self._stats.misses += 1
+            return False
+
+        self._lru.move_to_end(candidate.slot)
+        self._stats.hits += 1
+        return True
+
+    def store(self, query_vector: List[float], intent_context: IntentContext, record_ids: List[str], answer: str) -> None:
+        vector = self._normalize(query_vector)
+        if vector is None:
+            return
+
+        if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+            self._vectors = np.zeros((self._max_entries, vector.shape[0]), dtype=np.float32)
+            self._lru.clear()
+
+        if len(self._lru) < self._max_entries:
+            slot = len(self._lru)
+        else:
+            slot, _ = self._lru.popitem(last=False)
+            self._stats.evictions += 1
+
+        self._vectors[slot] = vector
+        self._entries[slot] = CachedResponse(slot=slot, intent_context=intent_context, record_ids=record_ids, answer=answer)
+        self._lru[slot] = None
+
+    def invalidate(self) -> None:
+        self._lru.clear()
+        self._entries = [None] * self._max_entries
+
+    def stats(self) -> CacheStats:
+        return self._stats.model_copy(update={"size": len(self._lru)})
+
+    def _normalize(self, query_vector: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app.models.cache_stats import CacheStats
+from app.services.context_serialization import deserialize_context, serialize_context
+from app.services.interfaces.context_store import ContextDict, ContextStore
+
+class SQLiteContextStore(ContextStore):
+    """
+    Context store backed by a SQLite file, so every uvicorn worker on the host can resume a
+    conversation started by another one. Entries expire after ttl_seconds and the oldest entries
+    are evicted beyond max_entries. The reported size is counted by the writes themselves, so reading
+    the stats never queries the file; writes by other workers show up after this worker's next save.
+    """
+
+    def __init__(self, db_path: str, max_entries: int, ttl_seconds: Optional[float]):
+        self._db_path = db_path
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._size = 0
+
+    async def save(self, workflow_id: str, context_dict: ContextDict) -> None:
+        payload = serialize_context(context_dict)
+        await asyncio.to_thread(self._save, workflow_id, payload)
+
+    async def pop(self, workflow_id: str) -> Optional[ContextDict]:
+        payload = await asyncio.to_thread(self._pop, workflow_id)
+        if payload is None:
+            self._stats.misses += 1
+            return None
+
+        self._stats.hits += 1
+        return deserialize_context(payload)
+
+    async def delete(self, workflow_id: str) -> None:
+        await asyncio.to_thread(self._delete, workflow_id)
+
+    def stats(self) -> CacheStats:
+        return self._stats.model_copy(update={"size": self._size})
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            db_dir = os.path.dirname(self._db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self._db = sqlite3.connect(self._db_path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS contexts ("
+                "workflow_id TEXT PRIMARY KEY, payload BLOB NOT NULL, expires_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS contexts_updated_at ON contexts (updated_at)")
+        return self._db
+
+    def _delete(self, workflow_id: str) -> None:
+        with self._lock:
+            deleted = self._connection().execute("DELETE FROM contexts WHERE workflow_id = ?", (workflow_id,)).rowcount
+            self._size = max(0, self._size - deleted)
+
+    def _save(self, workflow_id: str, payload: bytes) -> None:
+        now = time.time()
+        expires_at = now + self._ttl_seconds if self._ttl_seconds else float("inf")
+
+        with self._lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO contexts (workflow_id, payload, expires_at, updated_at) VALUES (?, ?, ?, ?)",
+                    (workflow_id, payload, expires_at, now)
+                )
+                expired = db.execute("DELETE FROM contexts WHERE expires_at < ?", (now,)).rowcount
+                evicted = db.execute(
+                    "DELETE FROM contexts WHERE workflow_id IN ("
+                    "SELECT workflow_id FROM contexts ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (self._max_entries,)
+                ).rowcount
+                # Expired rows were just deleted, so every remaining row is live
+                size = db.execute("SELECT COUNT(*) FROM contexts").fetchone()[0]
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+            self._size = size
+
+        self._stats.expirations += expired
+        self._stats.evictions += evicted
+
+    def _pop(self, workflow_id: str) -> Optional[bytes]:
+        # Read and delete atomically so two workers can never resume the same conversation
+        with self._lock:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute(
+                    "SELECT payload, expires_at FROM contexts WHERE workflow_id = ?", (workflow_id,)
+                ).fetchone()
+                if row is not None:
+                    db.execute("DELETE FROM contexts WHERE workflow_id = ?", (workflow_id,))
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+
+            if row is not None:
+                self._size = max(0, self._size - 1)
+
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.core.config import settings
+from app.core.logging_config import logger
+from app.core.metrics import WARMUP_STEP_SECONDS
+from app.core.tokenizer import count_tokens
+from app.repositories.interfaces.case_study_repo import CaseStudyRepository
+from app.repositories.interfaces.project_repo import ProjectRepository
+from app.services.centroid_nlp_processor import CentroidNLPProcessor
+from app.services.interfaces.llm_service import LLMService
+from app.services.interfaces.nlp_processor import NLPProcessor
+
+# Embedded when no warm-up queries are configured, so the OpenAI connection is still opened and a vector is available
+WARMUP_PROBE_TEXT = "warm-up"
+
+class Warmup:
+    """
+    Pays the first-request costs before traffic arrives: the TLS handshake and connection pool to OpenAI,
+    the embedding cache for common queries, the vector store's first query, the intent centroids and the
+    tokenizer encoding. A failing step is logged and skipped; readiness is reported once all steps finished.
+    """
+
+    def __init__(
+            self,
+            llm_service: LLMService,
+            nlp_processor: NLPProcessor,
+            queries: List[str],
+            timeout_seconds: float
+        ):
+        self._llm_service = llm_service
+        self._nlp_processor = nlp_processor
+        self._queries = queries
+        self._timeout_seconds = timeout_seconds
+        self._results: Dict[str, str] = {}
+        self.ready = False
+
+    def status(self) -> Dict[str, str]:
+        """Outcome of every finished step: its duration, or the error it was skipped with."""
+        return dict(self._results)
+
+    def skip(self) -> None:
+        self.ready = True
+
+    async def run(self, project_repo: ProjectRepository, case_study_repo: CaseStudyRepository) -> None:
+        start_time = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._run_steps(project_repo, case_study_repo), self._timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"Warm-up did not finish within {self._timeout_seconds}s, reporting ready without it")
+        finally:
+            self.ready = True
+        logger.info(f"Warm-up finished in {time.perf_counter() - start_time:.2f}s: {self._results}")
+
+    async def _run_steps(self, project_repo: ProjectRepository, case_study_repo: CaseStudyRepository) -> None:
+        # Loading the encoding reads, and on first use downloads, a file, so it runs next to the network steps
+        await asyncio.gather(
+            self._step("tokenizer", lambda: asyncio.to_thread(count_tokens, WARMUP_PROBE_TEXT, settings.OPENAI_CHAT_MODEL)),
+            self._warm_connections(project_repo, case_study_repo)
+        )
+
+    async def _warm_connections(self, project_repo: ProjectRepository, case_study_repo: CaseStudyRepository) -> None:
+        vectors = await self._step("embeddings", lambda: self._llm_service.generate_embeddings(self._queries or [WARMUP_PROBE_TEXT]))
+        if vectors:
+            await asyncio.gather(
+                self._step("project_near_vector", lambda: project_repo.retrieve_project_records_by_technical_vector(vectors[0], 1, include_properties=False)),
+                self._step("case_study_near_vector", lambda: case_study_repo.retrieve_case_study_records(vectors[0], 1, include_properties=False))
+            )
+
+        if isinstance(self._nlp_processor, CentroidNLPProcessor):
+            await self._step("intent_centroids", self._nlp_processor.load_centroids)
+
+    async def _step(self, name: str, func: Callable[[], Awaitable]) -> Any:
+        start_time = time.perf_counter()
+        try:
+            result = await func()
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed: {e}")
+            self._results[name] = f"failed: {e}"
+            return None
+
+        duration = time.perf_counter() - start_time
+        WARMUP_STEP_SECONDS.set(duration, step=name)
+        self._results[name] = f"{duration:.3f}s"
+        return result
@@ -1,12 +1,13 @@
-from typing import List, TypeVar, Dict, Tuple
+from typing import List, TypeVar, Dict
 
+from app.models.vector_search_result import VectorSearchResult
 from app.models.weighted_search_result import WeightedSearchResult
 
 T = TypeVar("T")
 
 class WeightedAggregator:
 
-    def aggregate(self, weighted_search_results: List[WeightedSearchResult[T]]) -> List[Tuple[T, float]]:
+    def aggregate(self, weighted_search_results: List[WeightedSearchResult[T]]) -> List[VectorSearchResult[T]]:
         if not weighted_search_results:
             return []
 
@@ -16,7 +17,7 @@ class WeightedAggregator:
         if (total_weight != 1.0):
             raise ValueError("The sum of all weights must be 1.")
 
-        aggregated_results: Dict[str, Tuple[T, float]] = {}
+        aggregated_results: Dict[str, VectorSearchResult[T]] = {}
 
         for weighted_search_result in weighted_search_results:
             weight = weighted_search_result.weight
@@ -27,9 +28,8 @@ class WeightedAggregator:
                 weighted_contribution = weight * score
 
                 if id not in aggregated_results:
-                    aggregated_results[id] = (result.obj, weighted_contribution)
+                    aggregated_results[id] = VectorSearchResult(id=id, obj=result.obj, certainty=weighted_contribution)
                 else:
-                    obj, existing_score = aggregated_results[id]
-                    aggregated_results[id] = (obj, existing_score + weighted_contribution)
+                    aggregated_results[id].certainty += weighted_contribution
 
         return list(aggregated_results.values())
\ No newline at end of file
@@ -1,16 +1,24 @@
-from typing import Any, Dict, Optional
+from typing import Optional
 
-ContextDict = Dict[str, Any]
+from app.models.cache_stats import CacheStats
+from app.services.interfaces.context_store import ContextDict, ContextStore
 
 class WorkflowManager:
-    workflow_data: Dict[str, ContextDict] = {}
 
-    def save_context(self, workflow_id: str, context_dict: ContextDict) -> None:
-        self.workflow_data[workflow_id] = context_dict
+    def __init__(self, context_store: ContextStore):
+        self._context_store = context_store
 
-    def get_context(self, workflow_id: str) -> Optional[ContextDict]:
-        return self.workflow_data.pop(workflow_id, None)
+    async def save_context(self, workflow_id: str, context_dict: ContextDict) -> None:
+        await self._context_store.save(workflow_id, context_dict)
 
-    def delete_context(self, workflow_id: str) -> None:
-        if workflow_id in self.workflow_data:
-            del self.workflow_data[workflow_id]
\ No newline at end of file
+    async def get_context(self, workflow_id: str) -> Optional[ContextDict]:
+        return await self._context_store.pop(workflow_id)
+
+    async def delete_context(self, workflow_id: str) -> None:
+        await self._context_store.delete(workflow_id)
+
+    def stats(self) -> CacheStats:
+        return self._context_store.stats()
+
+    async def close(self) -> None:
+        await self._context_store.close()
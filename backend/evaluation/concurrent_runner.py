@@ -0,0 +1,135 @@
+"""
+Concurrent alternative to deepeval's evaluate(): every (test case, metric) pair of every scenario is measured
+through a_measure at once, bounded by a semaphore, and LLM-judged results are cached on disk so unchanged
+cases are not judged again on the next run. The returned objects expose the attributes generate_report reads.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from deepeval.metrics import BaseMetric
+from deepeval.test_case import LLMTestCase, LLMTestCaseParams
+
+# Settings that change what a metric judges or how; the ones a metric does not define are left out of the key
+METRIC_CONFIG_ATTRIBUTES = ("threshold", "strict_mode", "target_attributes", "criteria", "evaluation_steps", "evaluation_params")
+
+@dataclass
+class MetricData:
+    name: str
+    score: Optional[float]
+    success: bool
+    reason: Optional[str]
+    cached: bool = False
+
+@dataclass
+class CaseResult:
+    input: str
+    success: bool
+    metrics_data: List[MetricData] = field(default_factory=list)
+
+@dataclass
+class ScenarioResult:
+    test_results: List[CaseResult] = field(default_factory=list)
+
+class JudgementCache:
+    """
+    JSON file of judged metric results keyed on the metric, its configuration and judge model, and the parts of
+    the test case it reads: the input, the output, the context and, when the metric uses it, the expected output.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    def key(self, metric: BaseMetric, test_case: LLMTestCase) -> str:
+        payload = json.dumps({
+            "metric": metric.__name__,
+            "config": metric_config(metric),
+            "model": metric_model_name(metric),
+            "input": test_case.input,
+            "actual_output": test_case.actual_output,
+            "expected_output": test_case.expected_output if uses_expected_output(metric) else None,
+            "retrieval_context": test_case.retrieval_context or []
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def set(self, key: str, entry: Dict) -> None:
+        self._entries[key] = entry
+
+    def save(self) -> None:
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self._path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+
+def metric_config(metric: BaseMetric) -> Dict:
+    return {name: getattr(metric, name) for name in METRIC_CONFIG_ATTRIBUTES if hasattr(metric, name)}
+
+def uses_expected_output(metric: BaseMetric) -> bool:
+    # G-Eval style metrics declare the test case fields they read; for the others it cannot be ruled out
+    evaluation_params = getattr(metric, "evaluation_params", None)
+    return evaluation_params is None or LLMTestCaseParams.EXPECTED_OUTPUT in evaluation_params
+
+def metric_model_name(metric: BaseMetric) -> Optional[str]:
+    model = getattr(metric, "model", None)
+    return model.get_model_name() if model is not None else None
+
+async def measure(metric: BaseMetric, test_case: LLMTestCase, semaphore: asyncio.Semaphore, cache: Optional[JudgementCache]) -> MetricData:
+    # Only LLM-judged metrics are cached; the rule-based ones are cheap and some, like latency, read run-specific metadata
+    key = cache.key(metric, test_case) if cache is not None and metric_model_name(metric) else None
+    if key is not None and (entry := cache.get(key)) is not None:
+        return MetricData(name=metric.__name__, score=entry["score"], success=entry["success"], reason=entry["reason"], cached=True)
+
+    # Metrics keep their score on the instance, so each concurrent measurement works on its own copy
+    metric = copy.copy(metric)
+    async with semaphore:
+        try:
+            await metric.a_measure(test_case)
+            result = MetricData(name=metric.__name__, score=metric.score, success=bool(metric.is_successful()), reason=getattr(metric, "reason", None))
+        except Exception as e:
+            return MetricData(name=metric.__name__, score=None, success=False, reason=f"Error during measurement: {e}")
+
+    if key is not None:
+        cache.set(key, {"score": result.score, "success": result.success, "reason": result.reason})
+    return result
+
+async def evaluate_concurrently(
+        scenarios: List[Tuple[str, List[LLMTestCase], List[BaseMetric]]],
+        concurrency: int,
+        cache: Optional[JudgementCache]
+    ) -> List[Dict]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def evaluate_case(test_case: LLMTestCase, metrics: List[BaseMetric]) -> CaseResult:
+        metrics_data = await asyncio.gather(*[measure(metric, test_case, semaphore, cache) for metric in metrics])
+        return CaseResult(input=test_case.input, success=all(data.success for data in metrics_data), metrics_data=list(metrics_data))
+
+    async def evaluate_scenario(test_cases: List[LLMTestCase], metrics: List[BaseMetric]) -> ScenarioResult:
+        return ScenarioResult(test_results=list(await asyncio.gather(*[evaluate_case(test_case, metrics) for test_case in test_cases])))
+
+    try:
+        results = await asyncio.gather(*[evaluate_scenario(test_cases, metrics) for _, test_cases, metrics in scenarios])
+    finally:
+        if cache is not None:
+            cache.save()
+
+    return [{"scenario": name, "results": result} for (name, _, _), result in zip(scenarios, results)]
@@ -1,4 +1,4 @@
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from deepeval.models.base_model import DeepEvalBaseLLM
 
 from app.core.config import settings
@@ -10,7 +10,12 @@ class EvaluationLLM(DeepEvalBaseLLM):
         self.max_tokens = settings.OPENAI_EVAL_MAX_TOKENS
         self.top_p = settings.OPENAI_EVAL_TOP_P
         self.client = OpenAI(
-            api_key=settings.OPENAI_API_KEY, 
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL
+        )
+        # Used by a_generate, so judgements requested concurrently do not block the event loop
+        self.async_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
             base_url=settings.OPENAI_BASE_URL
         )
 
@@ -19,17 +24,21 @@ class EvaluationLLM(DeepEvalBaseLLM):
 
     def generate(self, prompt: str) -> str:
         chat_model = self.load_model()
-        response = chat_model.chat.completions.create(
-            model=self.model_name,           
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-            top_p=self.top_p,
-            messages=[{"role": "user", "content": prompt},]
-        )
+        response = chat_model.chat.completions.create(**self._completion_params(prompt))
         return response.choices[0].message.content
 
     async def a_generate(self, prompt: str) -> str:
-        return self.generate(prompt)
+        response = await self.async_client.chat.completions.create(**self._completion_params(prompt))
+        return response.choices[0].message.content
 
     def get_model_name(self):
-        return self.model_name
\ No newline at end of file
+        return self.model_name
+
+    def _completion_params(self, prompt: str) -> dict:
+        return {
+            "model": self.model_name,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "top_p": self.top_p,
+            "messages": [{"role": "user", "content": prompt}]
+        }
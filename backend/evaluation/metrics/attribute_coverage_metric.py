@@ -16,6 +16,22 @@ class AttributeCoverageMetric(BaseMetric):
         self.reason = ""
 
     def measure(self, test_case: LLMTestCase):
+        entities = self._extract_entities(test_case)
+        if not entities:
+            return self._no_entities()
+
+        response = self.model.generate(self._verification_prompt(test_case, entities))
+        return self._score(response, entities)
+    
+    async def a_measure(self, test_case: LLMTestCase):
+        entities = self._extract_entities(test_case)
+        if not entities:
+            return self._no_entities()
+
+        response = await self.model.a_generate(self._verification_prompt(test_case, entities))
+        return self._score(response, entities)
+
+    def _extract_entities(self, test_case: LLMTestCase) -> List[str]:
         entities=[]
         for context in test_case.retrieval_context:        
              for label in self.target_attributes:
@@ -25,14 +41,16 @@ class AttributeCoverageMetric(BaseMetric):
                     raw_text = match.group(1).strip()
                     items = [i.strip() for i in raw_text.split(",") if i.strip()]
                     entities.extend(items)
+        return entities
 
-        if not entities:
-            self.score = 1.0
-            self.success = True
-            self.reason = "No entites found in context."
-            return self.score
+    def _no_entities(self):
+        self.score = 1.0
+        self.success = True
+        self.reason = "No entites found in context."
+        return self.score
 
-        verification_prompt = f"""
+    def _verification_prompt(self, test_case: LLMTestCase, entities: List[str]) -> str:
+        return f"""
         Summary: "{test_case.actual_output}"
         Entities to check: {entities}
 
@@ -40,9 +58,8 @@ class AttributeCoverageMetric(BaseMetric):
         Return ONLY a JSON object: {{"entity_name": true/false}}.
         Use 'true' if the meaning is present, even if rephrased.
         """
-        
-        response = self.model.generate(verification_prompt)
 
+    def _score(self, response: str, entities: List[str]):
         try:
             json_str = re.search(r"\{.*\}", response, re.DOTALL).group()
             verdicts = json.loads(json_str)
@@ -61,9 +78,6 @@ class AttributeCoverageMetric(BaseMetric):
             self.reason = f"Error during parsing: {str(e)}"
 
         return self.score
-    
-    async def a_measure(self, test_case: LLMTestCase):
-        return self.measure(test_case)
 
     def is_successful(self):
         return self.score >= self.threshold
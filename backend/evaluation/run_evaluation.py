@@ -1,21 +1,24 @@
+import argparse
 import asyncio
-from typing import List
+from typing import List, Optional
 from deepeval.evaluate import ErrorConfig
 from deepeval.metrics import FaithfulnessMetric
 from deepeval import evaluate
 
-from app.dependencies import get_query_preprocessor, get_rag_workflow, get_weaviate_manager, get_project_repo, get_case_study_repo, get_llm_service, get_nlp_processor, get_aggregator
+from app.core.logging_config import configure_logging
+from app.dependencies import get_rag_workflow, get_weaviate_manager, get_llm_service
 from evaluation.metrics.ambiguous_intent_clarification_metric import ambiguous_intent_clarification_metric
 from evaluation.metrics.no_results_clarification_metric import no_results_clarification_metric
 from evaluation.metrics.attribute_coverage_metric import AttributeCoverageMetric
 from evaluation.metrics.intent_accuracy_metric import IntentAccuracyMetric
 from evaluation.metrics.latency_metric import LatencyMetric
 from evaluation.metrics.score_threshold_metric import ScoreThresholdMetric
+from evaluation.concurrent_runner import JudgementCache, evaluate_concurrently
 from evaluation.utils import run_scenario_test
 from evaluation.evaluation_llm import EvaluationLLM
 from evaluation.golden_dataset import dataset
 
-async def run_evaluation():
+async def run_evaluation(concurrent: bool = False, concurrency: int = 8, cache_path: Optional[str] = None):
     results = []  
     custom_model = EvaluationLLM()
     faithfulness_metric = FaithfulnessMetric(
@@ -37,51 +40,53 @@ async def run_evaluation():
 
     weaviate_manager = get_weaviate_manager()
     await weaviate_manager.connect()
+    llm = get_llm_service()
+    await llm.connect()
 
     try:
-        llm = get_llm_service()
-        nlp = get_nlp_processor(llm_service=llm)
-        workflow = get_rag_workflow(
-            project_repo=get_project_repo(),
-            case_study_repo=get_case_study_repo(),
-            nlp_processor=nlp,
-            llm_service=llm,
-            aggregator=get_aggregator(),
-            query_preprocessor=get_query_preprocessor()
-        )
+        workflow = get_rag_workflow()
 
         test_cases = await asyncio.gather(*[run_scenario_test(workflow, g) for g in dataset])
-        case_study_cases = [tc for tc in test_cases if tc.additional_metadata["scenario"] in ["case_study_sum"]]
-        case_study_cases_result = evaluate(
-            case_study_cases, 
-            metrics=[intent_accuracy_metric, case_study_attribute_coverage_metric, faithfulness_metric, latency_metric],
-            error_config=ErrorConfig(ignore_errors=True))
-        results.append({"scenario": "Case study summarization", "results": case_study_cases_result})
-
-        project_cases = [tc for tc in test_cases if tc.additional_metadata["scenario"] in ["project_match"]]
-        project_cases_result = evaluate(
-            project_cases, 
-            metrics=[intent_accuracy_metric, project_attribute_coverage_metric, score_threshold_metric, faithfulness_metric, latency_metric],
-            error_config=ErrorConfig(ignore_errors=True))
-        results.append({"scenario": "Project matching", "results": project_cases_result})
-
-        ambiguous_intent_clarification_cases = [tc for tc in test_cases if tc.additional_metadata["scenario"] in ["ambiguous_intent"]]
-        ambiguous_intent_clarification_cases_result = evaluate(
-            ambiguous_intent_clarification_cases, 
-            metrics=[intent_accuracy_metric, ambiguous_intent_clarification_metric, latency_metric],
-            error_config=ErrorConfig(ignore_errors=True))
-        results.append({"scenario": "Ambiguous intent", "results": ambiguous_intent_clarification_cases_result})
-
-        no_results_clarification_cases = [tc for tc in test_cases if tc.additional_metadata["scenario"] in ["no_results"]]
-        no_results_clarification_cases_result = evaluate(
-            no_results_clarification_cases, 
-            metrics=[intent_accuracy_metric, no_results_clarification_metric, latency_metric],
-            error_config=ErrorConfig(ignore_errors=True))
-        results.append({"scenario": "No results", "results": no_results_clarification_cases_result})
+        scenarios = [
+            (
+                "Case study summarization",
+                [tc for tc in test_cases if tc.additional_metadata["scenario"] in ["case_study_sum"]],
+                [intent_accuracy_metric, case_study_attribute_coverage_metric, faithfulness_metric, latency_metric]
+            ),
+            (
+                "Project matching",
+                [tc for tc in test_cases if tc.additional_metadata["scenario"] in ["project_match"]],
+                [intent_accuracy_metric, project_attribute_coverage_metric, score_threshold_metric, faithfulness_metric, latency_metric]
+            ),
+            (
+                "Ambiguous intent",
+                [tc for tc in test_cases if tc.additional_metadata["scenario"] in ["ambiguous_intent"]],
+                [intent_accuracy_metric, ambiguous_intent_clarification_metric, latency_metric]
+            ),
+            (
+                "No results",
+                [tc for tc in test_cases if tc.additional_metadata["scenario"] in ["no_results"]],
+                [intent_accuracy_metric, no_results_clarification_metric, latency_metric]
+            )
+        ]
+
+        if concurrent:
+            cache = JudgementCache(cache_path) if cache_path else None
+            results = await evaluate_concurrently(scenarios, concurrency=concurrency, cache=cache)
+            if cache is not None:
+                print(f"Judgement cache: {cache.hits} reused, {cache.misses} judged")
+        else:
+            for name, scenario_cases, metrics in scenarios:
+                scenario_result = evaluate(
+                    scenario_cases, 
+                    metrics=metrics,
+                    error_config=ErrorConfig(ignore_errors=True))
+                results.append({"scenario": name, "results": scenario_result})
 
         generate_report(results)
 
     finally:
+        await llm.close()
         await weaviate_manager.disconnect()
 
 def generate_report(results: List):
@@ -125,7 +130,14 @@ def generate_report(results: List):
     print("\n" + "="*50)
 
 def main():
-    asyncio.run(run_evaluation())
+    parser = argparse.ArgumentParser(description="Run the golden dataset through the workflow and score every scenario.")
+    parser.add_argument("--concurrent", action="store_true", help="Judge all scenarios and metrics concurrently with the async judge instead of deepeval's evaluate().")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum metric measurements in flight in concurrent mode.")
+    parser.add_argument("--cache-path", default="cache/evaluation_judgements.json", help="Judged results reused across concurrent runs. Pass an empty string to judge everything again.")
+    args = parser.parse_args()
+
+    configure_logging()
+    asyncio.run(run_evaluation(concurrent=args.concurrent, concurrency=args.concurrency, cache_path=args.cache_path))
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
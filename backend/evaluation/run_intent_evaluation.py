@@ -0,0 +1,76 @@
+import asyncio
+from typing import Dict, List
+
+from app.core.config import settings
+from app.core.intent_examples import INTENT_EXAMPLES
+from app.core.logging_config import configure_logging
+from app.dependencies import get_llm_service, load_gazetteer
+from app.models.constants import Intent
+from app.services.centroid_nlp_processor import ENTITY_INTENTS, build_centroids, has_search_entities, rank_intents
+from evaluation.golden_dataset import dataset
+
+MARGIN_THRESHOLDS = [0.0, 0.02, 0.05, 0.08, 0.1, 0.15, 0.2]
+
+async def run_intent_evaluation():
+    """
+    Measures the centroid intent classifier against the golden dataset. Golden inputs are also training
+    examples, so every query is classified leave-one-out: against centroids built without that query.
+    Project queries only count as fast path when the gazetteer matches entities in them.
+    """
+    llm = get_llm_service()
+    await llm.connect()
+    gazetteer = load_gazetteer()
+
+    try:
+        labeled = [(intent, text) for intent, texts in INTENT_EXAMPLES.items() for text in texts]
+        example_vectors = await llm.generate_embeddings([text for _, text in labeled])
+        golden_vectors = await llm.generate_embeddings([golden.input for golden in dataset])
+
+        predictions = []
+        for golden, vector in zip(dataset, golden_vectors):
+            vectors_by_intent: Dict[Intent, List[List[float]]] = {}
+            for (intent, text), example_vector in zip(labeled, example_vectors):
+                if text != golden.input:
+                    vectors_by_intent.setdefault(intent, []).append(example_vector)
+
+            intents, centroids = build_centroids(vectors_by_intent)
+            ranked = rank_intents(vector, intents, centroids)
+            margin = ranked[0][1] - ranked[1][1]
+            has_entities = gazetteer is not None and has_search_entities(gazetteer.extract(golden.input))
+            predictions.append((golden.input, golden.additional_metadata["expected_intent"], ranked[0][0], margin, has_entities))
+
+        generate_report(predictions)
+    finally:
+        await llm.close()
+
+def generate_report(predictions: List):
+    print("\n" + "="*50)
+    print("INTENT FAST PATH EVALUATION")
+    print("="*50)
+
+    for query, expected, predicted, margin, has_entities in predictions:
+        status = "OK  " if predicted == expected else "MISS"
+        print(f" {status} margin={margin:.3f} entities={'yes' if has_entities else 'no '} expected={expected.value} predicted={predicted.value} | {query[:70]}")
+
+    total = len(predictions)
+    correct = sum(1 for _, expected, predicted, _, _ in predictions if predicted == expected)
+    print(f"\n Leave-one-out centroid accuracy: {correct / total * 100:.1f}% ({correct}/{total})")
+
+    print(f"\n Fast path by margin threshold (configured: {settings.INTENT_FAST_PATH_MARGIN}):")
+    for threshold in MARGIN_THRESHOLDS:
+        fast_path = [
+            (expected, predicted) for _, expected, predicted, margin, has_entities in predictions
+            if margin >= threshold and (predicted not in ENTITY_INTENTS or has_entities)
+        ]
+        fast_path_correct = sum(1 for expected, predicted in fast_path if predicted == expected)
+        accuracy = f"{fast_path_correct / len(fast_path) * 100:.1f}%" if fast_path else "n/a"
+        print(f"  - margin >= {threshold:.2f}: fast path rate {len(fast_path) / total * 100:.1f}% ({len(fast_path)}/{total}), accuracy {accuracy}")
+
+    print("\n" + "="*50)
+
+def main():
+    configure_logging()
+    asyncio.run(run_intent_evaluation())
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import time
 from deepeval.dataset import Golden
 from deepeval.test_case import LLMTestCase
-from llama_index.core.workflow import StopEvent, InputRequiredEvent
+from workflows.events import StopEvent, InputRequiredEvent
 
 from app.models.constants import Intent
 from app.models.case_study import CaseStudy
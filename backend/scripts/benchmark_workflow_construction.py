@@ -0,0 +1,98 @@
+"""
+Microbenchmark of the setup cost a request pays before its workflow runs. "per_request" rebuilds the workflow
+the way the dependency did before it was shared: new repositories, aggregator, preprocessor, context packer
+and RagWorkflow, whose constructor collects and inspects every @step method. "prebuilt" is the lookup of
+the shared instance built at startup. No connection is opened; the repositories are constructed without a
+client since construction never queries them.
+"""
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from app.dependencies import (
+    get_context_packer,
+    get_llm_service,
+    get_nlp_processor,
+    get_record_cache,
+    get_response_cache
+)
+from app.repositories.weaviate_case_study_repo import WeaviateCaseStudyRepository
+from app.repositories.weaviate_project_repo import WeaviateProjectRepository
+from app.services.query_preprocessor import QueryPreprocessor
+from app.services.rag_workflow import RagWorkflow
+from app.services.weighted_aggregator import WeightedAggregator
+
+def build_per_request() -> RagWorkflow:
+    return RagWorkflow(
+        project_repo=WeaviateProjectRepository(client=None),
+        case_study_repo=WeaviateCaseStudyRepository(client=None),
+        nlp_processor=get_nlp_processor(),
+        llm_service=get_llm_service(),
+        aggregator=WeightedAggregator(),
+        query_preprocessor=QueryPreprocessor(),
+        context_packer=get_context_packer(),
+        response_cache=get_response_cache(),
+        record_cache=get_record_cache()
+    )
+
+def measure_time(build: Callable[[], RagWorkflow], iterations: int) -> List[float]:
+    durations = []
+    for _ in range(iterations):
+        start_time = time.perf_counter()
+        build()
+        durations.append(time.perf_counter() - start_time)
+    return durations
+
+def measure_allocations(build: Callable[[], RagWorkflow], iterations: int) -> Dict[str, float]:
+    """Bytes allocated while building (peak) and still held by the built instance, averaged per request."""
+    peak_total = 0
+    retained_total = 0
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            gc.collect()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            workflow = build()
+            after, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - before
+            retained_total += after - before
+            del workflow
+    finally:
+        tracemalloc.stop()
+    return {"peak_bytes": peak_total / iterations, "retained_bytes": retained_total / iterations}
+
+def report(name: str, durations: List[float], allocations: Dict[str, float]) -> None:
+    ordered = sorted(durations)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<12} mean={statistics.mean(durations) * 1e6:9.1f}us  p50={statistics.median(durations) * 1e6:9.1f}us  "
+        f"p99={p99 * 1e6:9.1f}us  allocated={allocations['peak_bytes'] / 1024:8.1f}KiB  retained={allocations['retained_bytes'] / 1024:8.1f}KiB"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare building a RagWorkflow per request with reusing the one built at startup.")
+    parser.add_argument("--iterations", type=int, default=2000, help="Timed constructions per strategy.")
+    parser.add_argument("--allocation-iterations", type=int, default=200, help="Constructions measured with tracemalloc, which slows them down.")
+    args = parser.parse_args()
+
+    prebuilt = build_per_request()
+    strategies = {
+        "per_request": build_per_request,
+        "prebuilt": lambda: prebuilt
+    }
+
+    # One untimed round so imports and lazily created module state are not charged to the first strategy
+    for build in strategies.values():
+        build()
+
+    print(f"RagWorkflow setup per request over {args.iterations} iterations")
+    for name, build in strategies.items():
+        report(name, measure_time(build, args.iterations), measure_allocations(build, args.allocation_iterations))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+OpenAI-compatible stand-in for load testing. Embeddings are deterministic hashed bags of words, so texts
+sharing terms land close together and retrieval behaves plausibly; completions are canned. Latencies are
+artificial and configurable, so the measured numbers reflect the backend rather than the model provider.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.models.constants import Intent
+from app.services.gazetteer import Gazetteer, build_vocabulary, tokenize
+
+PROJECTS_PATH = 'data/projects.json'
+CASE_STUDIES_PATH = 'data/case_studies.json'
+
+CANNED_SUMMARY_WORD = "lorem"
+
+class FakeOpenAI:
+    def __init__(
+            self,
+            embedding_dim: int,
+            embedding_latency_ms: float,
+            completion_latency_ms: float,
+            token_latency_ms: float,
+            completion_tokens: int,
+            jitter: float,
+            rate_limit_ratio: float
+        ):
+        self.embedding_dim = embedding_dim
+        self.embedding_latency_ms = embedding_latency_ms
+        self.completion_latency_ms = completion_latency_ms
+        self.token_latency_ms = token_latency_ms
+        self.completion_tokens = completion_tokens
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.gazetteer = Gazetteer(build_vocabulary(PROJECTS_PATH, CASE_STUDIES_PATH))
+
+    def embed(self, text: str) -> List[float]:
+        vector = np.zeros(self.embedding_dim, dtype=np.float32)
+        for token in tokenize(text) or [text]:
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.embedding_dim
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm > 0 else vector).tolist()
+
+    def parse(self, query: str) -> Dict:
+        entities = self.gazetteer.extract(query)
+        normalized = query.casefold()
+        if "case stud" in normalized or "case stdu" in normalized:
+            intent = Intent.CASE_STUDY_RETRIEVAL
+        elif entities["technologies"] or entities["solutions"] or entities["services"]:
+            intent = Intent.PROJECT_MATCHING
+        else:
+            intent = Intent.AMBIGUOUS
+        return {"intent": intent.value, "justification": "Canned response", **entities}
+
+    def condense(self, history: str) -> str:
+        # The standalone query is every user turn joined, which keeps the entities of the original question
+        return " ".join(line.strip()[len("User:"):].strip() for line in history.splitlines() if line.strip().startswith("User:"))
+
+    async def delay(self, milliseconds: float) -> None:
+        if milliseconds > 0:
+            await asyncio.sleep(milliseconds * random.uniform(1 - self.jitter, 1 + self.jitter) / 1000)
+
+    def rate_limited(self) -> Optional[JSONResponse]:
+        if self.rate_limit_ratio > 0 and random.random() < self.rate_limit_ratio:
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                headers={"Retry-After": "1"}
+            )
+        return None
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+def extract_section(text: str, marker: str) -> str:
+    index = text.rfind(marker)
+    return text[index + len(marker):].strip() if index >= 0 else text.strip()
+
+def create_app(fake: FakeOpenAI) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        if (limited := fake.rate_limited()):
+            return limited
+
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        await fake.delay(fake.embedding_latency_ms)
+        prompt_tokens = sum(count_tokens(text) for text in texts)
+        return {
+            "object": "list",
+            "model": body["model"],
+            "data": [{"object": "embedding", "index": index, "embedding": fake.embed(text)} for index, text in enumerate(texts)],
+            "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens}
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if (limited := fake.rate_limited()):
+            return limited
+
+        user_message = body["messages"][-1]["content"]
+        prompt_tokens = sum(count_tokens(message["content"]) for message in body["messages"])
+
+        if body.get("response_format"):
+            content = json.dumps(fake.parse(extract_section(user_message, "CURRENT QUERY:")))
+        elif "STANDALONE SEARCH QUERY" in user_message:
+            content = fake.condense(extract_section(user_message, "CONVERSATION HISTORY:"))
+        else:
+            content = " ".join([CANNED_SUMMARY_WORD] * fake.completion_tokens)
+
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            return StreamingResponse(stream_completion(fake, body["model"], content, prompt_tokens, include_usage), media_type="text/event-stream")
+
+        await fake.delay(fake.completion_latency_ms + fake.token_latency_ms * count_tokens(content))
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": count_tokens(content), "total_tokens": prompt_tokens + count_tokens(content)}
+        }
+
+    return app
+
+async def stream_completion(fake: FakeOpenAI, model: str, content: str, prompt_tokens: int, include_usage: bool):
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+
+    def chunk(delta: Dict, finish_reason: Optional[str] = None, usage: Optional[Dict] = None) -> str:
+        choices = [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model, "choices": choices, "usage": usage}
+        return f"data: {json.dumps(payload)}\n\n"
+
+    await fake.delay(fake.completion_latency_ms)
+    yield chunk({"role": "assistant", "content": ""})
+
+    words = content.split(" ")
+    for index, word in enumerate(words):
+        yield chunk({"content": word if index == 0 else f" {word}"})
+        await fake.delay(fake.token_latency_ms)
+
+    yield chunk({}, finish_reason="stop")
+    if include_usage:
+        completion_tokens = len(words)
+        yield chunk({}, usage={"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens})
+    yield "data: [DONE]\n\n"
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake OpenAI-compatible API with deterministic embeddings and canned completions.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--embedding-dim", type=int, default=256, help="Dimensionality of the returned embeddings.")
+    parser.add_argument("--embedding-latency-ms", type=float, default=30, help="Added latency per embeddings request.")
+    parser.add_argument("--completion-latency-ms", type=float, default=400, help="Added latency before a completion starts.")
+    parser.add_argument("--token-latency-ms", type=float, default=5, help="Added latency per generated token.")
+    parser.add_argument("--completion-tokens", type=int, default=150, help="Length of the canned summary completion.")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Latencies are scaled by a uniform factor in [1 - jitter, 1 + jitter].")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Fraction of requests answered with 429.")
+    args = parser.parse_args()
+
+    fake = FakeOpenAI(
+        embedding_dim=args.embedding_dim,
+        embedding_latency_ms=args.embedding_latency_ms,
+        completion_latency_ms=args.completion_latency_ms,
+        token_latency_ms=args.token_latency_ms,
+        completion_tokens=args.completion_tokens,
+        jitter=args.jitter,
+        rate_limit_ratio=args.rate_limit_ratio
+    )
+    uvicorn.run(create_app(fake), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
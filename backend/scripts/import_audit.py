@@ -0,0 +1,86 @@
+"""
+Import-time audit of the backend. Imports a module in a fresh interpreter with -X importtime and reports the
+total import time, the slowest top-level packages and the slowest modules. Modules passed with --forbid must
+not be imported at all (heavy optional dependencies that are meant to be deferred), and --max-ms bounds the
+total, so the audit can run as a check.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+DEFAULT_FORBIDDEN = ["llama_index.core", "weaviate", "tiktoken"]
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+def run_importtime(module: str) -> List[ImportRecord]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(ImportRecord(module=name, self_us=int(self_us), cumulative_us=int(cumulative_us), depth=len(indent) // 2))
+    return records
+
+def by_package(records: List[ImportRecord]) -> Dict[str, int]:
+    # Self times summed per top-level package, so nested imports are not counted twice
+    totals: Dict[str, int] = {}
+    for record in records:
+        package = record.module.split(".")[0]
+        totals[package] = totals.get(package, 0) + record.self_us
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description="Report what importing the backend costs and fail when deferred dependencies are imported eagerly.")
+    parser.add_argument("--module", default="app.main", help="Module to import.")
+    parser.add_argument("--top", type=int, default=15, help="Packages and modules listed.")
+    parser.add_argument("--forbid", action="append", help=f"Module that must not be imported. Defaults to {', '.join(DEFAULT_FORBIDDEN)}.")
+    parser.add_argument("--max-ms", type=float, help="Fail when the total import time exceeds this.")
+    args = parser.parse_args()
+
+    records = run_importtime(args.module)
+    target = next((record for record in records if record.module == args.module), None)
+    total_ms = target.cumulative_us / 1000 if target else sum(record.self_us for record in records) / 1000
+
+    print(f"Importing {args.module}: {total_ms:.0f}ms, {len(records)} modules")
+    print("\nSlowest packages (self time):")
+    for package, self_us in sorted(by_package(records).items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {package:<40} {self_us / 1000:8.1f}ms")
+    print("\nSlowest modules (including their imports):")
+    for record in sorted(records, key=lambda record: record.cumulative_us, reverse=True)[:args.top]:
+        print(f"  {record.module:<60} {record.cumulative_us / 1000:8.1f}ms")
+
+    failures = []
+    imported = {record.module for record in records}
+    for module in args.forbid or DEFAULT_FORBIDDEN:
+        if module in imported:
+            failures.append(f"{module} is imported by {args.module}")
+    if args.max_ms is not None and total_ms > args.max_ms:
+        failures.append(f"import took {total_ms:.0f}ms, more than {args.max_ms:.0f}ms")
+
+    if failures:
+        print("\nFAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
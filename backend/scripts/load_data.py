@@ -1,83 +1,90 @@
-
+import argparse
 import asyncio
-import json
+from app.core import index_version
+from app.core.config import settings
+from app.core.logging_config import configure_logging
 from app.repositories.weaviate_manager import WeaviateManager
 from app.dependencies import get_weaviate_manager, get_llm_service
-from app.services.openai_llm_service import OpenAILLMService
+from app.services.gazetteer import build_vocabulary, save_vocabulary
+from app.services.ingestion_pipeline import IngestionPipeline
+from app.services.interfaces.llm_service import LLMService
+
+PROJECTS_PATH = 'data/projects.json'
+CASE_STUDIES_PATH = 'data/case_studies.json'
 
-async def load(manager: WeaviateManager, llm_service: OpenAILLMService):
+async def load(manager: WeaviateManager, llm_service: LLMService, workers: int, batch_size: int, full: bool):
+    completed = False
     try:
         print("Connecting to Weaviate")
         await manager.connect()      
+        await llm_service.connect()
         print("Connection estabished")
         
         print("Loading data started")
         project_repo = manager.get_project_repo()
         case_study_repo = manager.get_case_study_repo()
 
-        print("Creating project schema")
-        await project_repo.create_schema()
-
-        print("Creating case study schema")
-        await case_study_repo.create_schema()
-
-        print("Loading projects")
-        with open('data/projects.json', "r", encoding="utf-8") as f:
-            projects = json.load(f)
+        if full:
+            print("Creating project schema")
+            await project_repo.create_schema()
 
-        for project in projects:
-            technical_values = " ".join(project["TechStack"]) + " " + " ".join(project["SolutionsImplemented"])
-            technical_vector = await llm_service.generate_embedding(technical_values)
+            print("Creating case study schema")
+            await case_study_repo.create_schema()
+        else:
+            print("Ensuring project and case study schemas exist")
+            await project_repo.ensure_schema()
+            await case_study_repo.ensure_schema()
 
-            service_values = " ".join(project["ServicesOffered"])
-            service_vector = await llm_service.generate_embedding(service_values)
+        pipeline = IngestionPipeline(
+            llm_service=llm_service,
+            batch_size=batch_size,
+            workers=workers,
+            max_write_retries=settings.INGESTION_MAX_WRITE_RETRIES
+        )
 
-            await project_repo.insert_project(
-                properties = {
-                    "title": project["Title"],
-                    "techStack": project["TechStack"],
-                    "solutionsImplemented": project["SolutionsImplemented"],
-                    "servicesOffered": project["ServicesOffered"],
-                    "summary": project["Summary"]
-                },
-                vector_data = {
-                    "technicalVector": technical_vector,
-                    "serviceVector": service_vector
-                }
-            )
+        print(f"Loading projects with {workers} workers and batch size {batch_size}")
+        if full:
+            project_stats = await pipeline.ingest_projects(PROJECTS_PATH, project_repo)
+        else:
+            project_stats = await pipeline.sync_projects(PROJECTS_PATH, project_repo)
+        print(project_stats.report())
 
-        print("Loading case studies")
+        print(f"Loading case studies with {workers} workers and batch size {batch_size}")
+        if full:
+            case_study_stats = await pipeline.ingest_case_studies(CASE_STUDIES_PATH, case_study_repo)
+        else:
+            case_study_stats = await pipeline.sync_case_studies(CASE_STUDIES_PATH, case_study_repo)
+        print(case_study_stats.report())
 
-        with open('data/case_studies.json', "r", encoding="utf-8") as f:
-            case_studies = json.load(f)
-            
-        for case_study in case_studies:
-            vector = await llm_service.generate_embedding(case_study["DetailedContent"])
-
-            await case_study_repo.insert_case_study(
-                properties = {
-                    "title": case_study["Title"],
-                    "industry": case_study["Industry"],
-                    "technologies": case_study["Technologies"],
-                    "solutionsProvided": case_study["SolutionsProvided"],
-                    "services": case_study["Services"],
-                    "detailedContent": case_study["DetailedContent"],
-                    "sourceUrl": case_study["SourceURL"]
-                },
-                vector = vector
-            )
+        vocabulary = build_vocabulary(PROJECTS_PATH, CASE_STUDIES_PATH)
+        save_vocabulary(vocabulary, settings.GAZETTEER_PATH)
+        print(f"Gazetteer written to {settings.GAZETTEER_PATH}: " + ", ".join(f"{len(terms)} {category}" for category, terms in vocabulary.items()))
 
         print("Loading data completed")
+        completed = True
     except Exception as e:
         print(f"Loading data failed: {e}")
         
     finally:
+        await llm_service.close()
         await manager.disconnect()
 
+    # Bumped once the data is written, including the local index which is saved on disconnect
+    if completed:
+        version = index_version.bump(settings.INDEX_VERSION_PATH)
+        print(f"Index version {version} written to {settings.INDEX_VERSION_PATH}; running backends drop their cached answers and records")
+
 def main():
+    parser = argparse.ArgumentParser(description="Embed and load projects and case studies into Weaviate. By default only new or changed records are re-embedded.")
+    parser.add_argument("--workers", type=int, default=settings.INGESTION_WORKERS, help="Number of batches processed concurrently.")
+    parser.add_argument("--batch-size", type=int, default=settings.INGESTION_BATCH_SIZE, help="Number of records embedded and written per batch.")
+    parser.add_argument("--full", action="store_true", help="Drop and recreate both collections instead of syncing only changed records.")
+    args = parser.parse_args()
+
+    configure_logging()
     weaviate_manager = get_weaviate_manager() 
     llm_service = get_llm_service()
-    asyncio.run(load(manager=weaviate_manager, llm_service=llm_service))
+    asyncio.run(load(manager=weaviate_manager, llm_service=llm_service, workers=args.workers, batch_size=args.batch_size, full=args.full))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,338 @@
+"""
+End-to-end load test of the chat endpoints. Unless --target is given it starts a fake OpenAI server, builds a
+local vector index from the data files through it, and serves the app with VECTOR_STORE_BACKEND=local, so
+no external service is needed. Traffic is a mix of labeled queries; ambiguous ones are answered with a
+follow-up on the same workflow_id, so clarification round-trips are part of the measured load.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.intent_examples import INTENT_EXAMPLES
+
+FOLLOW_UPS = [
+    "I want case studies",
+    "I am looking for projects built with React and NoSQL"
+]
+
+QUERIES = [query for queries in INTENT_EXAMPLES.values() for query in queries]
+
+@dataclass
+class Sample:
+    started: float
+    latency: float
+    turn: int
+    status: str
+    first_token_latency: Optional[float] = None
+
+@dataclass
+class LoadResult:
+    samples: List[Sample] = field(default_factory=list)
+    conversations: int = 0
+    max_outstanding: int = 0
+    cold_start: Dict[str, float] = field(default_factory=dict)
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))]
+
+async def wait_until_ready(url: str, process: Optional[subprocess.Popen], timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"Process serving {url} exited with code {process.returncode}")
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"{url} was not ready after {timeout}s")
+
+async def measure_cold_start(base_url: str, process: subprocess.Popen, spawned: float, timeout: float) -> Dict[str, float]:
+    """Seconds from spawning the backend until it answers, until /ready reports the warm-up done, and the latency of the first chat request."""
+    cold_start: Dict[str, float] = {}
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        while "ready_seconds" not in cold_start:
+            if time.perf_counter() - spawned > timeout:
+                raise TimeoutError(f"{base_url} was not ready after {timeout}s")
+            if process.poll() is not None:
+                raise RuntimeError(f"Process serving {base_url} exited with code {process.returncode}")
+            try:
+                response = await client.get(f"{base_url}/ready")
+                cold_start.setdefault("listening_seconds", time.perf_counter() - spawned)
+                if response.status_code == 200:
+                    cold_start["ready_seconds"] = time.perf_counter() - spawned
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        response = await client.post(f"{base_url}/workflow", json={"workflow_id": None, "query": QUERIES[0]})
+        response.raise_for_status()
+        cold_start["first_request_seconds"] = time.perf_counter() - started
+    return cold_start
+
+async def send_turn(client: httpx.AsyncClient, base_url: str, stream: bool, query: str, workflow_id: Optional[str], turn: int, result: LoadResult) -> Tuple[Optional[Dict], Optional[float]]:
+    payload = {"workflow_id": workflow_id, "query": query}
+    started = time.perf_counter()
+    first_token_latency = None
+    retry_after = None
+    response_json = None
+    try:
+        if stream:
+            async with client.stream("POST", f"{base_url}/workflow/stream", json=payload) as response:
+                if response.status_code == 200:
+                    event = None
+                    async for line in response.aiter_lines():
+                        if line.startswith("event: "):
+                            event = line[len("event: "):]
+                            if event == "token" and first_token_latency is None:
+                                first_token_latency = time.perf_counter() - started
+                        elif line.startswith("data: ") and event in ("completed", "clarification", "failed"):
+                            response_json = json.loads(line[len("data: "):])
+                        elif line.startswith("data: ") and event == "error":
+                            response_json = {"status": "error"}
+                status = response_json["status"] if response_json else f"http_{response.status_code}"
+                retry_after = response.headers.get("retry-after")
+        else:
+            response = await client.post(f"{base_url}/workflow", json=payload)
+            if response.status_code == 200:
+                response_json = response.json()
+                status = response_json["status"]
+            else:
+                status = f"http_{response.status_code}"
+                retry_after = response.headers.get("retry-after")
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+
+    result.samples.append(Sample(started=started, latency=time.perf_counter() - started, turn=turn, status=status, first_token_latency=first_token_latency))
+    return response_json, float(retry_after) if retry_after else None
+
+async def run_conversation(client: httpx.AsyncClient, base_url: str, stream: bool, max_turns: int, rng: random.Random, result: LoadResult) -> Optional[float]:
+    """Returns the Retry-After of a turn the server shed, if any."""
+    query = rng.choice(QUERIES)
+    workflow_id = None
+    for turn in range(max_turns):
+        response, retry_after = await send_turn(client, base_url, stream, query, workflow_id, turn, result)
+        if not response or response.get("status") != "clarification_required":
+            break
+        workflow_id = response["workflow_id"]
+        query = rng.choice(FOLLOW_UPS)
+    result.conversations += 1
+    return retry_after
+
+async def closed_loop(client: httpx.AsyncClient, args, rng: random.Random, result: LoadResult) -> None:
+    deadline = time.perf_counter() + args.duration
+
+    async def user() -> None:
+        while time.perf_counter() < deadline:
+            retry_after = await run_conversation(client, args.base_url, args.stream, args.max_turns, rng, result)
+            if retry_after:
+                # A shed user backs off as asked instead of hammering the queue in a tight loop
+                await asyncio.sleep(retry_after)
+
+    await asyncio.gather(*(user() for _ in range(args.concurrency)))
+
+async def open_loop(client: httpx.AsyncClient, args, rng: random.Random, result: LoadResult) -> None:
+    # Poisson arrivals at a fixed rate, independent of how fast the server answers
+    deadline = time.perf_counter() + args.duration
+    tasks = set()
+    while time.perf_counter() < deadline:
+        task = asyncio.create_task(run_conversation(client, args.base_url, args.stream, args.max_turns, rng, result))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        result.max_outstanding = max(result.max_outstanding, len(tasks))
+        await asyncio.sleep(rng.expovariate(args.rate))
+    await asyncio.gather(*tasks)
+
+def report(result: LoadResult, elapsed: float, warmup_until: float) -> Dict:
+    samples = [sample for sample in result.samples if sample.started >= warmup_until]
+    errors = [sample for sample in samples if sample.status not in ("completed", "clarification_required")]
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        statuses[sample.status] = statuses.get(sample.status, 0) + 1
+
+    def latency_summary(selected: List[Sample], attribute: str = "latency") -> Dict[str, float]:
+        values = [getattr(sample, attribute) for sample in selected if getattr(sample, attribute) is not None]
+        return {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": max(values) if values else 0.0
+        }
+
+    successful = [sample for sample in samples if sample.status in ("completed", "clarification_required")]
+    summary = {
+        "requests": len(samples),
+        "conversations": result.conversations,
+        "elapsed_seconds": elapsed,
+        "requests_per_second": len(samples) / elapsed if elapsed > 0 else 0.0,
+        "error_rate": len(errors) / len(samples) if samples else 0.0,
+        "statuses": statuses,
+        "latency": latency_summary(successful),
+        "latency_first_turn": latency_summary([sample for sample in successful if sample.turn == 0]),
+        "latency_follow_up": latency_summary([sample for sample in successful if sample.turn > 0]),
+        "time_to_first_token": latency_summary(successful, "first_token_latency"),
+        "max_outstanding_conversations": result.max_outstanding,
+        "cold_start": result.cold_start
+    }
+
+    print("\n" + "="*50)
+    print("LOAD TEST REPORT")
+    print("="*50)
+    print(f"Requests: {summary['requests']} in {elapsed:.1f}s ({summary['requests_per_second']:.2f} req/s), {result.conversations} conversations")
+    print(f"Error rate: {summary['error_rate']:.2%}")
+    print("Statuses: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items())))
+    for name in ["latency", "latency_first_turn", "latency_follow_up", "time_to_first_token"]:
+        stats = summary[name]
+        if stats["count"]:
+            print(f"{name:<22} n={stats['count']:<6} p50={stats['p50']*1000:8.1f}ms  p95={stats['p95']*1000:8.1f}ms  p99={stats['p99']*1000:8.1f}ms  max={stats['max']*1000:8.1f}ms")
+    if result.max_outstanding:
+        print(f"Max outstanding conversations: {result.max_outstanding}")
+    if result.cold_start:
+        print("Cold start: " + ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in result.cold_start.items()))
+    return summary
+
+def print_step_latencies(metrics_text: str) -> None:
+    sums: Dict[str, float] = {}
+    counts: Dict[str, float] = {}
+    for match in re.finditer(r'^rag_workflow_step_seconds_(sum|count)\{step="(\w+)"\} (\S+)$', metrics_text, re.MULTILINE):
+        target = sums if match.group(1) == "sum" else counts
+        target[match.group(2)] = float(match.group(3))
+
+    if counts:
+        print("\nMean server-side step latency:")
+        for step, count in counts.items():
+            if count:
+                print(f"  {step:<24} {sums[step] / count * 1000:8.1f}ms over {int(count)} runs")
+
+async def drive(args) -> Dict:
+    rng = random.Random(args.seed)
+    result = LoadResult(cold_start=getattr(args, "cold_start", {}))
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(timeout=args.request_timeout, limits=limits) as client:
+        started = time.perf_counter()
+        if args.mode == "closed":
+            await closed_loop(client, args, rng, result)
+        else:
+            await open_loop(client, args, rng, result)
+        elapsed = time.perf_counter() - started - args.warmup
+
+        summary = report(result, elapsed, started + args.warmup)
+        try:
+            print_step_latencies((await client.get(f"{args.base_url}/metrics")).text)
+        except httpx.HTTPError:
+            pass
+        return summary
+
+def start_stack(args, workdir: str) -> List[subprocess.Popen]:
+    fake_port = free_port()
+    app_port = free_port()
+    args.base_url = f"http://127.0.0.1:{app_port}"
+
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{fake_port}/v1",
+        "OPENAI_API_KEY": "load-test",
+        "VECTOR_STORE_BACKEND": "local",
+        "LOCAL_INDEX_DIR": os.path.join(workdir, "index"),
+        "GAZETTEER_PATH": os.path.join(workdir, "gazetteer.json"),
+        "LOG_DIR": args.log_dir
+    })
+    if args.app_workers > 1:
+        # Continuations can land on any worker, so clarification contexts must be shared
+        env.update({"CONTEXT_STORE_BACKEND": "sqlite", "CONTEXT_STORE_SQLITE_PATH": os.path.join(workdir, "contexts.db")})
+    if args.no_caches:
+        env.update({name: "false" for name in ["EMBEDDING_CACHE_ENABLED", "NLP_CACHE_ENABLED", "RESPONSE_CACHE_ENABLED", "RECORD_CACHE_ENABLED"]})
+
+    processes = []
+    fake_command = [
+        sys.executable, "-m", "scripts.fake_openai_server", "--port", str(fake_port),
+        "--embedding-latency-ms", str(args.embedding_latency_ms),
+        "--completion-latency-ms", str(args.completion_latency_ms),
+        "--token-latency-ms", str(args.token_latency_ms),
+        "--completion-tokens", str(args.completion_tokens),
+        "--rate-limit-ratio", str(args.rate_limit_ratio)
+    ]
+    processes.append(subprocess.Popen(fake_command, env=env))
+    asyncio.run(wait_until_ready(f"http://127.0.0.1:{fake_port}/docs", processes[0], 30))
+
+    print("Building the local index through the fake OpenAI server")
+    subprocess.run([sys.executable, "-m", "scripts.load_data", "--full"], env=env, check=True, stdout=subprocess.DEVNULL)
+
+    app_command = [
+        sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(app_port),
+        "--workers", str(args.app_workers), "--log-level", "warning", "--no-access-log"
+    ]
+    # The backend logs every request to the console; its log file under --log-dir keeps the report readable
+    spawned = time.perf_counter()
+    processes.append(subprocess.Popen(app_command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+    args.cold_start = asyncio.run(measure_cold_start(args.base_url, processes[1], spawned, 60))
+    return processes
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive concurrent chat traffic and report latency percentiles, throughput and error rate.")
+    parser.add_argument("--target", help="Base URL of a running backend. By default a self-contained stack with a fake OpenAI server is started.")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed", help="closed: a fixed number of users, each starting a new conversation when the last one ends. open: conversations arrive at a fixed rate.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent users in closed-loop mode.")
+    parser.add_argument("--rate", type=float, default=5.0, help="Conversations started per second in open-loop mode.")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds during which new conversations are started.")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Requests started in the first seconds are left out of the report.")
+    parser.add_argument("--max-turns", type=int, default=3, help="Requests per conversation, including clarification follow-ups.")
+    parser.add_argument("--stream", action="store_true", help="Use /workflow/stream and also report time to first token.")
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the report as JSON to this path.")
+    parser.add_argument("--app-workers", type=int, default=1, help="Uvicorn worker processes for the started backend.")
+    parser.add_argument("--log-dir", default="logs/load-test", help="Log directory of the started backend.")
+    parser.add_argument("--no-caches", action="store_true", help="Disable the embedding, NLP, response and record caches in the started backend.")
+    parser.add_argument("--embedding-latency-ms", type=float, default=30)
+    parser.add_argument("--completion-latency-ms", type=float, default=400)
+    parser.add_argument("--token-latency-ms", type=float, default=5)
+    parser.add_argument("--completion-tokens", type=int, default=150)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Fraction of fake OpenAI requests answered with 429.")
+    args = parser.parse_args()
+
+    processes = []
+    with tempfile.TemporaryDirectory(prefix="load-test-") as workdir:
+        try:
+            if args.target:
+                args.base_url = args.target.rstrip("/")
+            else:
+                processes = start_stack(args, workdir)
+
+            print(f"Running {args.mode}-loop load against {args.base_url} for {args.duration:.0f}s")
+            summary = asyncio.run(drive(args))
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(summary, f, indent=2)
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                process.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.services.admission_controller import AdmissionController, AdmissionRejected, Priority
+
+def test_requests_under_the_cap_are_admitted_immediately():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=2, max_queue_size=0, max_wait_seconds=1)
+        await controller.acquire(Priority.NEW)
+        await controller.acquire(Priority.NEW)
+        controller.release()
+        controller.release()
+
+    asyncio.run(scenario())
+
+def test_full_queue_is_rejected_with_429():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue_size=0, max_wait_seconds=1)
+        await controller.acquire(Priority.NEW)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(Priority.NEW)
+
+        assert rejected.value.status_code == 429
+        assert rejected.value.reason == "queue_full"
+        assert rejected.value.retry_after >= 1
+
+    asyncio.run(scenario())
+
+def test_wait_that_runs_out_is_rejected_with_503():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue_size=1, max_wait_seconds=0.05)
+        await controller.acquire(Priority.NEW)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(Priority.NEW)
+
+        assert rejected.value.status_code == 503
+        assert rejected.value.reason == "wait_timeout"
+        # The timed-out waiter left the queue, so the next request can queue again
+        waiter = asyncio.create_task(controller.acquire(Priority.NEW))
+        await asyncio.sleep(0)
+        controller.release()
+        await waiter
+
+    asyncio.run(scenario())
+
+def test_released_slot_goes_to_continuations_first():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue_size=2, max_wait_seconds=1)
+        await controller.acquire(Priority.NEW)
+        admitted = []
+
+        async def request(name: str, priority: Priority):
+            await controller.acquire(priority)
+            admitted.append(name)
+
+        new = asyncio.create_task(request("new", Priority.NEW))
+        continuation = asyncio.create_task(request("continuation", Priority.CONTINUATION))
+        await asyncio.sleep(0)
+
+        controller.release()
+        await continuation
+        assert admitted == ["continuation"]
+        controller.release()
+        await new
+        assert admitted == ["continuation", "new"]
+
+    asyncio.run(scenario())
+
+def test_slot_is_released_when_the_block_raises():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue_size=0, max_wait_seconds=1)
+        with pytest.raises(RuntimeError):
+            async with controller.slot(Priority.NEW):
+                raise RuntimeError("failed")
+
+        async with controller.slot(Priority.NEW):
+            pass
+
+    asyncio.run(scenario())
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue_size=1, max_wait_seconds=1)
+        await controller.acquire(Priority.NEW)
+        waiter = asyncio.create_task(controller.acquire(Priority.NEW))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        controller.release()
+
+        await asyncio.wait_for(controller.acquire(Priority.NEW), 0.5)
+
+    asyncio.run(scenario())
@@ -0,0 +1,75 @@
+import asyncio
+from typing import List, Optional
+
+from app.services.batching_llm_service import BatchingLLMService
+from app.services.interfaces.llm_service import LLMService
+
+class RecordingLLMService(LLMService):
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    async def generate_embedding(self, text, model: Optional[str] = None) -> List[float]:
+        return (await self.generate_embeddings([text], model=model))[0]
+
+    async def generate_embeddings(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    async def generate_text(self, system_prompt, user_message, model=None, temperature=None, max_tokens=None, top_p=None):
+        raise NotImplementedError
+
+    async def generate_text_stream(self, system_prompt, user_message, model=None, temperature=None, max_tokens=None, top_p=None):
+        raise NotImplementedError
+
+    async def generate_object(self, system_prompt, user_message, response_format, model=None, temperature=None, max_tokens=None, top_p=None):
+        raise NotImplementedError
+
+def test_concurrent_single_and_list_requests_share_one_call():
+    async def scenario():
+        inner = RecordingLLMService()
+        service = BatchingLLMService(inner, max_batch_size=16, max_wait_ms=10)
+
+        single, many = await asyncio.gather(
+            service.generate_embedding("a"),
+            service.generate_embeddings(["bb", "ccc"])
+        )
+
+        assert single == [1.0]
+        assert many == [[2.0], [3.0]]
+        assert inner.calls == [["a", "bb", "ccc"]]
+
+    asyncio.run(scenario())
+
+def test_identical_texts_are_embedded_once():
+    async def scenario():
+        inner = RecordingLLMService()
+        service = BatchingLLMService(inner, max_batch_size=16, max_wait_ms=10)
+
+        embeddings = await service.generate_embeddings(["a", "bb", "a"])
+
+        assert embeddings == [[1.0], [2.0], [1.0]]
+        assert inner.calls == [["a", "bb"]]
+
+    asyncio.run(scenario())
+
+def test_full_batches_are_sent_without_waiting():
+    async def scenario():
+        inner = RecordingLLMService()
+        service = BatchingLLMService(inner, max_batch_size=2, max_wait_ms=10_000)
+
+        embeddings = await asyncio.wait_for(service.generate_embeddings(["a", "bb", "ccc", "dddd"]), 1)
+
+        assert embeddings == [[1.0], [2.0], [3.0], [4.0]]
+        assert inner.calls == [["a", "bb"], ["ccc", "dddd"]]
+
+    asyncio.run(scenario())
+
+def test_empty_list_makes_no_call():
+    async def scenario():
+        inner = RecordingLLMService()
+        service = BatchingLLMService(inner, max_batch_size=2, max_wait_ms=10)
+
+        assert await service.generate_embeddings([]) == []
+        assert inner.calls == []
+
+    asyncio.run(scenario())
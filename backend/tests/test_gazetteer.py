@@ -0,0 +1,45 @@
+from app.services.gazetteer import Gazetteer, tokenize
+
+VOCABULARY = {
+    "technologies": ["Python", "React Native", "React", "UI/UX", "C#"],
+    "solutions": ["E-commerce", "Predictive Analytics", "Dashboard"],
+    "services": ["Managed Service"],
+    "industry": ["Healthcare"]
+}
+
+def test_tokenize_normalizes_case_punctuation_and_plurals():
+    assert tokenize("Dashboards, APIs & C#!") == ["dashboard", "api", "c#"]
+
+def test_extract_matches_terms_case_and_punctuation_insensitively():
+    entities = Gazetteer(VOCABULARY).extract("Projects using PYTHON and predictive-analytics dashboards")
+
+    assert entities["technologies"] == ["Python"]
+    assert entities["solutions"] == ["Predictive Analytics", "Dashboard"]
+    assert entities["services"] == []
+
+def test_extract_prefers_the_longest_match():
+    entities = Gazetteer(VOCABULARY).extract("apps built with react native")
+
+    assert entities["technologies"] == ["React Native"]
+
+def test_extract_matches_whole_words_only():
+    entities = Gazetteer(VOCABULARY).extract("reactive pythonic systems")
+
+    assert entities["technologies"] == []
+
+def test_extract_matches_joined_variants():
+    entities = Gazetteer(VOCABULARY).extract("ecommerce with strong uiux")
+
+    assert entities["solutions"] == ["E-commerce"]
+    assert entities["technologies"] == ["UI/UX"]
+
+def test_extract_returns_every_category_and_deduplicates():
+    entities = Gazetteer(VOCABULARY).extract("Healthcare managed services, more healthcare")
+
+    assert set(entities) == {"technologies", "solutions", "services", "industry"}
+    assert entities["industry"] == ["Healthcare"]
+    assert entities["services"] == ["Managed Service"]
+
+def test_size_counts_term_variants():
+    # "E-commerce" and "UI/UX" are also indexed in their joined form
+    assert len(Gazetteer(VOCABULARY)) == 12
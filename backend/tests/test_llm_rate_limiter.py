@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from app.services.llm_rate_limiter import CircuitOpenError, ModelRateLimiter, Outcome
+
+def make_limiter(**overrides) -> ModelRateLimiter:
+    options = dict(
+        model="test-model",
+        requests_per_minute=0,
+        tokens_per_minute=0,
+        initial_concurrency=1,
+        min_concurrency=1,
+        max_concurrency=4,
+        latency_tolerance=3.0,
+        failure_threshold=2,
+        reset_seconds=60
+    )
+    options.update(overrides)
+    return ModelRateLimiter(**options)
+
+def test_requests_over_the_concurrency_limit_wait_for_a_release():
+    async def scenario():
+        limiter = make_limiter()
+        permit = await limiter.acquire(10)
+        waiter = asyncio.create_task(limiter.acquire(10))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        permit.release(Outcome.SUCCESS)
+        (await asyncio.wait_for(waiter, 0.5)).release(Outcome.SUCCESS)
+
+    asyncio.run(scenario())
+
+def test_successes_raise_the_limit_and_throttling_halves_it():
+    async def scenario():
+        limiter = make_limiter(initial_concurrency=4, max_concurrency=8)
+        (await limiter.acquire(10)).release(Outcome.SUCCESS)
+        assert limiter._limit == pytest.approx(4.25)
+
+        (await limiter.acquire(10)).release(Outcome.THROTTLED)
+        assert limiter._limit == pytest.approx(2.125)
+
+    asyncio.run(scenario())
+
+def test_limit_never_drops_below_the_minimum():
+    async def scenario():
+        limiter = make_limiter(initial_concurrency=2, min_concurrency=2)
+        (await limiter.acquire(10)).release(Outcome.THROTTLED)
+
+        assert limiter._limit == 2
+
+    asyncio.run(scenario())
+
+def test_releasing_a_permit_twice_has_no_effect():
+    async def scenario():
+        limiter = make_limiter()
+        permit = await limiter.acquire(10)
+        permit.release(Outcome.SUCCESS)
+        permit.release(Outcome.SUCCESS)
+
+        assert limiter._in_flight == 0
+
+    asyncio.run(scenario())
+
+def test_consecutive_failures_open_the_circuit_until_a_probe_succeeds(monkeypatch):
+    async def scenario():
+        limiter = make_limiter(failure_threshold=2, reset_seconds=0.05)
+        for _ in range(2):
+            (await limiter.acquire(10)).release(Outcome.FAILED)
+
+        with pytest.raises(CircuitOpenError):
+            await limiter.acquire(10)
+
+        await asyncio.sleep(0.06)
+        probe = await limiter.acquire(10)
+        # Only one probe is let through while the circuit is half open
+        with pytest.raises(CircuitOpenError):
+            await limiter.acquire(10)
+        probe.release(Outcome.SUCCESS)
+
+        (await limiter.acquire(10)).release(Outcome.SUCCESS)
+
+    asyncio.run(scenario())
+
+def test_errors_do_not_count_towards_the_circuit():
+    async def scenario():
+        limiter = make_limiter(failure_threshold=1)
+        (await limiter.acquire(10)).release(Outcome.ERROR)
+
+        (await limiter.acquire(10)).release(Outcome.SUCCESS)
+
+    asyncio.run(scenario())
+
+def test_token_budget_delays_requests_until_refilled():
+    async def scenario():
+        # 6000 tokens per minute refill 100 per second
+        limiter = make_limiter(tokens_per_minute=6000, initial_concurrency=4)
+        (await limiter.acquire(6000)).release(Outcome.SUCCESS, actual_tokens=6000)
+
+        start = asyncio.get_running_loop().time()
+        (await limiter.acquire(10)).release(Outcome.SUCCESS)
+        assert asyncio.get_running_loop().time() - start >= 0.09
+
+    asyncio.run(scenario())
+
+def test_unused_estimated_tokens_are_returned_to_the_budget():
+    async def scenario():
+        limiter = make_limiter(tokens_per_minute=6000, initial_concurrency=4)
+        (await limiter.acquire(6000)).release(Outcome.SUCCESS, actual_tokens=100)
+
+        await asyncio.wait_for(limiter.acquire(5000), 0.05)
+
+    asyncio.run(scenario())
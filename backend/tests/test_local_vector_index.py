@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from app.repositories.local_vector_index import LocalVectorIndex
+
+def make_index(directory) -> LocalVectorIndex:
+    index = LocalVectorIndex(directory=str(directory), name="Project", vector_names=["technical", "service"])
+    index.upsert([
+        ("a", {"title": "A"}, {"technical": [1.0, 0.0], "service": [0.0, 1.0]}),
+        ("b", {"title": "B"}, {"technical": [0.8, 0.6], "service": [1.0, 0.0]}),
+        ("c", {"title": "C"}, {"technical": [0.0, 1.0], "service": [1.0, 0.0]})
+    ])
+    return index
+
+def test_search_returns_top_k_by_cosine_similarity(tmp_path):
+    index = make_index(tmp_path)
+
+    results = index.search("technical", [2.0, 0.0], top_k=2)
+
+    assert [record_id for record_id, _, _ in results] == ["a", "b"]
+    # Reported as (1 + cosine) / 2
+    assert results[0][2] == pytest.approx(1.0)
+    assert results[1][2] == pytest.approx(0.9)
+    assert results[0][1] == {"title": "A"}
+
+def test_search_with_top_k_above_size_returns_every_record(tmp_path):
+    index = make_index(tmp_path)
+
+    assert len(index.search("technical", [1.0, 0.0], top_k=10)) == 3
+
+def test_search_on_empty_index_returns_nothing(tmp_path):
+    index = LocalVectorIndex(directory=str(tmp_path), name="Project", vector_names=["technical"])
+
+    assert index.search("technical", [1.0, 0.0], top_k=3) == []
+
+def test_search_weighted_combines_vectors(tmp_path):
+    index = make_index(tmp_path)
+
+    results = index.search_weighted({"technical": ([1.0, 0.0], 0.2), "service": ([1.0, 0.0], 0.8)}, top_k=3)
+
+    assert [record_id for record_id, _, _ in results] == ["b", "c", "a"]
+
+def test_upsert_replaces_existing_record(tmp_path):
+    index = make_index(tmp_path)
+
+    index.upsert([("c", {"title": "C2"}, {"technical": [1.0, 0.0], "service": [1.0, 0.0]})])
+
+    assert len(index) == 3
+    assert index.get(["c"]) == {"c": {"title": "C2"}}
+    assert index.search("technical", [1.0, 0.0], top_k=1)[0][0] in {"a", "c"}
+    assert index.search("technical", [0.0, 1.0], top_k=1)[0][0] == "b"
+
+def test_delete_removes_rows_and_keeps_ids_aligned(tmp_path):
+    index = make_index(tmp_path)
+
+    assert index.delete(["a", "missing"]) == 1
+
+    assert len(index) == 2
+    assert [record_id for record_id, _, _ in index.search("technical", [1.0, 0.0], top_k=2)] == ["b", "c"]
+
+def test_save_and_load_round_trip(tmp_path):
+    make_index(tmp_path).save()
+
+    loaded = LocalVectorIndex(directory=str(tmp_path), name="Project", vector_names=["technical", "service"])
+    loaded.load()
+
+    assert len(loaded) == 3
+    assert not loaded.dirty
+    assert [record_id for record_id, _, _ in loaded.search("technical", [0.0, 1.0], top_k=1)] == ["c"]
+
+def test_load_picks_up_a_rewritten_index(tmp_path):
+    make_index(tmp_path).save()
+    loaded = LocalVectorIndex(directory=str(tmp_path), name="Project", vector_names=["technical", "service"])
+    loaded.load()
+
+    writer = LocalVectorIndex(directory=str(tmp_path), name="Project", vector_names=["technical", "service"])
+    writer.load()
+    writer.upsert([("d", {"title": "D"}, {"technical": [-1.0, 0.0], "service": [0.0, -1.0]})])
+    writer.save()
+    loaded.load()
+
+    assert len(loaded) == 4
+    assert loaded.search("technical", [-1.0, 0.0], top_k=1)[0][0] == "d"
+
+def test_vectors_are_stored_normalized(tmp_path):
+    make_index(tmp_path).save()
+
+    matrix = np.load(tmp_path / "Project.technical.npy")
+
+    assert matrix.dtype == np.float32
+    assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0)
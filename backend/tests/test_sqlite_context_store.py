@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from app.services import sqlite_context_store
+from app.services.sqlite_context_store import SQLiteContextStore
+
+@pytest.fixture
+def clock(monkeypatch, fake_clock):
+    monkeypatch.setattr(sqlite_context_store, "time", fake_clock)
+    return fake_clock
+
+def make_store(tmp_path, max_entries: int = 10, ttl_seconds: float = 60) -> SQLiteContextStore:
+    return SQLiteContextStore(db_path=str(tmp_path / "contexts.db"), max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+def test_pop_returns_saved_context_once(tmp_path, clock):
+    async def scenario():
+        store = make_store(tmp_path)
+        await store.save("w1", {"state": {"iterations": 1}})
+
+        assert await store.pop("w1") == {"state": {"iterations": 1}}
+        assert await store.pop("w1") is None
+        stats = store.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 0)
+        await store.close()
+
+    asyncio.run(scenario())
+
+def test_expired_context_is_not_returned(tmp_path, clock):
+    async def scenario():
+        store = make_store(tmp_path, ttl_seconds=60)
+        await store.save("w1", {"a": 1})
+
+        clock.advance(61)
+        assert await store.pop("w1") is None
+        await store.close()
+
+    asyncio.run(scenario())
+
+def test_save_prunes_expired_entries(tmp_path, clock):
+    async def scenario():
+        store = make_store(tmp_path, ttl_seconds=60)
+        await store.save("w1", {"a": 1})
+        clock.advance(61)
+        await store.save("w2", {"a": 2})
+
+        stats = store.stats()
+        assert (stats.expirations, stats.size) == (1, 1)
+        await store.close()
+
+    asyncio.run(scenario())
+
+def test_oldest_entries_are_evicted_beyond_max_entries(tmp_path, clock):
+    async def scenario():
+        store = make_store(tmp_path, max_entries=2)
+        for workflow_id in ["w1", "w2", "w3"]:
+            await store.save(workflow_id, {"id": workflow_id})
+            clock.advance(1)
+
+        assert await store.pop("w1") is None
+        assert await store.pop("w3") == {"id": "w3"}
+        assert store.stats().evictions == 1
+        await store.close()
+
+    asyncio.run(scenario())
+
+def test_contexts_are_shared_between_store_instances(tmp_path, clock):
+    async def scenario():
+        writer = make_store(tmp_path)
+        reader = make_store(tmp_path)
+        await writer.save("w1", {"a": 1})
+
+        assert await reader.pop("w1") == {"a": 1}
+        assert await writer.pop("w1") is None
+        await writer.close()
+        await reader.close()
+
+    asyncio.run(scenario())
+
+def test_delete_lowers_the_size(tmp_path, clock):
+    async def scenario():
+        store = make_store(tmp_path)
+        await store.save("w1", {"a": 1})
+        await store.save("w2", {"a": 2})
+        await store.delete("w1")
+        await store.delete("missing")
+
+        assert store.stats().size == 1
+        await store.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,61 @@
+import pytest
+
+from app.core import ttl_cache
+from app.core.ttl_cache import TTLCache
+
+@pytest.fixture
+def clock(monkeypatch, fake_clock):
+    monkeypatch.setattr(ttl_cache, "time", fake_clock)
+    return fake_clock
+
+def test_get_returns_stored_value_and_counts_hits_and_misses(clock):
+    cache: TTLCache[str, int] = TTLCache(max_size=2)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache: TTLCache[str, int] = TTLCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats().evictions == 1
+
+def test_entries_expire_after_ttl(clock):
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=10)
+    cache.set("a", 1)
+
+    clock.advance(9)
+    assert cache.get("a") == 1
+    clock.advance(2)
+    assert cache.get("a") is None
+    assert cache.stats().expirations == 1
+    assert len(cache) == 0
+
+def test_entries_without_ttl_never_expire(clock):
+    cache: TTLCache[str, int] = TTLCache(max_size=2)
+    cache.set("a", 1)
+
+    clock.advance(10 ** 9)
+    assert cache.get("a") == 1
+
+def test_pop_removes_and_skips_expired_entries(clock):
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    clock.advance(11)
+    assert cache.pop("b") is None
+
+def test_max_size_must_be_positive():
+    with pytest.raises(ValueError):
+        TTLCache(max_size=0)